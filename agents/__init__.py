@@ -1,13 +1,30 @@
 """AI Investment Agent Team - Agent modules."""
 
-from agents.researcher import create_researcher_agent
-from agents.analyst import create_analyst_agent
-from agents.advisor import create_advisor_agent
-from agents.reporter import create_reporter_agent
-
-__all__ = [
-    "create_researcher_agent",
-    "create_analyst_agent",
-    "create_advisor_agent",
-    "create_reporter_agent",
-]
+import importlib
+from typing import Any
+
+# Exports are resolved on first access so that importing this package doesn't
+# pull in the Agno/OpenAI stack until an agent is actually created.
+_EXPORTS = {
+    "create_researcher_agent": "agents.researcher",
+    "create_analyst_agent": "agents.analyst",
+    "create_advisor_agent": "agents.advisor",
+    "create_reporter_agent": "agents.reporter",
+    "create_model": "agents.models",
+    "set_model_factory": "agents.models",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
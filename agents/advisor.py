@@ -1,10 +1,12 @@
 """Advisor Agent - Suggests portfolio moves and investment strategies."""
 
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
 
+from agents.models import create_model
+from runtime.tracing import trace_agent
 
-def create_advisor_agent() -> Agent:
+
+def create_advisor_agent(async_tools: bool = False) -> Agent:
     """
     Create and return the Advisor agent.
 
@@ -13,11 +15,21 @@ def create_advisor_agent() -> Agent:
     - Suggesting specific portfolio moves (buy, sell, hold)
     - Providing risk assessments
     - Recommending portfolio allocation strategies
+
+    Args:
+        async_tools: Use the async tool variants for runs with ``arun`` (default: False)
     """
-    return Agent(
+    # The portfolio engine pulls in NumPy and pandas, so it is imported here
+    if async_tools:
+        from tools.async_tools import aanalyze_portfolio as analyze_portfolio
+    else:
+        from tools.portfolio import analyze_portfolio
+
+    return trace_agent(Agent(
         name="Investment Advisor",
         role="Formulate investment recommendations and suggest specific portfolio actions",
-        model=OpenAIChat(id="gpt-4"),
+        model=create_model("gpt-4"),
+        tools=[analyze_portfolio],
         instructions=[
             "You are a seasoned investment advisor focused on providing actionable portfolio recommendations.",
             "Based on the research data and analytical insights, formulate specific investment recommendations.",
@@ -28,6 +40,7 @@ def create_advisor_agent() -> Agent:
             "  - Time horizon (Short-term, Medium-term, Long-term)",
             "Consider portfolio diversification and risk management in your recommendations.",
             "Suggest appropriate position sizes based on risk assessment.",
+            "Before sizing positions, call analyze_portfolio with the tickers you recommend to get their correlations, volatility, VaR/CVaR and minimum-variance, maximum-Sharpe and risk-parity weights, and base your sizes on those numbers.",
             "Identify sector rotation opportunities when relevant.",
             "Consider both growth and value investing opportunities.",
             "Always emphasize risk management and the importance of diversification.",
@@ -38,4 +51,4 @@ def create_advisor_agent() -> Agent:
         ],
         # add_datetime_to_instructions=True,
         markdown=True,
-    )
+    ))
@@ -1,7 +1,9 @@
 """Analyst Agent - Interprets market data and drafts insights."""
 
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
+
+from agents.models import create_model
+from runtime.tracing import trace_agent
 
 
 def create_analyst_agent() -> Agent:
@@ -14,10 +16,10 @@ def create_analyst_agent() -> Agent:
     - Drafting analytical insights and observations
     - Providing context and meaning to raw data
     """
-    return Agent(
+    return trace_agent(Agent(
         name="Market Analyst",
         role="Interpret market data, identify trends, and draft analytical insights",
-        model=OpenAIChat(id="gpt-4"),
+        model=create_model("gpt-4"),
         instructions=[
             "You are an expert financial analyst with deep knowledge of market dynamics and investment strategies.",
             "Analyze the market data provided by the Researcher to identify key trends and patterns.",
@@ -32,4 +34,4 @@ def create_analyst_agent() -> Agent:
         ],
         # add_datetime_to_instructions=True,
         markdown=True,
-    )
+    ))
@@ -0,0 +1,42 @@
+"""Model factory shared by the agents and the team leader."""
+
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from agno.models.base import Model
+
+# Replaces OpenAIChat when set (e.g., by the offline benchmarks); see set_model_factory()
+_model_factory: Optional[Callable[[str], "Model"]] = None
+
+
+def set_model_factory(factory: Optional[Callable[[str], "Model"]]) -> None:
+    """
+    Override how agent and team models are created.
+
+    Only agents and teams created after the call are affected.
+
+    Args:
+        factory: Function that takes a model ID (e.g., 'gpt-4') and returns an
+            Agno model, or None to restore the default OpenAIChat models
+    """
+    global _model_factory
+    _model_factory = factory
+
+
+def create_model(model_id: str) -> "Model":
+    """
+    Create the model for an agent or team.
+
+    Args:
+        model_id: OpenAI model ID (e.g., 'gpt-4', 'gpt-4o-mini')
+
+    Returns:
+        An ``OpenAIChat`` model, or whatever the factory set with
+        ``set_model_factory`` returns.
+    """
+    if _model_factory is not None:
+        return _model_factory(model_id)
+
+    from agno.models.openai import OpenAIChat
+
+    return OpenAIChat(id=model_id)
@@ -1,7 +1,9 @@
 """Reporter Agent - Compiles comprehensive investment report."""
 
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
+
+from agents.models import create_model
+from runtime.tracing import trace_agent
 
 
 def create_reporter_agent() -> Agent:
@@ -14,10 +16,10 @@ def create_reporter_agent() -> Agent:
     - Creating executive summaries
     - Presenting Market Outlook, Key Assets, and Recommendations
     """
-    return Agent(
+    return trace_agent(Agent(
         name="Investment Reporter",
         role="Compile comprehensive investment reports with market outlook, key assets, and recommendations",
-        model=OpenAIChat(id="gpt-4"),
+        model=create_model("gpt-4"),
         instructions=[
             "You are an expert financial reporter specializing in creating clear, comprehensive investment reports.",
             "Compile all information from the Researcher, Analyst, and Advisor into a well-structured report.",
@@ -57,4 +59,4 @@ def create_reporter_agent() -> Agent:
         ],
         # add_datetime_to_instructions=True,
         markdown=True,
-    )
+    ))
@@ -1,47 +1,96 @@
 """Researcher Agent - Fetches latest market data and news via Yfinance."""
 
 from agno.agent import Agent
-from agno.models.openai import OpenAIChat
-from tools.yfinance_tools import (
-    get_stock_info,
-    get_stock_news,
-    get_historical_data,
-    get_market_indices,
-    compare_stocks,
-)
 
+from agents.models import create_model
+from runtime.tracing import trace_agent
 
-def create_researcher_agent() -> Agent:
+
+def create_researcher_agent(async_tools: bool = False) -> Agent:
     """
     Create and return the Researcher agent.
 
     This agent is responsible for:
     - Fetching current market data for stocks and indices
-    - Retrieving latest news for specific stocks
+    - Retrieving latest news for specific stocks, de-duplicated across tickers
     - Getting historical price data and trends
     - Comparing multiple stocks
+    - Computing technical indicators
+    - Screening sectors and indices for top-ranked stocks
+    - Tracking rolling intraday statistics
+
+    Args:
+        async_tools: Use the async tool variants so that tool calls made in one
+            turn overlap when the agent is run with ``arun`` (default: False)
     """
-    return Agent(
-        name="Market Researcher",
-        role="Fetch and gather latest market data, stock prices, news, and financial information",
-        model=OpenAIChat(id="gpt-4"),
-        tools=[
+    # Tools are imported here so that importing this module stays cheap;
+    # the indicator engine pulls in NumPy and pandas.
+    if async_tools:
+        from tools.async_tools import (
+            aget_stock_info,
+            aget_stock_news,
+            aget_historical_data,
+            aget_market_indices,
+            acompare_stocks,
+            aget_technical_indicators,
+            ascreen_universe,
+            aget_intraday_stats,
+            aget_news_feed,
+        )
+        tools = [
+            aget_stock_info,
+            aget_stock_news,
+            aget_historical_data,
+            aget_market_indices,
+            acompare_stocks,
+            aget_technical_indicators,
+            ascreen_universe,
+            aget_intraday_stats,
+            aget_news_feed,
+        ]
+    else:
+        from tools.yfinance_tools import (
             get_stock_info,
             get_stock_news,
             get_historical_data,
             get_market_indices,
             compare_stocks,
-        ],
+        )
+        from tools.technical_indicators import get_technical_indicators
+        from tools.screener import screen_universe
+        from tools.intraday import get_intraday_stats
+        from tools.news import get_news_feed
+        tools = [
+            get_stock_info,
+            get_stock_news,
+            get_historical_data,
+            get_market_indices,
+            compare_stocks,
+            get_technical_indicators,
+            screen_universe,
+            get_intraday_stats,
+            get_news_feed,
+        ]
+
+    return trace_agent(Agent(
+        name="Market Researcher",
+        role="Fetch and gather latest market data, stock prices, news, and financial information",
+        model=create_model("gpt-4"),
+        tools=tools,
         instructions=[
             "You are a market research specialist focused on gathering accurate and timely financial data.",
             "Always fetch data for major market indices to understand overall market sentiment.",
             "When researching stocks, gather comprehensive information including price data, news, and historical trends.",
             "Use the compare_stocks function when analyzing multiple stocks to provide comparative insights.",
+            "Use get_technical_indicators for exact RSI, MACD, ATR, Bollinger band, volatility, drawdown and moving-average values instead of estimating them.",
+            "For sector or index questions (e.g., top semiconductor picks), use screen_universe on a named universe or a broad ticker list rather than guessing a short list, then research the top-ranked names in detail.",
+            "For intraday moves (today's range, VWAP, intraday volatility), use get_intraday_stats rather than minute bars from get_historical_data.",
             "Always include the latest news when researching specific stocks to capture market sentiment.",
+            "When researching several stocks, fetch their news with one get_news_feed call: each story is listed once with every ticker it covers, so do not repeat it per stock.",
             "Organize your findings clearly with proper categorization (market overview, stock analysis, news summary).",
             "Include data timestamps and sources in your research.",
         ],
         # add_datetime_to_instructions=True,
         # tool_calls=True,
         markdown=True,
-    )
+    ))
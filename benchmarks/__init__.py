@@ -0,0 +1 @@
+"""Benchmarks for the AI Investment Agent Team."""
@@ -0,0 +1,152 @@
+"""
+Memory benchmark for multi-ticker tool calls over large universes.
+
+Runs ``compare_stocks`` over universes of 1k/5k tickers with played-back
+market data and reports, per call and per ticker:
+
+- peak traced memory during the call (tracemalloc);
+- memory still held afterwards, i.e. the market data cache's footprint (the
+  cache cap is lifted so nothing is evicted);
+- the size of the JSON result handed to the agents.
+
+Synthetic ``.info`` dicts are padded to the size of a live yfinance payload
+(~170 keys including a business summary and officer list), since the real
+payload, not the handful of fields the tools read, is what fills the cache.
+
+Usage:
+    python -m benchmarks.memory
+    python -m benchmarks.memory --sizes 1000 -o /tmp/after.json --baseline /tmp/before.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from benchmarks.offline import ROOT, _git_commit, _reset_market_state, compare, universe
+from benchmarks.playback import MarketDataPlayback
+
+# Extra scalar fields added to each synthetic ``.info`` dict
+_INFO_PADDING_FIELDS = 150
+
+
+class LivePayloadPlayback(MarketDataPlayback):
+    """Playback whose ``.info`` dicts are as large as live yfinance ones."""
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        info = super().info(ticker)
+        name = info.get("longName", ticker)
+        info["longBusinessSummary"] = (
+            f"{name} designs, manufactures and markets products and services worldwide. " * 20
+        ).strip()
+        info["companyOfficers"] = [
+            {"name": f"Officer {i}", "title": "Executive Vice President", "age": 50 + i, "totalPay": 1_000_000 + i, "fiscalYear": 2024}
+            for i in range(10)
+        ]
+        for i in range(_INFO_PADDING_FIELDS):
+            info[f"metric{i}"] = float(i) + 0.5
+        return info
+
+
+def bench_memory(playback: Any, size: int, store_root: str) -> Dict[str, Any]:
+    """
+    Measure the memory of one cold ``compare_stocks`` call over ``size`` tickers.
+
+    Returns:
+        Peak, retained and result bytes, in total and per ticker.
+    """
+    from tools.cache import market_cache
+    from tools.yfinance_tools import compare_stocks
+
+    tickers = universe(size)
+    playback.prepare(tickers)
+    # Warm up imports and thread pools untimed
+    compare_stocks(tickers[:10])
+
+    _reset_market_state(store_root)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = compare_stocks(tickers)
+        peak = tracemalloc.get_traced_memory()[1]
+        result_bytes = len(json.dumps(result, default=str))
+        rows = sum(1 for row in result.values() if "error" not in row)
+        del result
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "tickers": size,
+        "rows": rows,
+        "peak_mem_bytes": peak,
+        "retained_mem_bytes": retained,
+        "result_bytes": result_bytes,
+        "peak_per_ticker_bytes": peak // size,
+        "retained_per_ticker_bytes": retained // size,
+        "cache_entries": market_cache.stats()["entries"],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the memory benchmark and write the results file."""
+    parser = argparse.ArgumentParser(description="Measure per-ticker memory of multi-ticker tools over large universes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000], help="Universe sizes (default: 1000 5000)")
+    parser.add_argument("-o", "--output", default=os.path.join(ROOT, "benchmarks", "results", "memory.json"), help="Results file to write")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression as a fraction (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    from tools.cache import market_cache
+    from tools.scheduler import request_scheduler
+
+    playback = LivePayloadPlayback()
+    request_scheduler.configure(rate=0)
+    max_bytes = market_cache.max_bytes
+    market_cache.max_bytes = 1 << 40
+
+    results: Dict[str, Any] = {"compare_stocks": {}}
+    try:
+        with tempfile.TemporaryDirectory() as store_root, playback.install():
+            for size in args.sizes:
+                print(f"Measuring compare_stocks memory with {size} tickers...", file=sys.stderr)
+                results["compare_stocks"][str(size)] = bench_memory(playback, size, store_root)
+    finally:
+        market_cache.max_bytes = max_bytes
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%} against {args.baseline}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+Offline benchmark suite for the tool layer and end-to-end analyses.
+
+Market data is played back from a recording (or synthesized) by
+``benchmarks.playback`` and every agent uses the scripted
+``benchmarks.stub_model.StubModel``, so results are free of network noise and
+need no API keys. Measured:
+
+- tool-layer throughput for universes of 10/100/1000 tickers, cold (empty
+  cache and OHLCV store), warm and from a market snapshot, as medians of
+  repeated runs;
+- ``analyze_investment(stream=False)`` latency in team, pipeline and fan-out mode;
+- peak traced memory (tracemalloc, in a separate run so timings aren't skewed);
+- yfinance requests, model invocations and tool calls.
+
+Results are written as JSON. With ``--baseline`` the run is compared against an
+earlier results file and exits non-zero if any timing, throughput or memory
+metric regressed by more than ``--tolerance``.
+
+Usage:
+    python -m benchmarks.offline
+    python -m benchmarks.offline --sizes 10 100 --repeats 3 -o /tmp/after.json --baseline /tmp/before.json
+    python -m benchmarks.offline --recording benchmarks/fixtures/market_data.json --network-latency-ms 50
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_QUERY = "Analyze AAPL, MSFT and NVDA and recommend a portfolio allocation"
+
+
+def universe(size: int) -> List[str]:
+    """Return ``size`` distinct, deterministic four-letter ticker symbols."""
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return ["".join(chars) for chars in itertools.islice(itertools.product(letters, repeat=4), size)]
+
+
+def _reset_market_state(store_root: str) -> None:
+    """Empty the market data cache and point the tools at a fresh OHLCV store."""
+    import tools.ohlcv_store as ohlcv_store
+    from tools.cache import market_cache
+
+    market_cache.clear()
+    ohlcv_store.ohlcv_store = ohlcv_store.OHLCVStore(tempfile.mkdtemp(dir=store_root))
+
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    """Run ``func`` under tracemalloc and return the peak traced allocation in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _median_time(func: Callable[[], Any], repeats: int, setup: Optional[Callable[[], None]] = None) -> float:
+    """Return the median wall time of ``repeats`` runs, calling ``setup`` untimed before each."""
+    times = []
+    for _ in range(max(1, repeats)):
+        if setup is not None:
+            setup()
+        times.append(_timed(func))
+    return statistics.median(times)
+
+
+def bench_tools(playback: Any, size: int, repeats: int, store_root: str) -> Dict[str, Any]:
+    """
+    Benchmark the multi-ticker tools over a universe of ``size`` tickers.
+
+    Each tool is timed cold (empty cache and OHLCV store), warm, and against
+    an in-memory ``SnapshotProvider`` of the universe, as the median of
+    ``repeats`` runs.
+
+    Returns:
+        Per-tool cold/warm/snapshot wall times and tickers per second, yfinance request
+        counts for one cold pass, and peak memory of a cold pass.
+    """
+    from tools.yfinance_tools import compare_stocks, get_market_indices
+    from tools.technical_indicators import get_technical_indicators
+
+    tickers = universe(size)
+    workload: List[Tuple[str, Callable[[], Any]]] = [
+        ("get_market_indices", get_market_indices),
+        ("compare_stocks", lambda: compare_stocks(tickers)),
+        ("get_technical_indicators", lambda: get_technical_indicators(tickers, period="1y")),
+    ]
+
+    def run_all() -> None:
+        for _, run in workload:
+            run()
+
+    def reset() -> None:
+        _reset_market_state(store_root)
+
+    # Generate the playback data and warm up imports and thread pools untimed
+    playback.prepare(tickers)
+    reset()
+    run_all()
+
+    results: Dict[str, Any] = {"tickers": size, "tools": {}}
+    for name, run in workload:
+        cold = _median_time(run, repeats, setup=reset)
+        warm = _median_time(run, repeats)
+        timings: Dict[str, Any] = {"cold_s": round(cold, 4), "warm_s": round(warm, 4)}
+        if name != "get_market_indices":
+            timings["cold_tickers_per_s"] = round(size / cold, 1) if cold else None
+            timings["warm_tickers_per_s"] = round(size / warm, 1) if warm else None
+        results["tools"][name] = timings
+
+    # The same workload answered from an in-memory snapshot of the universe
+    from tools.providers import SnapshotProvider, set_provider
+    from tools.yfinance_tools import MARKET_INDICES
+
+    set_provider(SnapshotProvider.capture(tickers + list(MARKET_INDICES)))
+    try:
+        for name, run in workload:
+            snapshot = _median_time(run, repeats)
+            results["tools"][name]["snapshot_s"] = round(snapshot, 4)
+            if name != "get_market_indices":
+                results["tools"][name]["snapshot_tickers_per_s"] = round(size / snapshot, 1) if snapshot else None
+    finally:
+        set_provider(None)
+
+    results["cold_total_s"] = round(sum(t["cold_s"] for t in results["tools"].values()), 4)
+    results["warm_total_s"] = round(sum(t["warm_s"] for t in results["tools"].values()), 4)
+
+    reset()
+    playback.reset_calls()
+    run_all()
+    results["yfinance_requests"] = dict(playback.calls)
+
+    reset()
+    results["peak_mem_bytes"] = _peak_memory(run_all)
+    return results
+
+
+def bench_analysis(playback: Any, mode: str, query: str, repeats: int, store_root: str) -> Dict[str, Any]:
+    """
+    Benchmark ``analyze_investment(stream=False)`` with stub models.
+
+    Cold runs start from an empty market data cache and OHLCV store; warm runs
+    reuse the cache, as repeated requests in one process would. The response
+    cache is bypassed.
+
+    Returns:
+        Median cold and warm latencies, yfinance/model/tool call counts for one
+        cold run and peak memory of a cold run.
+    """
+    from investment_team import analyze_investment
+    from tools.encoding import payload_stats
+    from benchmarks.stub_model import model_calls, reset_model_calls
+
+    def run() -> str:
+        return analyze_investment(query, stream=False, quiet=True, use_cache=False, mode=mode)
+
+    def reset() -> None:
+        _reset_market_state(store_root)
+
+    # Build the pooled team or agents outside the timed runs
+    reset()
+    run()
+
+    reset()
+    playback.reset_calls()
+    reset_model_calls()
+    payload_stats.reset()
+    run()
+    counts = {
+        "yfinance_requests": dict(playback.calls),
+        "model_calls": model_calls(),
+        "tool_calls": {tool: stats["calls"] for tool, stats in payload_stats.snapshot().items()},
+    }
+
+    cold = _median_time(run, repeats, setup=reset)
+    warm = _median_time(run, repeats)
+
+    reset()
+    peak = _peak_memory(run)
+
+    return {
+        "mode": mode,
+        "query": query,
+        "repeats": repeats,
+        "cold_s": round(cold, 4),
+        "warm_s": round(warm, 4),
+        "peak_mem_bytes": peak,
+        **counts,
+    }
+
+
+def _flatten(value: Any, prefix: str = "") -> Dict[str, float]:
+    if isinstance(value, dict):
+        flat: Dict[str, float] = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}.{key}" if prefix else str(key)))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: float(value)}
+    return {}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare benchmark results against a baseline.
+
+    Timings (``*_s``) and memory (``*_bytes``) regress when they grow, and
+    throughput (``*_per_s``) when it shrinks, by more than ``tolerance``
+    (a fraction, e.g. 0.2 for 20%). Metrics missing from either side are skipped.
+
+    Returns:
+        One human-readable line per regressed metric.
+    """
+    current, previous = _flatten(results["results"]), _flatten(baseline["results"])
+    regressions = []
+    for name, value in sorted(current.items()):
+        before = previous.get(name)
+        if not before:
+            continue
+        if name.endswith("_per_s"):
+            regressed = value < before * (1 - tolerance)
+        elif name.endswith("_s") or name.endswith("_bytes"):
+            regressed = value > before * (1 + tolerance)
+        else:
+            continue
+        if regressed:
+            regressions.append(f"{name}: {before:g} -> {value:g} ({(value - before) / before:+.0%})")
+    return regressions
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the offline benchmarks and write the results file."""
+    parser = argparse.ArgumentParser(description="Benchmark tools and analyses offline with recorded data and stub models.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000], help="Universe sizes for the tool benchmarks")
+    parser.add_argument("--modes", nargs="+", default=["team", "pipeline", "fanout"], choices=["team", "pipeline", "fanout"], help="Analysis modes to benchmark")
+    parser.add_argument("--query", default=DEFAULT_QUERY, help="Query for the analysis benchmarks")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per timing; the median is reported (default: 5)")
+    parser.add_argument("--recording", help="Recording from 'python -m benchmarks.playback record' (default: synthetic data)")
+    parser.add_argument("--network-latency-ms", type=float, default=0.0, help="Emulated latency per yfinance request")
+    parser.add_argument("--model-latency-ms", type=float, default=0.0, help="Emulated latency per model invocation")
+    parser.add_argument("-o", "--output", default=os.path.join(ROOT, "benchmarks", "results", "offline.json"), help="Results file to write")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression as a fraction (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    from agents.models import set_model_factory
+    from benchmarks.playback import MarketDataPlayback
+    from benchmarks.stub_model import stub_model_factory
+    from tools.scheduler import request_scheduler
+
+    if args.recording:
+        playback = MarketDataPlayback.load(args.recording, latency_s=args.network_latency_ms / 1000)
+    else:
+        playback = MarketDataPlayback(latency_s=args.network_latency_ms / 1000)
+    set_model_factory(stub_model_factory(latency_s=args.model_latency_ms / 1000))
+    # Playback has no upstream to protect; keep the scheduler's retries and
+    # concurrency limit but not Yahoo's request budget
+    request_scheduler.configure(rate=0)
+
+    results: Dict[str, Any] = {"tools": {}, "analysis": {}}
+    with tempfile.TemporaryDirectory() as store_root, playback.install():
+        for size in args.sizes:
+            print(f"Benchmarking tools with {size} tickers...", file=sys.stderr)
+            results["tools"][str(size)] = bench_tools(playback, size, args.repeats, store_root)
+        for mode in args.modes:
+            print(f"Benchmarking analyze_investment in {mode} mode...", file=sys.stderr)
+            results["analysis"][mode] = bench_analysis(playback, mode, args.query, args.repeats, store_root)
+    set_model_factory(None)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "recording": args.recording,
+            "network_latency_ms": args.network_latency_ms,
+            "model_latency_ms": args.model_latency_ms,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%} against {args.baseline}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""
+Recorded (or synthetic) yfinance backend for the offline benchmarks.
+
+``MarketDataPlayback`` stands in for the ``yfinance`` module: it serves
+``Ticker(...).info``, ``.news``, ``.history(...)`` and ``download(...)`` from a
+recording made with this module's ``record`` command, and synthesizes
+deterministic data (seeded by ticker) for anything the recording lacks, so
+universes of any size can be benchmarked without network access.
+
+Usage:
+    python -m benchmarks.playback record AAPL MSFT NVDA -o benchmarks/fixtures/market_data.json
+"""
+
+import json
+import sys
+import threading
+import time
+import types
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from tools.ohlcv_store import _day_bars, _period_start
+
+# Synthetic daily history length (about five years of trading days)
+HISTORY_DAYS = 1260
+
+_SECTORS = [
+    ("Technology", "Software - Infrastructure"),
+    ("Healthcare", "Drug Manufacturers - General"),
+    ("Financial Services", "Banks - Diversified"),
+    ("Consumer Cyclical", "Internet Retail"),
+    ("Energy", "Oil & Gas Integrated"),
+    ("Industrials", "Aerospace & Defense"),
+]
+
+_INTRADAY_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+_RESAMPLE_RULES = {"5d": "W-FRI", "1wk": "W-FRI", "1mo": "MS", "3mo": "QS"}
+
+
+def _seed(ticker: str) -> int:
+    return zlib.crc32(ticker.upper().encode("utf-8"))
+
+
+class MarketDataPlayback:
+    """
+    Thread-safe yfinance stand-in with call counting and optional latency.
+
+    Args:
+        recording: Recording as written by ``record`` (default: synthesize everything)
+        latency_s: Seconds each request sleeps, to emulate network round trips
+        end: Date of the last daily bar for synthetic data (default: today)
+    """
+
+    def __init__(self, recording: Optional[Dict[str, Any]] = None, latency_s: float = 0.0, end: Optional[str] = None):
+        self.recording = recording or {"info": {}, "news": {}, "history": {}}
+        self.latency_s = latency_s
+        self.end = pd.Timestamp(end or pd.Timestamp.now()).normalize()
+        self.calls: Counter = Counter()
+        self._daily: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, **kwargs: Any) -> "MarketDataPlayback":
+        """Create a playback backend from a recording file."""
+        with open(path) as f:
+            return cls(json.load(f), **kwargs)
+
+    def reset_calls(self) -> None:
+        """Reset the per-endpoint request counters."""
+        with self._lock:
+            self.calls.clear()
+
+    def _request(self, endpoint: str, count: int = 1) -> None:
+        with self._lock:
+            self.calls[endpoint] += 1
+            if count > 1:
+                self.calls[f"{endpoint}_tickers"] += count
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+    def prepare(self, tickers: List[str]) -> None:
+        """Build the daily histories for tickers up front, so benchmarks don't time data generation."""
+        for ticker in tickers:
+            self.daily(ticker)
+
+    def daily(self, ticker: str) -> pd.DataFrame:
+        """Return the full daily OHLCV history for a ticker (recorded or synthetic)."""
+        ticker = ticker.upper()
+        with self._lock:
+            frame = self._daily.get(ticker)
+        if frame is not None:
+            return frame
+
+        recorded = self.recording["history"].get(ticker)
+        if recorded:
+            frame = pd.DataFrame(recorded["data"], columns=recorded["columns"], index=pd.to_datetime(recorded["index"]))
+        else:
+            rng = np.random.default_rng(_seed(ticker))
+            close = rng.uniform(10, 500) * np.exp(np.cumsum(rng.normal(0.0003, 0.018, HISTORY_DAYS)))
+            spread = np.abs(rng.normal(0, 0.01, HISTORY_DAYS))
+            frame = pd.DataFrame(
+                {
+                    "Open": close * (1 + rng.normal(0, 0.005, HISTORY_DAYS)),
+                    "High": close * (1 + spread),
+                    "Low": close * (1 - spread),
+                    "Close": close,
+                    "Volume": rng.integers(100_000, 50_000_000, HISTORY_DAYS).astype(float),
+                },
+                index=pd.bdate_range(end=self.end, periods=HISTORY_DAYS),
+            )
+        with self._lock:
+            self._daily[ticker] = frame
+        return frame
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        """Return ``Ticker.info`` for a ticker (recorded or synthetic)."""
+        self._request("info")
+        recorded = self.recording["info"].get(ticker.upper())
+        if recorded is not None:
+            return dict(recorded)
+
+        rng = np.random.default_rng(_seed(ticker) + 1)
+        daily = self.daily(ticker)
+        year = daily["Close"].iloc[-252:]
+        sector, industry = _SECTORS[_seed(ticker) % len(_SECTORS)]
+        price = float(daily["Close"].iloc[-1])
+        return {
+            "longName": f"{ticker.upper()} Holdings Inc.",
+            "currentPrice": price,
+            "previousClose": float(daily["Close"].iloc[-2]),
+            "marketCap": int(price * rng.integers(50_000_000, 5_000_000_000)),
+            "trailingPE": float(rng.uniform(5, 60)),
+            "forwardPE": float(rng.uniform(5, 50)),
+            "dividendYield": float(rng.uniform(0, 4)),
+            "fiftyTwoWeekHigh": float(year.max()),
+            "fiftyTwoWeekLow": float(year.min()),
+            "volume": int(daily["Volume"].iloc[-1]),
+            "averageVolume": int(daily["Volume"].iloc[-60:].mean()),
+            "sector": sector,
+            "industry": industry,
+        }
+
+    def news(self, ticker: str) -> List[Dict[str, Any]]:
+        """Return ``Ticker.news`` for a ticker (recorded or synthetic)."""
+        self._request("news")
+        recorded = self.recording["news"].get(ticker.upper())
+        if recorded is not None:
+            return [dict(article) for article in recorded]
+
+        published = int(self.end.timestamp())
+        return [
+            {
+                "title": f"{ticker.upper()} headline {i + 1}",
+                "publisher": ("Reuters", "Bloomberg", "MarketWatch")[i % 3],
+                "link": f"https://example.com/{ticker.lower()}/{i + 1}",
+                "providerPublishTime": published - i * 3600,
+                "type": "STORY",
+            }
+            for i in range(8)
+        ]
+
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d", start: Optional[str] = None) -> pd.DataFrame:
+        """Return ``Ticker.history`` for a ticker, sliced and resampled like yfinance."""
+        self._request("history")
+        frame = self._bars(ticker, period, interval, start)
+        frame.index = frame.index.tz_localize("America/New_York")
+        return frame
+
+    def _bars(self, ticker: str, period: str, interval: str, start: Optional[str]) -> pd.DataFrame:
+        if interval in _INTRADAY_MINUTES:
+            return self._intraday(ticker, period, _INTRADAY_MINUTES[interval])
+
+        frame = self.daily(ticker)
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start)]
+        elif _day_bars(period) is not None:
+            frame = frame.iloc[-_day_bars(period):]
+        else:
+            first = _period_start(period, frame.index[-1])
+            frame = frame if first is None else frame[frame.index >= first]
+        rule = _RESAMPLE_RULES.get(interval)
+        if rule and not frame.empty:
+            frame = frame.resample(rule).agg(
+                {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+            ).dropna()
+        return frame.copy()
+
+    def _intraday(self, ticker: str, period: str, minutes: int) -> pd.DataFrame:
+        days = self.daily(ticker).iloc[-(_day_bars(period) or 5):]
+        bars_per_day = max(1, 390 // minutes)
+        rng = np.random.default_rng(_seed(ticker) + minutes)
+        frames = []
+        for day, row in days.iterrows():
+            path = row["Open"] * np.exp(np.cumsum(rng.normal(0, 0.001, bars_per_day)))
+            path *= row["Close"] / path[-1]
+            index = pd.date_range(day + pd.Timedelta(hours=9, minutes=30), periods=bars_per_day, freq=f"{minutes}min")
+            frames.append(pd.DataFrame(
+                {"Open": path, "High": path * 1.0005, "Low": path * 0.9995, "Close": path, "Volume": row["Volume"] / bars_per_day},
+                index=index,
+            ))
+        return pd.concat(frames) if frames else pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+
+    def download(
+        self, tickers: Any, period: Optional[str] = None, start: Optional[str] = None, interval: str = "1d", **kwargs: Any,
+    ) -> pd.DataFrame:
+        """Return a ``yf.download(group_by='ticker')`` frame for several tickers."""
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        self._request("download", count=len(tickers))
+        frames = {t: self._bars(t, period or "1mo", interval, start) for t in tickers}
+        return pd.concat(frames, axis=1)
+
+    def module(self) -> types.ModuleType:
+        """Build a ``yfinance`` module stand-in backed by this playback."""
+        playback = self
+
+        class Ticker:
+            def __init__(self, ticker: str):
+                self.ticker = ticker
+
+            @property
+            def info(self) -> Dict[str, Any]:
+                return playback.info(self.ticker)
+
+            @property
+            def news(self) -> List[Dict[str, Any]]:
+                return playback.news(self.ticker)
+
+            def history(self, period: str = "1mo", interval: str = "1d", start: Optional[str] = None, **kwargs: Any) -> pd.DataFrame:
+                return playback.history(self.ticker, period=period, interval=interval, start=start)
+
+        module = types.ModuleType("yfinance")
+        module.Ticker = Ticker
+        module.download = self.download
+        return module
+
+    @contextmanager
+    def install(self) -> Iterator["MarketDataPlayback"]:
+        """Serve every ``import yfinance`` from this playback while the block runs."""
+        previous = sys.modules.get("yfinance")
+        sys.modules["yfinance"] = self.module()
+        try:
+            yield self
+        finally:
+            if previous is None:
+                sys.modules.pop("yfinance", None)
+            else:
+                sys.modules["yfinance"] = previous
+
+
+def record(tickers: List[str], path: str, period: str = "5y") -> Any:
+    """
+    Record live yfinance responses for later playback.
+
+    The recording is a market snapshot file, so it can also be served directly
+    with ``tools.providers.SnapshotProvider.from_file``.
+
+    Args:
+        tickers: Ticker symbols to record
+        path: JSON file to write
+        period: Daily history to record (default: '5y')
+
+    Returns:
+        The recorded ``SnapshotProvider``.
+    """
+    from tools.providers import SnapshotProvider
+
+    snapshot = SnapshotProvider.capture(tickers, period=period)
+    snapshot.save(path)
+    print(f"Recorded {len(snapshot.tickers)} tickers as of {snapshot.as_of}", file=sys.stderr)
+    return snapshot
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for recording market data."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Record yfinance responses for the offline benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="Record info, news and daily history for tickers")
+    rec.add_argument("tickers", nargs="+", help="Ticker symbols to record")
+    rec.add_argument("-o", "--output", default="benchmarks/fixtures/market_data.json", help="Recording file to write")
+    rec.add_argument("--period", default="5y", help="Daily history to record (default: 5y)")
+    args = parser.parse_args(argv)
+
+    record(args.tickers, args.output, period=args.period)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Startup-time budget check for the CLI entry point.
+
+Measures how long ``import investment_team`` takes in fresh interpreters
+(minus bare interpreter startup) and exits non-zero if the median exceeds the
+budget, listing the slowest imports so the regression is easy to find.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget 0.1 --runs 10 --module investment_team
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _time_interpreter(code: str, runs: int) -> List[float]:
+    """Run ``python -c code`` in fresh processes and return wall times."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def slowest_imports(module: str, limit: int = 10) -> List[Tuple[str, float]]:
+    """
+    List the imports with the largest cumulative time using ``-X importtime``.
+
+    Returns:
+        List of (module name, cumulative seconds), slowest first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((parts[2].strip(), int(parts[1]) / 1e6))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:limit]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Measure import time and compare it against the budget."""
+    parser = argparse.ArgumentParser(description="Fail if importing the CLI module exceeds a startup-time budget.")
+    parser.add_argument("--module", default="investment_team", help="Module to import (default: investment_team)")
+    parser.add_argument(
+        "--budget", type=float, default=float(os.getenv("STARTUP_BUDGET_S", "0.15")),
+        help="Maximum median import time in seconds (default: 0.15, or STARTUP_BUDGET_S)",
+    )
+    parser.add_argument("--runs", type=int, default=7, help="Number of fresh interpreters to time (default: 7)")
+    args = parser.parse_args(argv)
+
+    baseline = statistics.median(_time_interpreter("pass", args.runs))
+    total = statistics.median(_time_interpreter(f"import {args.module}", args.runs))
+    import_time = max(0.0, total - baseline)
+
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "interpreter_s": round(baseline, 4),
+        "import_s": round(import_time, 4),
+        "budget_s": args.budget,
+        "passed": import_time <= args.budget,
+    }
+    print(json.dumps(report, indent=2))
+
+    if not report["passed"]:
+        print(f"\nImport of {args.module} exceeded the {args.budget:.3f}s budget. Slowest imports:", file=sys.stderr)
+        for name, seconds in slowest_imports(args.module):
+            print(f"  {seconds:8.3f}s  {name}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Deterministic stand-in for ``OpenAIChat`` used by the offline benchmarks.
+
+The stub follows a fixed script instead of calling a provider, while still
+driving the real Agno run loop, tools and team delegation:
+
+- a team leader delegates the request to each member in turn, then answers;
+- an agent with tools calls each tool once (per ticker for single-ticker
+  tools), then answers;
+- an agent without tools answers straight away.
+
+Answers are short summaries of what the model was given, and token usage is
+estimated from message sizes, so runs are repeatable and cost nothing.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from agno.metrics import MessageMetrics
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+
+from runtime.pipeline import parse_tickers
+
+# Rough characters-per-token ratio used for the usage estimates
+CHARS_PER_TOKEN = 4
+
+# Single-ticker tools are called for at most this many tickers per request
+MAX_TICKER_CALLS = 10
+
+_MEMBER_RE = re.compile(r'<member id="([^"]+)"')
+
+_calls: Counter = Counter()
+_calls_lock = threading.Lock()
+
+
+def model_calls() -> Dict[str, int]:
+    """Return the number of stub model invocations so far, per model ID."""
+    with _calls_lock:
+        return dict(_calls)
+
+
+def reset_model_calls() -> None:
+    """Reset the invocation counters."""
+    with _calls_lock:
+        _calls.clear()
+
+
+def _text(message: Message) -> str:
+    content = message.content
+    if content is None:
+        return ""
+    return content if isinstance(content, str) else json.dumps(content, default=str)
+
+
+@dataclass
+class StubModel(Model):
+    """
+    Scripted Agno model with no network access.
+
+    Args:
+        id: Model ID reported in run metrics (e.g., 'stub-gpt-4')
+        latency_s: Seconds to sleep per invocation, to emulate provider latency
+    """
+
+    id: str = "stub"
+    name: str = "StubModel"
+    provider: str = "Stub"
+    latency_s: float = 0.0
+
+    def invoke(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        assistant_message.metrics.start_timer()
+        response = self._respond(messages, tools)
+        assistant_message.metrics.stop_timer()
+        return response
+
+    async def ainvoke(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        import asyncio
+
+        assistant_message.metrics.start_timer()
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        response = self._script(messages, tools)
+        assistant_message.metrics.stop_timer()
+        return response
+
+    def invoke_stream(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> Iterator[ModelResponse]:
+        yield self._respond(messages, tools)
+
+    async def ainvoke_stream(
+        self,
+        messages: List[Message],
+        assistant_message: Message,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ModelResponse]:
+        yield await self.ainvoke(messages, assistant_message, tools=tools)
+
+    def _parse_provider_response(self, response: Any, **kwargs: Any) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        return response
+
+    def _respond(self, messages: List[Message], tools: Optional[List[Dict[str, Any]]]) -> ModelResponse:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return self._script(messages, tools)
+
+    def _script(self, messages: List[Message], tools: Optional[List[Dict[str, Any]]]) -> ModelResponse:
+        with _calls_lock:
+            _calls[self.id] += 1
+
+        last_user = max((i for i, m in enumerate(messages) if m.role == "user"), default=-1)
+        request = _text(messages[last_user]) if last_user >= 0 else ""
+        rounds = sum(1 for m in messages[last_user + 1:] if m.role == "assistant" and m.tool_calls)
+        schemas = {t["function"]["name"]: t["function"] for t in tools or [] if "function" in t}
+
+        tool_calls: List[Dict[str, Any]] = []
+        if "delegate_task_to_member" in schemas:
+            system = "\n".join(_text(m) for m in messages if m.role == "system")
+            members = _MEMBER_RE.findall(system)
+            if rounds < len(members):
+                tool_calls = [self._tool_call("delegate_task_to_member", {"member_id": members[rounds], "task": request})]
+        elif schemas and rounds == 0:
+            tool_calls = self._tool_calls(schemas, parse_tickers(request) or ["SPY"])
+
+        usage = MessageMetrics()
+        usage.input_tokens = sum(len(_text(m)) for m in messages) // CHARS_PER_TOKEN
+        response = ModelResponse(role="assistant", response_usage=usage)
+        if tool_calls:
+            response.tool_calls = tool_calls
+        else:
+            results = [m for m in messages[last_user + 1:] if m.role == "tool"]
+            response.content = (
+                f"[{self.id}] Summary for: {request[:200]}\n\n"
+                f"Based on {len(results)} tool results ({sum(len(_text(m)) for m in results)} characters) "
+                f"and {len(request)} characters of context."
+            )
+        usage.output_tokens = len(response.content or json.dumps(tool_calls)) // CHARS_PER_TOKEN
+        usage.total_tokens = usage.input_tokens + usage.output_tokens
+        return response
+
+    def _tool_calls(self, schemas: Dict[str, Dict[str, Any]], tickers: List[str]) -> List[Dict[str, Any]]:
+        calls = []
+        for name, schema in schemas.items():
+            params = schema.get("parameters", {}).get("properties", {})
+            if "ticker" in params:
+                calls.extend(self._tool_call(name, {"ticker": t}) for t in tickers[:MAX_TICKER_CALLS])
+            elif "tickers" in params:
+                calls.append(self._tool_call(name, {"tickers": tickers}))
+            elif not schema.get("parameters", {}).get("required"):
+                calls.append(self._tool_call(name, {}))
+        return calls
+
+    @staticmethod
+    def _tool_call(name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return {"type": "function", "function": {"name": name, "arguments": json.dumps(arguments)}}
+
+
+def stub_model_factory(latency_s: float = 0.0):
+    """
+    Build a factory for ``agents.models.set_model_factory`` that returns stub models.
+
+    Args:
+        latency_s: Seconds each model invocation takes (default: 0)
+    """
+    return lambda model_id: StubModel(id=f"stub-{model_id}", latency_s=latency_s)
@@ -13,33 +13,52 @@ Team Structure:
 Usage:
     python investment_team.py "Analyze AAPL, GOOGL, and MSFT"
     python investment_team.py "What's the market outlook for tech stocks?"
+    python investment_team.py --pipeline "Analyze AAPL, GOOGL, and MSFT"
+    python investment_team.py --fanout "Analyze AAPL, GOOGL, MSFT, NVDA, and AMZN"
 """
 
 import os
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
-from agno.agent import Agent
-from agno.models.openai import OpenAIChat
-from agno.team.team import Team
-from agents.researcher import create_researcher_agent
-from agents.analyst import create_analyst_agent
-from agents.advisor import create_advisor_agent
-from agents.reporter import create_reporter_agent
+from runtime.team_pool import TeamPool
+from runtime.response_cache import response_cache, cache_bypassed
+from runtime.coalesce import normalize_query, query_flight
+from runtime.tracing import trace_agent
+
+if TYPE_CHECKING:
+    from agno.team.team import Team
+
+# Agno, OpenAI and the agents are imported inside create_investment_team() so
+# that CLI startup (and the API key check) doesn't pay for them up front.
 
 # Load environment variables
 load_dotenv()
 
+# Teams are built once per process and reused; see get_team_pool()
+_team_pools = {}
+
 
-def create_investment_team() -> Team:
+def create_investment_team(async_tools: bool = False) -> "Team":
     """
     Create and configure the Investment Agent Team.
 
+    Args:
+        async_tools: Give the Researcher async tools for use with ``team.arun`` (default: False)
+
     Returns:
         Configured Team instance with all four agents.
     """
+    from agno.team.team import Team
+    from agents.models import create_model
+    from agents.researcher import create_researcher_agent
+    from agents.analyst import create_analyst_agent
+    from agents.advisor import create_advisor_agent
+    from agents.reporter import create_reporter_agent
+
     # Create all agents
-    researcher = create_researcher_agent()
+    researcher = create_researcher_agent(async_tools=async_tools)
     analyst = create_analyst_agent()
-    advisor = create_advisor_agent()
+    advisor = create_advisor_agent(async_tools=async_tools)
     reporter = create_reporter_agent()
 
     # Create the team with coordinate mode for collaborative work
@@ -47,7 +66,7 @@ def create_investment_team() -> Team:
         name="AI Investment Analysis Team",
         members=[researcher, analyst, advisor, reporter],
         # mode="coordinate",  # Agents work together in a coordinated fashion
-        model=OpenAIChat(id="gpt-4o-mini"),
+        model=create_model("gpt-4o-mini"),
         instructions=[
             "You are leading a team of investment professionals to provide comprehensive market analysis and recommendations.",
             "",
@@ -77,35 +96,145 @@ def create_investment_team() -> Team:
         markdown=True,
     )
 
-    return investment_team
+    return trace_agent(investment_team)
 
 
-def analyze_investment(query: str, stream: bool = True) -> str:
+def get_team_pool(async_tools: bool = False) -> TeamPool:
+    """
+    Get the process-wide pool of investment teams.
+
+    Args:
+        async_tools: Pool of teams whose Researcher uses async tools (default: False)
+
+    Returns:
+        TeamPool holding up to TEAM_POOL_SIZE teams (default: 8).
+    """
+    pool = _team_pools.get(async_tools)
+    if pool is None:
+        pool = _team_pools.setdefault(
+            async_tools,
+            TeamPool(
+                lambda: create_investment_team(async_tools=async_tools),
+                max_size=int(os.getenv("TEAM_POOL_SIZE", "8")),
+            ),
+        )
+    return pool
+
+
+def analyze_investment(
+    query: str,
+    stream: bool = True,
+    quiet: bool = False,
+    use_cache: bool = True,
+    mode: str = "team",
+) -> str:
     """
     Run investment analysis on a given query.
 
     Args:
         query: Investment analysis request (e.g., "Analyze AAPL and MSFT")
         stream: Whether to stream the response (default: True)
+        quiet: Skip printing the banner, e.g. when running in batch mode (default: False)
+        use_cache: Serve non-streamed results from the response cache when the
+            same query already ran against unchanged market data, and share the
+            run of an identical query already in progress (default: True;
+            RESPONSE_CACHE_BYPASS=1 disables both globally)
+        mode: "team" lets the team leader route work between the agents;
+            "pipeline" prefetches market data for the tickers in the query and
+            runs Analyst -> Advisor -> Reporter in a fixed order; "fanout" is
+            the pipeline with one Analyst per ticker run concurrently and the
+            Reporter merging their analyses (default: "team")
+
+    Returns:
+        Analysis result as a string
+    """
+    if not quiet:
+        print(f"\n{'='*80}")
+        print(f"AI INVESTMENT ANALYSIS TEAM")
+        print(f"{'='*80}")
+        print(f"Query: {query}")
+        print(f"{'='*80}\n")
+
+    if mode not in ("team", "pipeline", "fanout"):
+        raise ValueError(f"Unknown mode: {mode}")
+    if stream or not use_cache or cache_bypassed():
+        return _run_analysis(query, stream, use_cache, mode)
+
+    # Identical queries in flight at the same time share one run
+    return query_flight.do((mode, normalize_query(query)), lambda: _run_analysis(query, False, True, mode))
+
+
+def _run_analysis(query: str, stream: bool, use_cache: bool, mode: str) -> str:
+    if mode == "pipeline":
+        from runtime.pipeline import run_pipeline
+
+        return run_pipeline(query, stream=stream, use_cache=use_cache)
+    if mode == "fanout":
+        from runtime.fanout import run_fanout
+
+        return run_fanout(query, stream=stream, use_cache=use_cache)
+
+    # Run the team analysis on a pooled team with its own session
+    with get_team_pool().session() as (team, session_id):
+        if stream:
+            team.print_response(query, stream=True, session_id=session_id)
+            return ""
+        else:
+            bypass = not use_cache or cache_bypassed()
+            return response_cache.run(team, query, bypass=bypass, session_id=session_id)
+
+
+async def aanalyze_investment(query: str, stream: bool = True, quiet: bool = False, use_cache: bool = True) -> str:
+    """
+    Run investment analysis on a given query without blocking the event loop.
+
+    The Researcher's market data calls run on a shared, bounded worker pool, so
+    independent tool calls within one turn overlap and many analyses can be
+    awaited concurrently in a single process. Non-streamed calls are served
+    from the response cache when possible and share the run of an identical
+    query already in progress.
+
+    Args:
+        query: Investment analysis request (e.g., "Analyze AAPL and MSFT")
+        stream: Whether to stream the response (default: True)
+        quiet: Skip printing the banner, e.g. when running in batch mode (default: False)
+        use_cache: Serve non-streamed results from the response cache and share
+            in-flight runs of identical queries (default: True;
+            RESPONSE_CACHE_BYPASS=1 disables both globally)
 
     Returns:
         Analysis result as a string
     """
-    team = create_investment_team()
+    import asyncio
 
-    print(f"\n{'='*80}")
-    print(f"AI INVESTMENT ANALYSIS TEAM")
-    print(f"{'='*80}")
-    print(f"Query: {query}")
-    print(f"{'='*80}\n")
+    if not quiet:
+        print(f"\n{'='*80}")
+        print(f"AI INVESTMENT ANALYSIS TEAM")
+        print(f"{'='*80}")
+        print(f"Query: {query}")
+        print(f"{'='*80}\n")
 
-    # Run the team analysis
     if stream:
-        team.print_response(query, stream=True)
+        async with get_team_pool(async_tools=True).asession() as (team, session_id):
+            await team.aprint_response(query, stream=True, session_id=session_id)
         return ""
-    else:
-        response = team.run(query)
-        return response.content
+
+    bypass = not use_cache or cache_bypassed()
+
+    async def run() -> str:
+        # Run the team analysis on a pooled team with its own session
+        async with get_team_pool(async_tools=True).asession() as (team, session_id):
+            # Lookups replay tool calls and read from disk, so they run off the event loop
+            key, cached = await asyncio.to_thread(response_cache.lookup, team, query, bypass)
+            if cached is not None:
+                return cached
+            response = await team.arun(query, session_id=session_id)
+            await asyncio.to_thread(response_cache.store, key, response)
+            return response.content
+
+    if bypass:
+        return await run()
+    return await query_flight.ado(("team", normalize_query(query)), run)
 
 
 def main():
@@ -119,15 +248,22 @@ def main():
         print("Example: export OPENAI_API_KEY='your-api-key-here'")
         sys.exit(1)
 
+    # Fixed-order pipeline (or its per-ticker fan-out) instead of leader routing
+    args = sys.argv[1:]
+    mode = "team"
+    if args and args[0] in ("--pipeline", "--fanout"):
+        mode = args[0][2:]
+        args = args[1:]
+
     # Get query from command line or use default
-    if len(sys.argv) > 1:
-        query = " ".join(sys.argv[1:])
+    if args:
+        query = " ".join(args)
     else:
         # Default query for demonstration
         query = "Analyze the current market outlook and provide recommendations for AAPL, MSFT, and NVDA"
 
     # Run the analysis
-    analyze_investment(query, stream=True)
+    analyze_investment(query, stream=True, mode=mode)
 
 
 if __name__ == "__main__":
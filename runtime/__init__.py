@@ -0,0 +1,36 @@
+"""AI Investment Agent Team - Runtime helpers for running analyses at scale."""
+
+import importlib
+from typing import Any
+
+# Exports are resolved on first access to keep package import cheap.
+_EXPORTS = {
+    "run_batch": "runtime.batch",
+    "read_jobs": "runtime.batch",
+    "TeamPool": "runtime.team_pool",
+    "run_pipeline": "runtime.pipeline",
+    "parse_tickers": "runtime.pipeline",
+    "ResponseCache": "runtime.response_cache",
+    "response_cache": "runtime.response_cache",
+    "tracer": "runtime.tracing",
+    "trace_agent": "runtime.tracing",
+    "AnalysisEvent": "runtime.streaming",
+    "stream_analysis": "runtime.streaming",
+    "astream_analysis": "runtime.streaming",
+    "AnalysisServer": "runtime.server",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
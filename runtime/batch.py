@@ -0,0 +1,194 @@
+"""
+Batch query runner for the AI Investment Agent Team.
+
+Reads one query per line as JSONL (``{"id": "...", "query": "..."}`` or a bare
+JSON string), runs the queries with bounded parallelism in a single process so
+they share the market data cache, and writes one JSON result per line.
+
+Usage:
+    python -m runtime.batch queries.jsonl -o results.jsonl --workers 8
+    python -m runtime.batch queries.jsonl --pipeline
+    python -m runtime.batch queries.jsonl --fanout
+    python -m runtime.batch queries.jsonl --trace-dir traces/
+    python -m runtime.batch queries.jsonl --snapshot eod.json
+    cat queries.jsonl | python -m runtime.batch - > results.jsonl
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+
+
+def read_jobs(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    Parse batch jobs from JSONL lines.
+
+    Args:
+        lines: Lines of JSONL input; blank lines are skipped
+
+    Returns:
+        List of jobs with ``id`` and ``query`` keys. Lines that cannot be parsed
+        become jobs with an ``error`` key so they are still reported.
+    """
+    jobs = []
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            jobs.append({"id": str(number), "query": line, "error": f"Invalid JSON: {str(e)}"})
+            continue
+
+        if isinstance(record, str):
+            record = {"query": record}
+        if not isinstance(record, dict) or not record.get("query"):
+            jobs.append({"id": str(number), "query": None, "error": "Missing 'query' field"})
+            continue
+        jobs.append({"id": str(record.get("id", number)), "query": record["query"]})
+    return jobs
+
+
+def _default_runner(query: str, mode: str = "team") -> str:
+    from investment_team import analyze_investment
+
+    return analyze_investment(query, stream=False, quiet=True, mode=mode)
+
+
+def run_batch(
+    jobs: List[Dict[str, Any]],
+    workers: int = 4,
+    runner: Optional[Callable[[str], str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run batch jobs with bounded parallelism.
+
+    Args:
+        jobs: Jobs as returned by ``read_jobs``
+        workers: Maximum number of analyses running at once (default: 4)
+        runner: Function that turns a query into a report (default: ``analyze_investment``)
+
+    Yields:
+        One result per job, in completion order, with ``id``, ``query``,
+        ``content``, ``error`` and ``wall_time_s``.
+    """
+    runner = runner or _default_runner
+
+    def run(job: Dict[str, Any]) -> Dict[str, Any]:
+        result = {"id": job["id"], "query": job["query"], "content": None, "error": job.get("error")}
+        start = time.perf_counter()
+        if result["error"] is None:
+            try:
+                result["content"] = runner(job["query"])
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {str(e)}"
+        result["wall_time_s"] = round(time.perf_counter() - start, 3)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(run, job) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def summarize(results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """
+    Aggregate per-query results into batch statistics.
+
+    Returns:
+        Dictionary with counts, latency percentiles and throughput.
+    """
+    times = sorted(r["wall_time_s"] for r in results)
+
+    def percentile(p: float) -> Optional[float]:
+        if not times:
+            return None
+        return times[min(len(times) - 1, int(round(p * (len(times) - 1))))]
+
+    failed = sum(1 for r in results if r["error"])
+    return {
+        "total": len(results),
+        "succeeded": len(results) - failed,
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_min": round(len(results) / elapsed * 60, 2) if elapsed > 0 else None,
+        "latency_p50_s": percentile(0.5),
+        "latency_p95_s": percentile(0.95),
+        "latency_max_s": times[-1] if times else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point for batch mode."""
+    import argparse
+    import os
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Run investment analyses for many queries (JSONL in, JSONL out).")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file with queries, or '-' for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file for results, or '-' for stdout (default)")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Maximum analyses running at once (default: 4)")
+    parser.add_argument("--pipeline", action="store_true", help="Use the fixed-order pipeline instead of leader routing")
+    parser.add_argument("--fanout", action="store_true", help="Use the pipeline with one concurrent Analyst per ticker")
+    parser.add_argument("--trace-dir", help="Enable tracing and write trace.json and metrics.prom to this directory")
+    parser.add_argument("--snapshot", help="Answer every tool call from this market snapshot file instead of live data")
+    args = parser.parse_args(argv)
+    mode = "fanout" if args.fanout else "pipeline" if args.pipeline else "team"
+
+    if not os.getenv("OPENAI_API_KEY"):
+        print("ERROR: OPENAI_API_KEY not found in environment variables.", file=sys.stderr)
+        return 1
+
+    if args.snapshot:
+        from tools.providers import SnapshotProvider, set_provider
+
+        snapshot = SnapshotProvider.from_file(args.snapshot)
+        set_provider(snapshot)
+        print(f"Using market snapshot as of {snapshot.as_of} ({len(snapshot.tickers)} tickers)", file=sys.stderr)
+
+    if args.trace_dir:
+        from runtime.tracing import tracer
+
+        os.makedirs(args.trace_dir, exist_ok=True)
+        tracer.enable()
+
+    source: TextIO = sys.stdin if args.input == "-" else open(args.input)
+    with source:
+        jobs = read_jobs(source)
+
+    sink: TextIO = sys.stdout if args.output == "-" else open(args.output, "w")
+    results = []
+    start = time.perf_counter()
+    try:
+        for result in run_batch(jobs, workers=args.workers, runner=lambda query: _default_runner(query, mode)):
+            results.append(result)
+            sink.write(json.dumps(result) + "\n")
+            sink.flush()
+            status = "FAILED" if result["error"] else "ok"
+            print(f"[{len(results)}/{len(jobs)}] {result['id']}: {status} in {result['wall_time_s']:.1f}s", file=sys.stderr)
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+
+    from tools.cache import market_cache
+    from tools.encoding import payload_stats
+
+    summary = summarize(results, time.perf_counter() - start)
+    summary["market_cache"] = market_cache.stats()
+    summary["tool_payloads"] = payload_stats.snapshot()
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+
+    if args.trace_dir:
+        tracer.export_json(os.path.join(args.trace_dir, "trace.json"))
+        tracer.export_prometheus(os.path.join(args.trace_dir, "metrics.prom"))
+        print(f"Trace written to {args.trace_dir}", file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
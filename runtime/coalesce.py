@@ -0,0 +1,144 @@
+"""
+Single-flight de-duplication of concurrent identical work.
+
+When many callers ask for the same thing at once, ``SingleFlight`` lets the
+first one (the leader) do the work while the rest wait for and share its
+result, so upstream load scales with the number of distinct requests rather
+than the number of callers. It backs both the market data cache (one fetch per
+ticker and data kind in flight) and whole analyses (``query_flight``).
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """
+    Thread-safe registry of in-flight calls keyed by what they compute.
+
+    Works for threads (``do``) and coroutines (``ado``); both kinds of caller
+    can share the same call. Failures are shared with the callers waiting at
+    the time but never reused afterwards.
+
+    Args:
+        linger: Seconds a successful result keeps being handed to new callers
+            after the call finishes (default: 0, only in-flight calls are shared)
+    """
+
+    def __init__(self, linger: float = 0.0):
+        self.linger = linger
+        self._calls: Dict[Hashable, Tuple[Future, Optional[float]]] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.followers = 0
+
+    def begin(self, key: Hashable) -> Tuple[Future, bool]:
+        """
+        Join the call for ``key``, or start one if none is in flight.
+
+        Returns:
+            Tuple of (future, leader). The leader must call ``finish`` exactly
+            once; everyone else waits on the future.
+        """
+        with self._lock:
+            entry = self._calls.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                self.followers += 1
+                return entry[0], False
+            future: Future = Future()
+            self._calls[key] = (future, None)
+            self.leaders += 1
+            return future, True
+
+    def finish(self, key: Hashable, future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        """Publish the leader's result (or error) to every waiting caller."""
+        with self._lock:
+            now = time.monotonic()
+            if self._calls.get(key, (None,))[0] is future:
+                if error is None and self.linger > 0:
+                    self._calls[key] = (future, now + self.linger)
+                else:
+                    del self._calls[key]
+            if self.linger > 0:
+                for stale in [k for k, (_, expires) in self._calls.items() if expires is not None and expires <= now]:
+                    del self._calls[stale]
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return ``fn()``, sharing one call among concurrent callers with the same key."""
+        future, leader = self.begin(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, future, error=e)
+            raise
+        self.finish(key, future, result=result)
+        return result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async counterpart of ``do``.
+
+        The shared call runs as its own task, so a caller that is cancelled
+        stops waiting without cancelling the call for the others.
+        """
+        import asyncio
+
+        future, leader = self.begin(key)
+        if leader:
+            def publish(task: "asyncio.Task[Any]") -> None:
+                if task.cancelled():
+                    self.finish(key, future, error=asyncio.CancelledError())
+                elif task.exception() is not None:
+                    self.finish(key, future, error=task.exception())
+                else:
+                    self.finish(key, future, result=task.result())
+
+            asyncio.ensure_future(fn()).add_done_callback(publish)
+        # A cancelled wrapper would cancel the shared future too; shield it so
+        # only this caller stops waiting
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def in_flight(self) -> int:
+        """Return the number of calls currently running."""
+        with self._lock:
+            return sum(1 for _, expires in self._calls.values() if expires is None)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            Dictionary with calls started (leaders), callers that shared
+            another call (coalesced) and calls currently in flight.
+        """
+        with self._lock:
+            running = sum(1 for _, expires in self._calls.values() if expires is None)
+            return {"leaders": self.leaders, "coalesced": self.followers, "in_flight": running}
+
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for coalescing: case, surrounding punctuation and runs of whitespace are ignored.
+
+    Example:
+        "  Outlook for AAPL,  MSFT and NVDA? " -> "outlook for aapl, msft and nvda"
+    """
+    return _SPACE_RE.sub(" ", query).strip(" \t\n.?!").casefold()
+
+
+# Identical analyses running at the same time (or finished within the last
+# QUERY_COALESCE_WINDOW_S seconds) share one run
+query_flight = SingleFlight(linger=float(os.getenv("QUERY_COALESCE_WINDOW_S", "2")))
@@ -0,0 +1,269 @@
+"""
+Fan-out execution for multi-ticker requests.
+
+Market data is prefetched as in pipeline mode and split into one slice per
+ticker (or per sector). The Analyst then runs once per slice, concurrently on
+a bounded worker pool, so each prompt carries one ticker's data and a
+15-ticker request takes about as long as the slowest single-ticker analysis
+rather than one ever-longer analysis of all of them. The Advisor turns the
+combined analyses into recommendations and the Reporter merges everything
+into the usual Market Outlook / Key Assets / Recommendations report.
+"""
+
+import contextvars
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from runtime.pipeline import _stream_stage, get_agent_pool, parse_tickers, prefetch_market_data, run_pipeline, stream_pipeline
+from runtime.response_cache import response_cache, cache_bypassed
+from runtime.streaming import AGENT_FINISHED, AGENT_STARTED, ERROR, REPORT, RUN_STARTED, TOOL_FINISHED, TOOL_STARTED, AnalysisEvent
+from runtime.team_pool import TeamPool
+
+# Analyst runs in flight at once across all fan-out requests in the process
+FANOUT_MAX_WORKERS = int(os.getenv("FANOUT_MAX_WORKERS", "8"))
+
+# Ways of splitting a request into Analyst runs
+GROUP_BY = ("ticker", "sector")
+
+_executor = ThreadPoolExecutor(max_workers=FANOUT_MAX_WORKERS, thread_name_prefix="fanout-analyst")
+
+_analyst_pool: Optional[TeamPool] = None
+
+
+def get_analyst_pool() -> TeamPool:
+    """Get the process-wide pool of Analyst agents used by the fan-out workers."""
+    global _analyst_pool
+    if _analyst_pool is None:
+        from agents.analyst import create_analyst_agent
+
+        _analyst_pool = TeamPool(create_analyst_agent, max_size=FANOUT_MAX_WORKERS)
+    return _analyst_pool
+
+
+def split_market_data(data: Dict[str, Any], tickers: List[str], group_by: str = "ticker") -> Dict[str, Dict[str, Any]]:
+    """
+    Split prefetched market data into one slice per Analyst run.
+
+    Args:
+        data: Output of ``prefetch_market_data``
+        tickers: Tickers in the request, in order
+        group_by: "ticker" for one slice per ticker, or "sector" to group
+            tickers by their sector (tickers without one go to "Other")
+
+    Returns:
+        Dictionary mapping each group label to its slice: the market indices
+        plus info, history, news, technical indicators and comparison row of
+        each ticker in the group.
+    """
+    if group_by not in GROUP_BY:
+        raise ValueError(f"Unknown group_by: {group_by} (expected one of {', '.join(GROUP_BY)})")
+    stocks = data.get("stocks") or {}
+    indicators = data.get("technical_indicators") or {}
+    comparison = data.get("comparison") or {}
+
+    groups: Dict[str, List[str]] = {}
+    for ticker in tickers:
+        label = ticker
+        if group_by == "sector":
+            info = (stocks.get(ticker) or {}).get("info") or {}
+            sector = info.get("sector") if isinstance(info, dict) else None
+            label = sector if sector and sector != "N/A" else "Other"
+        groups.setdefault(label, []).append(ticker)
+
+    slices = {}
+    for label, members in groups.items():
+        members_data = {}
+        for ticker in members:
+            stock = dict(stocks.get(ticker) or {})
+            if ticker in indicators:
+                stock["technical_indicators"] = indicators[ticker]
+            if ticker in comparison:
+                stock["comparison"] = comparison[ticker]
+            members_data[ticker] = stock
+        slices[label] = {"market_indices": data.get("market_indices"), "stocks": members_data}
+    return slices
+
+
+def build_fanout_prompts(query: str, data: Dict[str, Any], slices: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the prompts for one fan-out run.
+
+    Returns:
+        Dictionary with "analysts" (group label -> Analyst prompt), and
+        "advisor" and "reporter" functions rendering those stages' prompts
+        from the per-group analyses (and the recommendations).
+    """
+    analysts = {}
+    for label, part in slices.items():
+        members = list(part["stocks"])
+        subject = label if members == [label] else f"the {label} group ({', '.join(members)})"
+        analysts[label] = (
+            f"Request: {query}\n\n"
+            f"Market data gathered by the Market Researcher for {subject}:\n{json.dumps(part, indent=1, default=str)}\n\n"
+            f"Analyze {subject} only; the other tickers in the request are analyzed separately."
+        )
+
+    def sections(analyses: Dict[str, str]) -> str:
+        return "\n\n".join(f"### {label}\n{analysis}" for label, analysis in analyses.items())
+
+    overview = json.dumps(
+        {"market_indices": data.get("market_indices"), "comparison": data.get("comparison")},
+        indent=1, default=str,
+    )
+    return {
+        "analysts": analysts,
+        "advisor": lambda analyses: (
+            f"Request: {query}\n\n"
+            f"Analyses from the Market Analyst, one per group:\n\n{sections(analyses)}\n\n"
+            "Formulate your investment recommendations across all of them."
+        ),
+        "reporter": lambda analyses, recommendations: (
+            f"Request: {query}\n\n"
+            f"Market overview gathered by the Market Researcher:\n{overview}\n\n"
+            f"Analyses from the Market Analyst, one per group:\n\n{sections(analyses)}\n\n"
+            f"Recommendations from the Investment Advisor:\n{recommendations}\n\n"
+            "Merge the separate analyses into one final investment report: a single Market Outlook, "
+            "every asset under Key Assets, and Recommendations covering all of them."
+        ),
+    }
+
+
+def _analyze(prompt: str, bypass: bool) -> Tuple[str, bool]:
+    """Run one Analyst on a pooled agent; returns its analysis and whether it came from the cache."""
+    with get_analyst_pool().session() as (analyst, session_id):
+        key, cached = response_cache.lookup(analyst, prompt, bypass=bypass)
+        if cached is not None:
+            return cached, True
+        response = analyst.run(prompt, session_id=session_id)
+        response_cache.store(key, response)
+        return response.content or "", False
+
+
+def run_analysts(prompts: Dict[str, str], bypass: bool = False) -> Iterator[Tuple[str, Any, bool, float]]:
+    """
+    Run the Analyst once per prompt on the shared worker pool.
+
+    Yields:
+        ``(label, analysis or exception, cached, duration_ms)`` for each
+        group, in order of completion.
+    """
+    started = time.perf_counter()
+    futures = {
+        _executor.submit(contextvars.copy_context().run, _analyze, prompt, bypass): label
+        for label, prompt in prompts.items()
+    }
+    for future in as_completed(futures):
+        duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        try:
+            analysis, cached = future.result()
+        except Exception as e:
+            yield futures[future], e, False, duration_ms
+        else:
+            yield futures[future], analysis, cached, duration_ms
+
+
+def _collect(prompts: Dict[str, str], outcomes: Dict[str, Any]) -> Dict[str, str]:
+    """Order the analyses like the request, noting failed groups; raise if every group failed."""
+    failures = [outcome for outcome in outcomes.values() if isinstance(outcome, Exception)]
+    if failures and len(failures) == len(outcomes):
+        raise failures[0]
+    return {
+        label: f"(Analysis unavailable: {type(outcomes[label]).__name__}: {outcomes[label]})"
+        if isinstance(outcomes[label], Exception) else outcomes[label]
+        for label in prompts
+    }
+
+
+def run_fanout(query: str, stream: bool = False, use_cache: bool = True, group_by: str = "ticker") -> str:
+    """
+    Run the fan-out: prefetch -> one Analyst per ticker (concurrently) -> Advisor -> Reporter.
+
+    Queries without tickers fall back to the pipeline.
+
+    Args:
+        query: Investment analysis request (e.g., "Analyze AAPL, MSFT and NVDA")
+        stream: Stream the Reporter's output to stdout (default: False)
+        use_cache: Serve stages from the response cache when their inputs are unchanged (default: True)
+        group_by: "ticker" (default) or "sector"
+
+    Returns:
+        Final report as a string ("" when streamed).
+    """
+    tickers = parse_tickers(query)
+    if not tickers:
+        return run_pipeline(query, stream=stream, use_cache=use_cache)
+
+    data = prefetch_market_data(tickers)
+    slices = split_market_data(data, tickers, group_by)
+    prompts = build_fanout_prompts(query, data, slices)
+    bypass = not use_cache or cache_bypassed()
+
+    outcomes = {label: outcome for label, outcome, _, _ in run_analysts(prompts["analysts"], bypass)}
+    analyses = _collect(prompts["analysts"], outcomes)
+
+    with get_agent_pool().session() as ((_, advisor, reporter), session_id):
+        recommendations = response_cache.run(advisor, prompts["advisor"](analyses), bypass=bypass, session_id=session_id)
+        report_prompt = prompts["reporter"](analyses, recommendations)
+        if stream:
+            reporter.print_response(report_prompt, stream=True, session_id=session_id)
+            return ""
+        return response_cache.run(reporter, report_prompt, bypass=bypass, session_id=session_id)
+
+
+def stream_fanout(query: str, use_cache: bool = True, group_by: str = "ticker") -> Iterator[AnalysisEvent]:
+    """
+    Run the fan-out and yield its events as they happen.
+
+    Each Analyst run is reported as ``agent_started`` up front and
+    ``agent_finished`` (with its analysis) as it completes, named after its
+    group, e.g. "Market Analyst [AAPL]"; the Advisor and Reporter stream as
+    in pipeline mode.
+
+    Yields:
+        ``AnalysisEvent`` objects, ending with a ``report`` or ``error`` event.
+    """
+    tickers = parse_tickers(query)
+    if not tickers:
+        yield from stream_pipeline(query, use_cache=use_cache)
+        return
+
+    yield AnalysisEvent(RUN_STARTED, agent="Fan-out")
+    yield AnalysisEvent(TOOL_STARTED, agent="Fan-out", tool="prefetch_market_data", args={"tickers": tickers})
+    start = time.perf_counter()
+    try:
+        data = prefetch_market_data(tickers)
+        slices = split_market_data(data, tickers, group_by)
+    except Exception as e:
+        yield AnalysisEvent(ERROR, agent="Fan-out", error=f"{type(e).__name__}: {str(e)}")
+        return
+    yield AnalysisEvent(TOOL_FINISHED, agent="Fan-out", tool="prefetch_market_data", duration_ms=round((time.perf_counter() - start) * 1000, 3))
+
+    prompts = build_fanout_prompts(query, data, slices)
+    bypass = not use_cache or cache_bypassed()
+    for label in prompts["analysts"]:
+        yield AnalysisEvent(AGENT_STARTED, agent=f"Market Analyst [{label}]")
+
+    outcomes: Dict[str, Any] = {}
+    cached = True
+    for label, outcome, hit, duration_ms in run_analysts(prompts["analysts"], bypass):
+        outcomes[label] = outcome
+        cached &= hit
+        if isinstance(outcome, Exception):
+            yield AnalysisEvent(ERROR, agent=f"Market Analyst [{label}]", error=f"{type(outcome).__name__}: {str(outcome)}", duration_ms=duration_ms)
+        else:
+            yield AnalysisEvent(AGENT_FINISHED, agent=f"Market Analyst [{label}]", content=outcome, cached=hit, duration_ms=duration_ms)
+
+    outputs: List[str] = []
+    try:
+        analyses = _collect(prompts["analysts"], outcomes)
+        # A failed stage propagates through the checkout, so the pool drops those agents
+        with get_agent_pool().session() as ((_, advisor, reporter), session_id):
+            cached &= yield from _stream_stage(advisor, prompts["advisor"](analyses), bypass, session_id, outputs)
+            cached &= yield from _stream_stage(reporter, prompts["reporter"](analyses, outputs[0]), bypass, session_id, outputs)
+    except Exception as e:
+        yield AnalysisEvent(ERROR, agent="Fan-out", error=f"{type(e).__name__}: {str(e)}")
+        return
+    yield AnalysisEvent(REPORT, agent="Fan-out", content=outputs[1], cached=cached)
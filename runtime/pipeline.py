@@ -0,0 +1,257 @@
+"""
+Deterministic pipeline execution for standard "analyze tickers X, Y, Z" requests.
+
+Instead of letting the team leader route work at runtime, market data is
+prefetched directly through the tools for the tickers named in the query, and
+the Analyst, Advisor and Reporter run strictly in sequence, each receiving the
+previous stage's output. That is three model calls per request with no routing
+round trips.
+"""
+
+import contextvars
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from runtime.team_pool import TeamPool
+from runtime.response_cache import response_cache, cache_bypassed
+from runtime.streaming import AGENT_FINISHED, ERROR, REPORT, RUN_STARTED, TOOL_FINISHED, TOOL_STARTED, AnalysisEvent, convert_event
+
+
+# Upper-case words that look like tickers but aren't: common abbreviations,
+# exchanges, regulators and macro terms
+_NOT_TICKERS = {
+    "A", "I", "AI", "AN", "AND", "ARE", "AS", "AT", "BE", "BUY", "BY", "CEO", "CFO", "DO", "EPS", "ETF",
+    "EU", "EV", "FOR", "GDP", "HOLD", "IF", "IN", "IPO", "IS", "IT", "ME", "MY", "NOT", "OF", "ON", "OR",
+    "PE", "Q", "SELL", "SO", "THE", "TO", "UK", "US", "USA", "USD", "VS", "WE", "YTD",
+    "AMEX", "API", "ATH", "CAGR", "CPI", "DCF", "DOJ", "ECB", "ESG", "FDA", "FED", "FOMC", "FTC", "FX",
+    "FY", "IMF", "INC", "IRS", "LLC", "LTD", "NASDAQ", "NAV", "NYSE", "OTC", "PPI", "QOQ", "REIT", "ROE",
+    "ROI", "SEC", "YOY",
+}
+
+# Names written with '&' map to their ticker, or to None when they aren't a stock
+# (index names are covered by the market indices every prefetch includes)
+_AMPERSAND_NAMES = {"AT&T": "T", "P&G": "PG", "J&J": "JNJ", "S&P": None, "M&A": None, "R&D": None}
+
+# '&' joins letters into one word ('S&P', 'AT&T') so its parts are never read as tickers
+_TICKER_RE = re.compile(r"(?<![\w$&])\$?([A-Z]{1,5}(?:&[A-Z]{1,5}|[.-][A-Z]{1,2})?)(?![\w&])")
+
+
+def parse_tickers(query: str) -> List[str]:
+    """
+    Extract ticker symbols from a free-text query.
+
+    Upper-case words of up to five letters (optionally with a class suffix such
+    as 'BRK.B') count as tickers unless they are common abbreviations; words
+    prefixed with '$' always count. Names with '&' are only recognized if
+    known ('AT&T' is T, 'S&P' is not a stock).
+
+    Args:
+        query: Investment analysis request (e.g., "Analyze AAPL, MSFT and $NVDA")
+
+    Returns:
+        Ticker symbols in order of first appearance, without duplicates.
+    """
+    tickers = []
+    for match in _TICKER_RE.finditer(query):
+        symbol = match.group(1)
+        if "&" in symbol:
+            symbol = _AMPERSAND_NAMES.get(symbol)
+            if symbol is not None:
+                tickers.append(symbol)
+            continue
+        explicit = match.group(0).startswith("$")
+        if explicit or symbol not in _NOT_TICKERS:
+            tickers.append(symbol)
+    return list(dict.fromkeys(tickers))
+
+
+def prefetch_market_data(tickers: List[str], max_news: int = 5) -> Dict[str, Any]:
+    """
+    Fetch everything the Researcher would gather, concurrently and without a model.
+
+    Args:
+        tickers: Ticker symbols to research
+        max_news: Maximum news articles per ticker (default: 5)
+
+    Returns:
+        Dictionary with market indices, per-ticker info/history/news, a
+        side-by-side comparison and technical indicators.
+    """
+    from tools.yfinance_tools import (
+        get_stock_info,
+        get_stock_news,
+        get_historical_data,
+        get_market_indices,
+        compare_stocks,
+    )
+    from tools.technical_indicators import get_technical_indicators
+
+    jobs: Dict[Tuple[str, ...], Callable[[], Any]] = {("market_indices",): get_market_indices}
+    if tickers:
+        jobs[("technical_indicators",)] = lambda: get_technical_indicators(tickers)
+    if len(tickers) > 1:
+        jobs[("comparison",)] = lambda: compare_stocks(tickers)
+    for ticker in tickers:
+        jobs[("stocks", ticker, "info")] = lambda t=ticker: get_stock_info(t)
+        jobs[("stocks", ticker, "history_3mo")] = lambda t=ticker: get_historical_data(t, period="3mo")
+        jobs[("stocks", ticker, "news")] = lambda t=ticker: get_stock_news(t, max_news=max_news)
+
+    with ThreadPoolExecutor(max_workers=min(16, len(jobs))) as pool:
+        futures = {path: pool.submit(contextvars.copy_context().run, job) for path, job in jobs.items()}
+
+    data: Dict[str, Any] = {}
+    for path, future in futures.items():
+        try:
+            value = future.result()
+        except Exception as e:
+            value = {"error": str(e)}
+        node = data
+        for part in path[:-1]:
+            node = node.setdefault(part, {})
+        node[path[-1]] = value
+    return data
+
+
+def _create_pipeline_agents() -> Tuple[Any, Any, Any]:
+    from agents.analyst import create_analyst_agent
+    from agents.advisor import create_advisor_agent
+    from agents.reporter import create_reporter_agent
+
+    return create_analyst_agent(), create_advisor_agent(), create_reporter_agent()
+
+
+_agent_pool: Optional[TeamPool] = None
+
+
+def get_agent_pool() -> TeamPool:
+    """Get the process-wide pool of (analyst, advisor, reporter) agent triples."""
+    global _agent_pool
+    if _agent_pool is None:
+        _agent_pool = TeamPool(_create_pipeline_agents, max_size=int(os.getenv("TEAM_POOL_SIZE", "8")))
+    return _agent_pool
+
+
+def build_prompts(query: str, data: Dict[str, Any]) -> Dict[str, Callable[..., str]]:
+    """
+    Build the prompt for each pipeline stage.
+
+    Returns:
+        Dictionary of stage name to a function that renders that stage's prompt
+        from the outputs of the stages before it.
+    """
+    market_data = json.dumps(data, indent=1, default=str)
+    return {
+        "analyst": lambda: (
+            f"Request: {query}\n\n"
+            f"Market data gathered by the Market Researcher:\n{market_data}\n\n"
+            "Analyze this data."
+        ),
+        "advisor": lambda analysis: (
+            f"Request: {query}\n\n"
+            f"Analysis from the Market Analyst:\n{analysis}\n\n"
+            "Formulate your investment recommendations."
+        ),
+        "reporter": lambda analysis, recommendations: (
+            f"Request: {query}\n\n"
+            f"Market data gathered by the Market Researcher:\n{market_data}\n\n"
+            f"Analysis from the Market Analyst:\n{analysis}\n\n"
+            f"Recommendations from the Investment Advisor:\n{recommendations}\n\n"
+            "Compile the final investment report."
+        ),
+    }
+
+
+def run_pipeline(query: str, stream: bool = False, use_cache: bool = True) -> str:
+    """
+    Run the fixed prefetch -> Analyst -> Advisor -> Reporter pipeline.
+
+    Args:
+        query: Investment analysis request (e.g., "Analyze AAPL and MSFT")
+        stream: Stream the Reporter's output to stdout (default: False)
+        use_cache: Serve stages from the response cache when their inputs are unchanged (default: True)
+
+    Returns:
+        Final report as a string ("" when streamed).
+    """
+    data = prefetch_market_data(parse_tickers(query))
+    prompts = build_prompts(query, data)
+    bypass = not use_cache or cache_bypassed()
+
+    with get_agent_pool().session() as ((analyst, advisor, reporter), session_id):
+        analysis = response_cache.run(analyst, prompts["analyst"](), bypass=bypass, session_id=session_id)
+        recommendations = response_cache.run(advisor, prompts["advisor"](analysis), bypass=bypass, session_id=session_id)
+        report_prompt = prompts["reporter"](analysis, recommendations)
+        if stream:
+            reporter.print_response(report_prompt, stream=True, session_id=session_id)
+            return ""
+        return response_cache.run(reporter, report_prompt, bypass=bypass, session_id=session_id)
+
+
+def _stream_stage(runner: Any, prompt: str, bypass: bool, session_id: str, result: List[str]) -> Iterator[AnalysisEvent]:
+    """
+    Stream one pipeline stage, serving it from the response cache when possible.
+
+    The stage's output is appended to ``result``; the generator returns True
+    if it came from the cache.
+    """
+    key, cached = response_cache.lookup(runner, prompt, bypass=bypass)
+    if cached is not None:
+        yield AnalysisEvent(AGENT_FINISHED, agent=runner.name, content=cached, cached=True)
+        result.append(cached)
+        return True
+
+    for event in runner.run(prompt, stream=True, stream_events=True, session_id=session_id):
+        converted = convert_event(event)
+        if converted is None:
+            continue
+        if converted.type == AGENT_FINISHED:
+            response_cache.store(key, event)
+            result.append(converted.content or "")
+        if converted.type == ERROR:
+            raise RuntimeError(converted.error)
+        yield converted
+    return False
+
+
+def stream_pipeline(query: str, use_cache: bool = True) -> Iterator[AnalysisEvent]:
+    """
+    Run the fixed pipeline and yield its events as they happen.
+
+    The prefetch is reported as a single ``prefetch_market_data`` tool call,
+    followed by the events of each stage and a final ``report`` event.
+
+    Args:
+        query: Investment analysis request (e.g., "Analyze AAPL and MSFT")
+        use_cache: Serve stages from the response cache when their inputs are unchanged (default: True)
+
+    Yields:
+        ``AnalysisEvent`` objects, ending with a ``report`` or ``error`` event.
+    """
+    yield AnalysisEvent(RUN_STARTED, agent="Pipeline")
+    tickers = parse_tickers(query)
+    yield AnalysisEvent(TOOL_STARTED, agent="Pipeline", tool="prefetch_market_data", args={"tickers": tickers})
+    start = time.perf_counter()
+    try:
+        data = prefetch_market_data(tickers)
+    except Exception as e:
+        yield AnalysisEvent(ERROR, agent="Pipeline", error=f"{type(e).__name__}: {str(e)}")
+        return
+    yield AnalysisEvent(TOOL_FINISHED, agent="Pipeline", tool="prefetch_market_data", duration_ms=round((time.perf_counter() - start) * 1000, 3))
+
+    prompts = build_prompts(query, data)
+    bypass = not use_cache or cache_bypassed()
+    outputs: List[str] = []
+    try:
+        # A failed stage propagates through the checkout, so the pool drops those agents
+        with get_agent_pool().session() as ((analyst, advisor, reporter), session_id):
+            cached = yield from _stream_stage(analyst, prompts["analyst"](), bypass, session_id, outputs)
+            cached &= yield from _stream_stage(advisor, prompts["advisor"](outputs[0]), bypass, session_id, outputs)
+            cached &= yield from _stream_stage(reporter, prompts["reporter"](outputs[0], outputs[1]), bypass, session_id, outputs)
+    except Exception as e:
+        yield AnalysisEvent(ERROR, agent="Pipeline", error=f"{type(e).__name__}: {str(e)}")
+        return
+    yield AnalysisEvent(REPORT, agent="Pipeline", content=outputs[2], cached=cached)
@@ -0,0 +1,294 @@
+"""Content-addressed cache of agent and team responses."""
+
+import hashlib
+import importlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Market data tools whose calls are replayed to fingerprint the data a cached
+# response was based on. Async variants share these names.
+REPLAYABLE_TOOLS = {
+    "get_stock_info": "tools.yfinance_tools",
+    "get_stock_news": "tools.yfinance_tools",
+    "get_historical_data": "tools.yfinance_tools",
+    "get_market_indices": "tools.yfinance_tools",
+    "compare_stocks": "tools.yfinance_tools",
+    "get_technical_indicators": "tools.technical_indicators",
+    "screen_universe": "tools.screener",
+    "analyze_portfolio": "tools.portfolio",
+    "get_intraday_stats": "tools.intraday",
+    "get_news_feed": "tools.news",
+}
+
+# Tools with side effects or results that change on every call (the news feed
+# records articles and reports a global cursor; intraday stats move with the
+# forming bar) are fingerprinted through a stable stand-in in the same module
+# instead of being replayed
+FINGERPRINT_FUNCTIONS = {
+    "get_intraday_stats": "intraday_fingerprint",
+    "get_news_feed": "news_fingerprint",
+}
+
+
+def _digest(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _tool_name(tool: Any) -> str:
+    return getattr(tool, "name", None) or getattr(tool, "__name__", None) or type(tool).__name__
+
+
+def describe(runner: Any) -> Dict[str, Any]:
+    """
+    Describe everything about an agent or team that shapes its output.
+
+    Returns:
+        Dictionary with name, model id, instructions, tool names and (for
+        teams) the same description for every member.
+    """
+    model = getattr(runner, "model", None)
+    description = {
+        "name": getattr(runner, "name", None),
+        "model": getattr(model, "id", None),
+        "instructions": getattr(runner, "instructions", None),
+        "tools": sorted(_tool_name(t) for t in (getattr(runner, "tools", None) or [])),
+    }
+    members = getattr(runner, "members", None)
+    if members:
+        description["members"] = [describe(member) for member in members]
+    return description
+
+
+def collect_tool_calls(response: Any) -> List[Dict[str, Any]]:
+    """
+    Collect the replayable market data tool calls made during a run.
+
+    Walks the response and, for team runs, every member response.
+
+    Returns:
+        De-duplicated list of ``{"name": ..., "args": ...}`` in call order.
+    """
+    calls: List[Dict[str, Any]] = []
+    seen = set()
+    pending = [response]
+    while pending:
+        current = pending.pop(0)
+        for execution in getattr(current, "tools", None) or []:
+            if execution.tool_name not in REPLAYABLE_TOOLS:
+                continue
+            call = {"name": execution.tool_name, "args": execution.tool_args or {}}
+            marker = _digest(call)
+            if marker not in seen:
+                seen.add(marker)
+                calls.append(call)
+        pending.extend(getattr(current, "member_responses", None) or [])
+    return calls
+
+
+def fingerprint(tool_calls: List[Dict[str, Any]]) -> str:
+    """
+    Fingerprint the market data behind a set of tool calls.
+
+    Calls are re-executed through the tools (and so through the shared market
+    data cache); the hash changes whenever any result does. The undecorated
+    tools are called, so replays don't count towards tool payload stats or
+    traces, and the hash doesn't depend on the tool output mode. Tools listed
+    in ``FINGERPRINT_FUNCTIONS`` are represented by their stand-in instead.
+    """
+    results = []
+    for call in tool_calls:
+        name = FINGERPRINT_FUNCTIONS.get(call["name"], call["name"])
+        func = getattr(importlib.import_module(REPLAYABLE_TOOLS[call["name"]]), name)
+        func = getattr(func, "__wrapped__", func)
+        try:
+            results.append(func(**call["args"]))
+        except Exception as e:
+            results.append({"error": str(e)})
+    return _digest(results)
+
+
+class ResponseCache:
+    """
+    Cache of final responses keyed by what produced them.
+
+    The key hashes the runner's description (instructions, model ids, tools,
+    members) and the input. Each entry also records the market data tool calls
+    the run made and a fingerprint of their results; a hit is only served if
+    replaying those calls yields the same fingerprint, so cached reports are
+    never returned over changed market data. With a ``root`` directory entries
+    are files shared across processes; without one they are kept in memory.
+    """
+
+    def __init__(self, root: Optional[str] = None, ttl: float = 900.0, max_entries: int = 500):
+        self.root = os.path.expanduser(root) if root else None
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # Entries of a cache without a root, oldest first
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def key(self, runner: Any, input: Any) -> str:
+        """Return the content address for running ``input`` through ``runner``."""
+        return _digest({"runner": describe(runner), "input": input})
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return a cached response if it is fresh and its market data is unchanged.
+        """
+        entry = self._read(key)
+        if entry is None or time.time() - entry["created_at"] > self.ttl:
+            return None
+        if fingerprint(entry["tool_calls"]) != entry["fingerprint"]:
+            return None
+        return entry["content"]
+
+    def put(self, key: str, content: str, tool_calls: List[Dict[str, Any]]) -> None:
+        """Store a response along with the tool calls it consumed."""
+        entry = {
+            "created_at": time.time(),
+            "content": content,
+            "tool_calls": tool_calls,
+            "fingerprint": fingerprint(tool_calls),
+        }
+        if self.root is None:
+            with self._lock:
+                self._memory[key] = entry
+                self._memory.move_to_end(key)
+                while len(self._memory) > self.max_entries:
+                    self._memory.popitem(last=False)
+            return
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(key)
+        with open(path + ".tmp", "w") as f:
+            json.dump(entry, f, default=str)
+        os.replace(path + ".tmp", path)
+        self._evict()
+
+    def lookup(self, runner: Any, input: Any, bypass: bool = False) -> Tuple[str, Optional[str]]:
+        """
+        Look up the cached response for running ``input`` through ``runner``.
+
+        Args:
+            runner: Agno Agent or Team
+            input: Input that would be passed to ``runner.run``
+            bypass: Skip the lookup (nothing is counted)
+
+        Returns:
+            Tuple of (key, cached content or None); pass the key to ``store``.
+        """
+        key = self.key(runner, input)
+        if bypass:
+            return key, None
+        cached = self.get(key)
+        with self._lock:
+            if cached is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return key, cached
+
+    def store(self, key: str, response: Any) -> None:
+        """Cache a finished run output (or run-completed event) if it has text content."""
+        content = getattr(response, "content", None)
+        if isinstance(content, str) and content:
+            self.put(key, content, collect_tool_calls(response))
+
+    def run(self, runner: Any, input: Any, bypass: bool = False, **run_kwargs: Any) -> str:
+        """
+        Run an agent or team, serving the response from cache when possible.
+
+        Args:
+            runner: Agno Agent or Team
+            input: Input passed to ``runner.run``
+            bypass: Skip the lookup and always run (the fresh result is still stored)
+            **run_kwargs: Extra keyword arguments for ``runner.run`` (e.g., session_id)
+
+        Returns:
+            Response content as a string.
+        """
+        key, cached = self.lookup(runner, input, bypass=bypass)
+        if cached is not None:
+            return cached
+
+        response = runner.run(input, **run_kwargs)
+        self.store(key, response)
+        return response.content
+
+    def clear(self) -> int:
+        """Delete every cached response and return how many were removed."""
+        if self.root is None:
+            with self._lock:
+                removed = len(self._memory)
+                self._memory.clear()
+            return removed
+        removed = 0
+        for name in self._entries():
+            try:
+                os.remove(os.path.join(self.root, name))
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the number of stored entries."""
+        entries = len(self._memory) if self.root is None else len(self._entries())
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key + ".json")
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.root is None:
+            with self._lock:
+                return self._memory.get(key)
+        try:
+            with open(self._path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _entries(self) -> List[str]:
+        try:
+            return [name for name in os.listdir(self.root) if name.endswith(".json")]
+        except OSError:
+            return []
+
+    def _evict(self) -> None:
+        names = self._entries()
+        if len(names) <= self.max_entries:
+            return
+        paths = [os.path.join(self.root, name) for name in names]
+        paths.sort(key=lambda path: os.path.getmtime(path) if os.path.exists(path) else 0)
+        for path in paths[: len(paths) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _default_cache() -> ResponseCache:
+    return ResponseCache(
+        os.getenv("RESPONSE_CACHE_DIR") or None,
+        ttl=float(os.getenv("RESPONSE_CACHE_TTL", "900")),
+        max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "500")),
+    )
+
+
+# Shared cache used by analyze_investment; kept in memory unless RESPONSE_CACHE_DIR
+# is set, and RESPONSE_CACHE_BYPASS=1 skips lookups
+response_cache = _default_cache()
+
+
+def cache_bypassed() -> bool:
+    """Return True if RESPONSE_CACHE_BYPASS is set in the environment."""
+    return os.getenv("RESPONSE_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
@@ -0,0 +1,272 @@
+"""
+HTTP service that streams investment analyses as Server-Sent Events.
+
+``AnalysisServer`` is a plain ASGI application with no framework dependency.
+Each request to ``/analyze`` runs one analysis with ``astream_analysis`` and
+forwards its events as they happen, so many sessions are served concurrently
+from one process; at most ``max_sessions`` run at once and the rest are told
+they are queued.
+
+Endpoints:
+    GET  /health                                  -> {"status": "ok", "active": n, "market_data": {...}, ...}
+    GET  /analyze?query=...&mode=team&cache=1     -> text/event-stream
+    POST /analyze {"query": ..., "mode": ..., "use_cache": ...} -> text/event-stream
+
+Each event is sent as ``event: <type>`` with the ``AnalysisEvent`` as JSON
+``data``. Idle streams get a ``: ping`` comment every ``heartbeat_s`` seconds
+so proxies don't close them. A client disconnect cancels its analysis.
+
+Usage:
+    python -m runtime.server --port 8000        # requires uvicorn
+    uvicorn runtime.server:app --port 8000
+"""
+
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from runtime.streaming import ERROR, QUEUED, AnalysisEvent, astream_analysis
+from tools.scheduler import request_scheduler
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+MODES = ("team", "pipeline", "fanout")
+
+# Largest POST body accepted, in bytes
+MAX_BODY_BYTES = 64 * 1024
+
+_SSE_HEADERS = [
+    (b"content-type", b"text/event-stream; charset=utf-8"),
+    (b"cache-control", b"no-cache"),
+    (b"x-accel-buffering", b"no"),
+]
+
+
+def format_sse(event: AnalysisEvent) -> bytes:
+    """Encode an event as a Server-Sent Events frame."""
+    return f"event: {event.type}\ndata: {json.dumps(event.to_dict(), default=str)}\n\n".encode("utf-8")
+
+
+def _flag(value: Any, default: bool = True) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() not in ("0", "false", "no", "off")
+
+
+class AnalysisServer:
+    """
+    ASGI application serving analyses over Server-Sent Events.
+
+    Args:
+        max_sessions: Analyses run at once; further requests wait (default:
+            SERVER_MAX_SESSIONS or 32)
+        heartbeat_s: Seconds of silence before a keep-alive comment is sent (default: 15)
+        stream: Event source, ``astream_analysis`` or a function with the same signature
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        heartbeat_s: float = 15.0,
+        stream: Callable[..., Any] = astream_analysis,
+    ):
+        self.max_sessions = max_sessions or int(os.getenv("SERVER_MAX_SESSIONS", "32"))
+        self.heartbeat_s = heartbeat_s
+        self.stream = stream
+        self.active = 0
+        self.waiting = 0
+        self.served = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        path, method = scope["path"].rstrip("/") or "/", scope["method"]
+        if path == "/health":
+            if method != "GET":
+                await self._json(send, 405, {"error": "Method not allowed"})
+                return
+            await self._json(send, 200, {
+                "status": "ok",
+                "active": self.active,
+                "waiting": self.waiting,
+                "served": self.served,
+                "max_sessions": self.max_sessions,
+                "market_data": request_scheduler.stats(),
+            })
+        elif path == "/analyze":
+            if method not in ("GET", "POST"):
+                await self._json(send, 405, {"error": "Method not allowed"})
+                return
+            try:
+                query, mode, use_cache = await self._parse_request(scope, receive)
+            except ValueError as e:
+                await self._json(send, 400, {"error": str(e)})
+                return
+            await self._analyze(query, mode, use_cache, receive, send)
+        else:
+            await self._json(send, 404, {"error": "Not found"})
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _parse_request(self, scope: Scope, receive: Receive) -> Tuple[str, str, bool]:
+        if scope["method"] == "POST":
+            body = b""
+            while True:
+                message = await receive()
+                body += message.get("body", b"")
+                if len(body) > MAX_BODY_BYTES:
+                    raise ValueError("Request body too large")
+                if not message.get("more_body"):
+                    break
+            try:
+                params = json.loads(body or b"{}")
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON body: {e}") from None
+            if not isinstance(params, dict):
+                raise ValueError("Request body must be a JSON object")
+            use_cache = params.get("use_cache", params.get("cache"))
+        else:
+            params = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode("utf-8")).items()}
+            use_cache = params.get("cache")
+
+        query = str(params.get("query") or "").strip()
+        mode = str(params.get("mode") or "team")
+        if not query:
+            raise ValueError("Missing 'query'")
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode} (expected one of {', '.join(MODES)})")
+        return query, mode, _flag(use_cache)
+
+    async def _json(self, send: Send, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+        })
+        await send({"type": "http.response.body", "body": payload})
+
+    async def _analyze(self, query: str, mode: str, use_cache: bool, receive: Receive, send: Send) -> None:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_sessions)
+
+        await send({"type": "http.response.start", "status": 200, "headers": _SSE_HEADERS})
+        await send({"type": "http.response.body", "body": b": connected\n\n", "more_body": True})
+
+        queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+        producer = asyncio.create_task(self._produce(query, mode, use_cache, queue))
+        watcher = asyncio.create_task(self._watch_disconnect(receive))
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({getter, watcher}, timeout=self.heartbeat_s, return_when=asyncio.FIRST_COMPLETED)
+                if watcher in done:
+                    getter.cancel()
+                    return
+                if getter not in done:
+                    getter.cancel()
+                    await send({"type": "http.response.body", "body": b": ping\n\n", "more_body": True})
+                    continue
+                frame = getter.result()
+                if frame is None:
+                    break
+                await send({"type": "http.response.body", "body": frame, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        except OSError:
+            # The connection went away while sending
+            pass
+        finally:
+            watcher.cancel()
+            producer.cancel()
+            await asyncio.gather(producer, watcher, return_exceptions=True)
+
+    async def _produce(self, query: str, mode: str, use_cache: bool, queue: "asyncio.Queue[Optional[bytes]]") -> None:
+        """Run one analysis under the session limit, feeding SSE frames into ``queue`` (None marks the end)."""
+        assert self._slots is not None
+        try:
+            if self._slots.locked():
+                await queue.put(format_sse(AnalysisEvent(QUEUED, content=f"{self.waiting + 1} request(s) ahead of the session limit")))
+            self.waiting += 1
+            try:
+                await self._slots.acquire()
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            try:
+                async for event in self.stream(query, mode=mode, use_cache=use_cache):
+                    await queue.put(format_sse(event))
+            except Exception as e:
+                await queue.put(format_sse(AnalysisEvent(ERROR, error=f"{type(e).__name__}: {str(e)}")))
+            finally:
+                self.active -= 1
+                self.served += 1
+                self._slots.release()
+        finally:
+            await queue.put(None)
+
+    async def _watch_disconnect(self, receive: Receive) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+
+
+app = AnalysisServer()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point: serve the analysis API with uvicorn."""
+    import argparse
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Serve investment analyses over Server-Sent Events.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument("--max-sessions", type=int, help="Analyses run at once (default: SERVER_MAX_SESSIONS or 32)")
+    parser.add_argument("--snapshot", help="Answer every tool call from this market snapshot file instead of live data")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    if not os.getenv("OPENAI_API_KEY"):
+        print("ERROR: OPENAI_API_KEY not found in environment variables.", file=sys.stderr)
+        return 1
+
+    try:
+        import uvicorn
+    except ImportError:
+        print("ERROR: uvicorn is required to run the server: pip install uvicorn", file=sys.stderr)
+        return 1
+
+    if args.snapshot:
+        from tools.providers import SnapshotProvider, set_provider
+
+        snapshot = SnapshotProvider.from_file(args.snapshot)
+        set_provider(snapshot)
+        print(f"Using market snapshot as of {snapshot.as_of} ({len(snapshot.tickers)} tickers)", file=sys.stderr)
+
+    server = AnalysisServer(max_sessions=args.max_sessions) if args.max_sessions else app
+    uvicorn.run(server, host=args.host, port=args.port, log_level="info")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
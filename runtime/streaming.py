@@ -0,0 +1,301 @@
+"""
+Streaming event API for investment analyses.
+
+``stream_analysis`` (a generator) and ``astream_analysis`` (an async iterator)
+run an analysis and yield ``AnalysisEvent`` objects as it progresses: agent
+and tool activity, content chunks as the models produce them, and finally the
+report. Agno's run events are translated into this small, stable vocabulary
+so callers (such as the SSE server in ``runtime.server``) don't depend on Agno
+internals.
+
+Async streams of identical queries running at the same time share one run:
+a caller that arrives while it is in progress gets every event so far and
+then follows along.
+"""
+
+import contextvars
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterator, Dict, Hashable, Iterator, Optional
+
+# Event types, in the order they typically occur
+QUEUED = "queued"                  # waiting for a free session slot (server only)
+RUN_STARTED = "run_started"        # the team (or pipeline) started
+AGENT_STARTED = "agent_started"    # a member agent started
+TOOL_STARTED = "tool_started"      # a tool call started
+TOOL_FINISHED = "tool_finished"    # a tool call finished (``error`` set if it failed)
+CONTENT = "content"                # a chunk of model output
+AGENT_FINISHED = "agent_finished"  # a member agent finished
+REPORT = "report"                  # the final report (always the last event on success)
+ERROR = "error"                    # the run failed (last event)
+
+EVENT_TYPES = (QUEUED, RUN_STARTED, AGENT_STARTED, TOOL_STARTED, TOOL_FINISHED, CONTENT, AGENT_FINISHED, REPORT, ERROR)
+
+
+@dataclass
+class AnalysisEvent:
+    """
+    One step of a streamed analysis.
+
+    Args:
+        type: One of ``EVENT_TYPES``
+        agent: Agent or team the event belongs to
+        content: Output chunk (``content``), full report (``report``) or agent output
+        tool: Tool name (``tool_started``/``tool_finished``)
+        args: Tool arguments (``tool_started``)
+        duration_ms: Tool or agent duration, when known
+        error: Error message (``tool_finished``/``error``)
+        cached: True if the content was served from the response cache
+    """
+
+    type: str
+    agent: Optional[str] = None
+    content: Optional[str] = None
+    tool: Optional[str] = None
+    args: Optional[Dict[str, Any]] = None
+    duration_ms: Optional[float] = None
+    error: Optional[str] = None
+    cached: bool = False
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the event as a JSON-serializable dict, without unset fields."""
+        return {k: v for k, v in asdict(self).items() if v is not None and v is not False}
+
+
+def _agent_name(event: Any) -> Optional[str]:
+    return getattr(event, "agent_name", None) or getattr(event, "team_name", None) or None
+
+
+def convert_event(event: Any) -> Optional[AnalysisEvent]:
+    """
+    Translate an Agno agent or team run event into an ``AnalysisEvent``.
+
+    Returns:
+        The translated event, or None for events with no counterpart (model
+        request, hook and memory events and the like).
+    """
+    name = getattr(event, "event", "")
+    agent = _agent_name(event)
+    is_team = name.startswith("Team")
+    name = name[4:] if is_team else name
+
+    if name == "RunStarted":
+        return AnalysisEvent(RUN_STARTED if is_team else AGENT_STARTED, agent=agent)
+    if name == "ToolCallStarted":
+        tool = getattr(event, "tool", None)
+        return AnalysisEvent(TOOL_STARTED, agent=agent, tool=getattr(tool, "tool_name", None), args=getattr(tool, "tool_args", None))
+    if name in ("ToolCallCompleted", "ToolCallError"):
+        tool = getattr(event, "tool", None)
+        metrics = getattr(tool, "metrics", None)
+        duration = getattr(metrics, "duration", None)
+        error = getattr(event, "error", None)
+        if error is None and getattr(tool, "tool_call_error", None):
+            error = str(getattr(tool, "result", None) or "Tool call failed")
+        return AnalysisEvent(
+            TOOL_FINISHED, agent=agent, tool=getattr(tool, "tool_name", None),
+            duration_ms=round(duration * 1000, 3) if duration is not None else None, error=error,
+        )
+    if name == "RunContent":
+        content = getattr(event, "content", None)
+        if isinstance(content, str) and content:
+            return AnalysisEvent(CONTENT, agent=agent, content=content)
+        return None
+    if name == "RunCompleted":
+        content = getattr(event, "content", None)
+        content = content if isinstance(content, str) else None
+        return AnalysisEvent(REPORT if is_team else AGENT_FINISHED, agent=agent, content=content)
+    if name == "RunError":
+        return AnalysisEvent(ERROR, agent=agent, error=str(getattr(event, "content", None) or "Run failed"))
+    return None
+
+
+def _error(e: BaseException, agent: Optional[str] = None) -> AnalysisEvent:
+    return AnalysisEvent(ERROR, agent=agent, error=f"{type(e).__name__}: {str(e)}")
+
+
+def stream_analysis(query: str, mode: str = "team", use_cache: bool = True) -> Iterator[AnalysisEvent]:
+    """
+    Run an investment analysis and yield its events as they happen.
+
+    Args:
+        query: Investment analysis request (e.g., "Analyze AAPL and MSFT")
+        mode: "team" (leader routing), "pipeline" (fixed stage order) or
+            "fanout" (pipeline with one concurrent Analyst per ticker)
+        use_cache: Serve the report from the response cache when the same
+            request already ran against unchanged market data (default: True)
+
+    Yields:
+        ``AnalysisEvent`` objects, ending with a ``report`` or ``error`` event.
+    """
+    from runtime.response_cache import response_cache, cache_bypassed
+
+    if mode == "pipeline":
+        from runtime.pipeline import stream_pipeline
+
+        yield from stream_pipeline(query, use_cache=use_cache)
+        return
+    if mode == "fanout":
+        from runtime.fanout import stream_fanout
+
+        yield from stream_fanout(query, use_cache=use_cache)
+        return
+    if mode != "team":
+        raise ValueError(f"Unknown mode: {mode}")
+
+    from investment_team import get_team_pool
+
+    with get_team_pool().session() as (team, session_id):
+        key, cached = response_cache.lookup(team, query, bypass=not use_cache or cache_bypassed())
+        if cached is not None:
+            yield AnalysisEvent(REPORT, agent=team.name, content=cached, cached=True)
+            return
+
+        try:
+            for event in team.run(query, stream=True, stream_events=True, session_id=session_id):
+                converted = convert_event(event)
+                if converted is not None and converted.type == REPORT:
+                    response_cache.store(key, event)
+                if converted is not None:
+                    yield converted
+        except Exception as e:
+            yield _error(e, agent=team.name)
+
+
+class _SharedStream:
+    """An in-flight async analysis whose events are replayed to every subscriber."""
+
+    def __init__(self, key: Hashable, source: AsyncIterator[AnalysisEvent]):
+        import asyncio
+
+        self.key = key
+        self.events = []
+        self.done = False
+        self.subscribers = 0
+        self._wake = asyncio.Event()
+        self._task = asyncio.ensure_future(self._pump(source))
+
+    def _notify(self) -> None:
+        import asyncio
+
+        self._wake.set()
+        self._wake = asyncio.Event()
+
+    async def _pump(self, source: AsyncIterator[AnalysisEvent]) -> None:
+        try:
+            async for event in source:
+                self.events.append(event)
+                self._notify()
+        except Exception as e:
+            self.events.append(_error(e))
+        finally:
+            self.done = True
+            if _shared_streams.get(self.key) is self:
+                del _shared_streams[self.key]
+            self._notify()
+
+    async def subscribe(self) -> AsyncIterator[AnalysisEvent]:
+        """Yield every event of the run, from the first; the run is cancelled when its last subscriber leaves."""
+        self.subscribers += 1
+        seen = 0
+        try:
+            while True:
+                wake = self._wake
+                while seen < len(self.events):
+                    yield self.events[seen]
+                    seen += 1
+                if self.done:
+                    return
+                if wake is self._wake:
+                    await wake.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                if _shared_streams.get(self.key) is self:
+                    del _shared_streams[self.key]
+                self._task.cancel()
+
+
+# Async runs in progress, by (event loop, mode, normalized query)
+_shared_streams: Dict[Hashable, _SharedStream] = {}
+
+
+async def astream_analysis(query: str, mode: str = "team", use_cache: bool = True) -> AsyncIterator[AnalysisEvent]:
+    """
+    Async counterpart of ``stream_analysis`` for use on an event loop.
+
+    Team runs use ``team.arun`` with the async tools; cache lookups and the
+    pipeline's (and fan-out's) blocking stages run on worker threads, so many analyses can be
+    streamed concurrently from one process. With ``use_cache``, a stream of a
+    query identical to one already running (ignoring case and whitespace)
+    attaches to that run instead of starting another.
+    """
+    import asyncio
+    from runtime.coalesce import normalize_query
+    from runtime.response_cache import cache_bypassed
+
+    if mode not in ("team", "pipeline", "fanout"):
+        raise ValueError(f"Unknown mode: {mode}")
+    if not use_cache or cache_bypassed():
+        async for event in _astream_analysis(query, mode, use_cache):
+            yield event
+        return
+
+    key = (asyncio.get_running_loop(), mode, normalize_query(query))
+    shared = _shared_streams.get(key)
+    if shared is None:
+        shared = _shared_streams[key] = _SharedStream(key, _astream_analysis(query, mode, use_cache))
+    async for event in shared.subscribe():
+        yield event
+
+
+async def _astream_analysis(query: str, mode: str, use_cache: bool) -> AsyncIterator[AnalysisEvent]:
+    import asyncio
+    from runtime.response_cache import response_cache, cache_bypassed
+
+    if mode in ("pipeline", "fanout"):
+        async for event in _iterate_in_thread(stream_analysis(query, mode=mode, use_cache=use_cache)):
+            yield event
+        return
+
+    from investment_team import get_team_pool
+
+    async with get_team_pool(async_tools=True).asession() as (team, session_id):
+        bypass = not use_cache or cache_bypassed()
+        key, cached = await asyncio.to_thread(response_cache.lookup, team, query, bypass)
+        if cached is not None:
+            yield AnalysisEvent(REPORT, agent=team.name, content=cached, cached=True)
+            return
+
+        try:
+            async for event in team.arun(query, stream=True, stream_events=True, session_id=session_id):
+                converted = convert_event(event)
+                if converted is not None and converted.type == REPORT:
+                    await asyncio.to_thread(response_cache.store, key, event)
+                if converted is not None:
+                    yield converted
+        except Exception as e:
+            yield _error(e, agent=team.name)
+
+
+async def _iterate_in_thread(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    """Drive a blocking iterator from worker threads, one item at a time."""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    done = object()
+    context = contextvars.copy_context()
+    try:
+        while True:
+            item = await loop.run_in_executor(None, context.run, next, iterator, done)
+            if item is done:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            try:
+                close()
+            except ValueError:
+                # Still running in a worker (the consumer was cancelled mid-item)
+                pass
@@ -0,0 +1,115 @@
+"""Pool of reusable teams that keeps model clients and connections warm."""
+
+import threading
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class TeamPool:
+    """
+    Hands out pre-built teams, one request at a time per team.
+
+    Building a team creates every agent and model client from scratch, and a
+    fresh client has no open connections. The pool builds teams lazily up to
+    ``max_size`` and reuses them, so each model's cached client (and its
+    keep-alive connections) survives across requests. A team is only ever
+    checked out by one request, and each checkout gets a new session id, so
+    concurrent requests never share conversation state.
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_size: int = 8):
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        # Idle teams, most recently used last; _created counts teams built or being built
+        self._idle: List[Any] = []
+        self._created = 0
+        self._checkouts = 0
+        self._lock = threading.Condition()
+
+    def _take_idle(self) -> Optional[Any]:
+        """Return an idle team without waiting or building one, or None."""
+        with self._lock:
+            return self._idle.pop() if self._idle else None
+
+    def _acquire(self) -> Any:
+        """Return an idle team, build one if below ``max_size``, or wait for one to be released."""
+        with self._lock:
+            while not self._idle and self._created >= self.max_size:
+                self._lock.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        try:
+            return self.factory()
+        except BaseException:
+            self._release(None, healthy=False)
+            raise
+
+    def _release(self, team: Any, healthy: bool) -> None:
+        with self._lock:
+            if healthy:
+                self._idle.append(team)
+            else:
+                # Drop teams whose run failed; the freed slot lets a waiter build a fresh one
+                self._created -= 1
+            self._lock.notify()
+
+    @contextmanager
+    def session(self) -> Iterator[Tuple[Any, str]]:
+        """
+        Check out a team for one request.
+
+        Yields:
+            Tuple of (team, session_id). Pass the session id to ``team.run`` so
+            the request gets its own conversation state.
+        """
+        team = self._acquire()
+        with self._lock:
+            self._checkouts += 1
+        healthy = False
+        try:
+            yield team, str(uuid.uuid4())
+            healthy = True
+        finally:
+            self._release(team, healthy)
+
+    @asynccontextmanager
+    async def asession(self) -> AsyncIterator[Tuple[Any, str]]:
+        """Async counterpart of ``session``: building or waiting for a team happens off the event loop."""
+        import asyncio
+
+        team = self._take_idle()
+        if team is None:
+            acquiring = asyncio.ensure_future(asyncio.to_thread(self._acquire))
+            try:
+                team = await asyncio.shield(acquiring)
+            except asyncio.CancelledError:
+                # The worker thread still gets a team; hand it back once it does
+                acquiring.add_done_callback(
+                    lambda done: done.cancelled() or done.exception() is not None or self._release(done.result(), True)
+                )
+                raise
+        with self._lock:
+            self._checkouts += 1
+        healthy = False
+        try:
+            yield team, str(uuid.uuid4())
+            healthy = True
+        finally:
+            self._release(team, healthy)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with teams built, idle teams, maximum size and total checkouts.
+        """
+        with self._lock:
+            return {
+                "created": self._created,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+                "checkouts": self._checkouts,
+            }
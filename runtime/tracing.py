@@ -0,0 +1,340 @@
+"""
+Latency and token tracing for tools, agents and teams.
+
+Tracing is off unless TRACE=1 is set (or ``tracer.enable()`` is called); when
+off, every instrumented call costs a single attribute check. Spans record
+start/end, duration, tokens in/out, market data cache hits/misses and errors,
+and can be exported as a JSON trace file or a Prometheus text-format dump.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Histogram bucket upper bounds (seconds) for span durations
+DURATION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed unit of work: a tool call, an agent run or a team run."""
+
+    __slots__ = (
+        "trace_id", "span_id", "parent_id", "kind", "name", "start", "end",
+        "tokens_in", "tokens_out", "cache_hits", "cache_misses", "error", "_lock",
+    )
+
+    def __init__(self, kind: str, name: str, parent: Optional["Span"]):
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.kind = kind
+        self.name = name
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.time()) - self.start
+
+    @property
+    def cache_hit(self) -> Optional[bool]:
+        """True if every cache lookup in the span hit, None if there were none."""
+        if not self.cache_hits and not self.cache_misses:
+            return None
+        return self.cache_misses == 0
+
+    def note_cache(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "kind": self.kind,
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration_ms": round(self.duration * 1000, 3),
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "cache_hit": self.cache_hit,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "error": self.error,
+        }
+
+
+class Tracer:
+    """
+    Collects finished spans and aggregates them into metrics.
+
+    Finished spans are kept in a bounded buffer for the JSON trace; metrics are
+    aggregated as spans finish, so they cover every span even after the buffer
+    wraps.
+    """
+
+    def __init__(self, enabled: bool = False, max_spans: int = 10000):
+        self.enabled = enabled
+        self._spans: "deque[Span]" = deque(maxlen=max_spans)
+        self._metrics: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    @contextmanager
+    def span(self, kind: str, name: str) -> Iterator[Span]:
+        """
+        Time a block of work as a child of the current span.
+
+        Args:
+            kind: Span kind ('tool', 'agent' or 'team')
+            name: Tool or agent name
+        """
+        span = Span(kind, name, _current_span.get())
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {str(e)}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self.finish(span)
+
+    def finish(self, span: Span) -> None:
+        """Record a finished span."""
+        span.end = time.time()
+        duration = span.duration
+        with self._lock:
+            self._spans.append(span)
+            metrics = self._metrics.setdefault((span.kind, span.name), {
+                "count": 0, "sum": 0.0, "errors": 0, "tokens_in": 0, "tokens_out": 0,
+                "cache_hits": 0, "cache_misses": 0, "buckets": [0] * len(DURATION_BUCKETS),
+            })
+            metrics["count"] += 1
+            metrics["sum"] += duration
+            metrics["errors"] += 1 if span.error else 0
+            metrics["tokens_in"] += span.tokens_in
+            metrics["tokens_out"] += span.tokens_out
+            metrics["cache_hits"] += span.cache_hits
+            metrics["cache_misses"] += span.cache_misses
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    metrics["buckets"][i] += 1
+
+    def spans(self) -> List[Dict[str, Any]]:
+        """Return the buffered spans as dictionaries, oldest first."""
+        with self._lock:
+            return [span.to_dict() for span in self._spans]
+
+    def export_json(self, path: str) -> None:
+        """Write the buffered spans to a JSON trace file."""
+        with open(path, "w") as f:
+            json.dump({"spans": self.spans()}, f, indent=1)
+
+    def prometheus_text(self) -> str:
+        """
+        Render aggregated metrics in the Prometheus text exposition format.
+
+        Returns:
+            Metrics text with span duration histograms and error, token and
+            cache counters labelled by span kind and name.
+        """
+        with self._lock:
+            items = sorted(self._metrics.items())
+
+        lines = [
+            "# HELP investment_span_duration_seconds Duration of tool, agent and team spans.",
+            "# TYPE investment_span_duration_seconds histogram",
+        ]
+        for (kind, name), m in items:
+            labels = f'kind="{kind}",name="{_escape(name)}"'
+            for bound, count in zip(DURATION_BUCKETS, m["buckets"]):
+                lines.append(f'investment_span_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'investment_span_duration_seconds_bucket{{{labels},le="+Inf"}} {m["count"]}')
+            lines.append(f"investment_span_duration_seconds_sum{{{labels}}} {m['sum']:.6f}")
+            lines.append(f"investment_span_duration_seconds_count{{{labels}}} {m['count']}")
+
+        counters = [
+            ("investment_span_errors_total", "Spans that ended with an error.", "errors"),
+            ("investment_tokens_in_total", "Prompt tokens consumed by agents and teams.", "tokens_in"),
+            ("investment_tokens_out_total", "Completion tokens (or estimated tool result tokens).", "tokens_out"),
+            ("investment_cache_hits_total", "Market data cache hits within spans.", "cache_hits"),
+            ("investment_cache_misses_total", "Market data cache misses within spans.", "cache_misses"),
+        ]
+        for metric, help_text, field in counters:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for (kind, name), m in items:
+                lines.append(f'{metric}{{kind="{kind}",name="{_escape(name)}"}} {m[field]}')
+        return "\n".join(lines) + "\n"
+
+    def export_prometheus(self, path: str) -> None:
+        """Write aggregated metrics to a Prometheus text-format file."""
+        with open(path, "w") as f:
+            f.write(self.prometheus_text())
+
+    def reset(self) -> None:
+        """Drop buffered spans and aggregated metrics."""
+        with self._lock:
+            self._spans.clear()
+            self._metrics.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Shared tracer; set TRACE=1 to enable it at startup
+tracer = Tracer(enabled=os.getenv("TRACE", "").lower() in ("1", "true", "yes"))
+
+
+def note_cache(hit: bool) -> None:
+    """Attribute a market data cache lookup to the current span, if tracing."""
+    if tracer.enabled:
+        span = _current_span.get()
+        if span is not None:
+            span.note_cache(hit)
+
+
+def _record_usage(span: Span, output: Any) -> None:
+    metrics = getattr(output, "metrics", None)
+    if metrics is not None:
+        span.tokens_in += getattr(metrics, "input_tokens", 0) or 0
+        span.tokens_out += getattr(metrics, "output_tokens", 0) or 0
+
+
+def _wrap_run(run: Callable[..., Any], kind: str, name: str) -> Callable[..., Any]:
+    """
+    Trace an Agno ``run``/``arun`` method.
+
+    Handles every shape those methods return: a run output, an awaitable of
+    one, or a (sync or async) stream of events whose final event carries the
+    run metrics.
+    """
+    @functools.wraps(run)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not tracer.enabled:
+            return run(*args, **kwargs)
+
+        span = Span(kind, name, _current_span.get())
+        token = _current_span.set(span)
+        try:
+            result = run(*args, **kwargs)
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {str(e)}"
+            tracer.finish(span)
+            raise
+        finally:
+            _current_span.reset(token)
+
+        if hasattr(result, "__await__"):
+            return _traced_awaitable(result, span)
+        if hasattr(result, "__anext__"):
+            return _traced_async_stream(result, span)
+        if hasattr(result, "__next__"):
+            return _traced_stream(result, span)
+        _record_usage(span, result)
+        tracer.finish(span)
+        return result
+
+    return wrapper
+
+
+async def _traced_awaitable(awaitable: Any, span: Span) -> Any:
+    token = _current_span.set(span)
+    try:
+        result = await awaitable
+        _record_usage(span, result)
+        return result
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {str(e)}"
+        raise
+    finally:
+        _current_span.reset(token)
+        tracer.finish(span)
+
+
+def _traced_stream(stream: Iterator[Any], span: Span) -> Iterator[Any]:
+    # The span is made current only while the underlying stream is advanced,
+    # so member runs started by a team nest under it
+    try:
+        while True:
+            token = _current_span.set(span)
+            try:
+                event = next(stream)
+            except StopIteration:
+                break
+            finally:
+                _current_span.reset(token)
+            if type(event).__name__.endswith("RunCompletedEvent"):
+                _record_usage(span, event)
+            yield event
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {str(e)}"
+        raise
+    finally:
+        tracer.finish(span)
+
+
+async def _traced_async_stream(stream: Any, span: Span) -> Any:
+    try:
+        while True:
+            token = _current_span.set(span)
+            try:
+                event = await stream.__anext__()
+            except StopAsyncIteration:
+                break
+            finally:
+                _current_span.reset(token)
+            if type(event).__name__.endswith("RunCompletedEvent"):
+                _record_usage(span, event)
+            yield event
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {str(e)}"
+        raise
+    finally:
+        tracer.finish(span)
+
+
+def trace_agent(runner: Any) -> Any:
+    """
+    Instrument an Agno Agent or Team so that its runs are traced.
+
+    Teams are traced as 'team' spans and their members as 'agent' spans; member
+    runs started by the team leader nest under the team's span.
+
+    Returns:
+        The same runner, for use as ``return trace_agent(Agent(...))``.
+    """
+    members = getattr(runner, "members", None)
+    kind = "team" if members is not None else "agent"
+    name = getattr(runner, "name", None) or type(runner).__name__
+    runner.run = _wrap_run(runner.run, kind, name)
+    runner.arun = _wrap_run(runner.arun, kind, name)
+    return runner
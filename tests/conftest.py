@@ -0,0 +1,54 @@
+"""Shared fixtures: offline market data, stub models and throwaway on-disk state."""
+
+import pytest
+
+
+@pytest.fixture
+def playback(tmp_path, monkeypatch):
+    """Serve yfinance from synthetic playback data with empty caches and no rate limit."""
+    import tools.ohlcv_store as ohlcv_store
+    from benchmarks.playback import MarketDataPlayback
+    from tools.cache import market_cache
+    from tools.scheduler import request_scheduler
+
+    monkeypatch.setattr(ohlcv_store, "ohlcv_store", ohlcv_store.OHLCVStore(str(tmp_path / "ohlcv")))
+    monkeypatch.setattr(request_scheduler, "bucket", type(request_scheduler.bucket)(0, 1))
+    market_cache.clear()
+    data = MarketDataPlayback()
+    with data.install():
+        yield data
+    market_cache.clear()
+
+
+@pytest.fixture
+def stub_models():
+    """Build agents and teams on the scripted stub model."""
+    from agents.models import set_model_factory
+    from benchmarks.stub_model import stub_model_factory
+
+    set_model_factory(stub_model_factory())
+    yield
+    set_model_factory(None)
+
+
+@pytest.fixture
+def response_cache(tmp_path, monkeypatch):
+    """The shared response cache, writing to a temporary directory."""
+    from runtime.response_cache import response_cache
+
+    monkeypatch.setattr(response_cache, "root", str(tmp_path / "responses"))
+    monkeypatch.setattr(response_cache, "hits", 0)
+    monkeypatch.setattr(response_cache, "misses", 0)
+    monkeypatch.delenv("RESPONSE_CACHE_BYPASS", raising=False)
+    return response_cache
+
+
+@pytest.fixture
+def news_index(monkeypatch):
+    """The shared news index, kept in memory and emptied."""
+    from tools.news import NewsIndex
+    import tools.news
+
+    index = NewsIndex(None)
+    monkeypatch.setattr(tools.news, "news_index", index)
+    return index
@@ -0,0 +1,56 @@
+"""Tests for the async tool wrappers and the async team entry point."""
+
+import asyncio
+import contextvars
+import inspect
+
+from tools.async_tools import aget_stock_info, run_in_pool
+from tools.yfinance_tools import get_stock_info
+
+
+def test_wrapper_keeps_tool_schema():
+    assert aget_stock_info.__name__ == "get_stock_info"
+    assert aget_stock_info.__doc__ == get_stock_info.__doc__
+    assert inspect.signature(aget_stock_info) == inspect.signature(get_stock_info)
+    assert inspect.iscoroutinefunction(aget_stock_info)
+
+
+def test_pool_calls_see_the_callers_context():
+    request_id = contextvars.ContextVar("request_id", default=None)
+
+    async def main():
+        request_id.set("r-1")
+        return await run_in_pool(request_id.get)
+
+    assert asyncio.run(main()) == "r-1"
+
+
+def test_tool_spans_nest_under_the_awaiting_span(playback, monkeypatch):
+    from runtime.tracing import Tracer
+    import runtime.tracing
+    import tools.encoding
+
+    tracer = Tracer(enabled=True)
+    monkeypatch.setattr(runtime.tracing, "tracer", tracer)
+    monkeypatch.setattr(tools.encoding, "tracer", tracer)
+
+    async def main():
+        with tracer.span("agent", "Market Researcher") as parent:
+            await asyncio.gather(aget_stock_info("AAPL"), aget_stock_info("MSFT"))
+        return parent
+
+    parent = asyncio.run(main())
+    tools = [span for span in tracer.spans() if span["kind"] == "tool"]
+    assert [span["name"] for span in tools] == ["get_stock_info", "get_stock_info"]
+    assert all(span["parent_id"] == parent.span_id for span in tools)
+
+
+def test_aanalyze_investment_quiet(playback, stub_models, response_cache, capsys):
+    from investment_team import aanalyze_investment
+
+    report = asyncio.run(aanalyze_investment("Analyze AAPL", stream=False, quiet=True, use_cache=False))
+    assert report
+    assert "AI INVESTMENT ANALYSIS TEAM" not in capsys.readouterr().out
+
+    asyncio.run(aanalyze_investment("Analyze AAPL", stream=False, use_cache=False))
+    assert "AI INVESTMENT ANALYSIS TEAM" in capsys.readouterr().out
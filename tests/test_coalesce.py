@@ -0,0 +1,152 @@
+"""Tests for single-flight coalescing of fetches and analyses."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from runtime.coalesce import SingleFlight, normalize_query
+from tools.cache import TTLCache
+
+
+def _run_concurrently(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def call(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        return "result"
+
+    results = _run_concurrently(8, lambda: flight.do("k", work))
+    assert results == ["result"] * 8
+    assert len(calls) == 1
+    assert flight.stats() == {"leaders": 1, "coalesced": 7, "in_flight": 0}
+
+
+def test_failures_are_shared_but_not_reused():
+    flight = SingleFlight(linger=60)
+    calls = []
+
+    def fail():
+        calls.append(1)
+        time.sleep(0.1)
+        raise RuntimeError("upstream down")
+
+    results = _run_concurrently(4, lambda: flight.do("k", fail))
+    assert all(isinstance(r, RuntimeError) for r in results) and len(calls) == 1
+    assert flight.do("k", lambda: "recovered") == "recovered"
+
+
+def test_linger_shares_a_finished_result():
+    flight = SingleFlight(linger=0.2)
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 1
+    time.sleep(0.25)
+    assert flight.do("k", lambda: 3) == 3
+    assert SingleFlight().do("k", lambda: 1) == 1
+
+
+def test_async_callers_share_one_call_and_survive_cancellation():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "report"
+
+    async def main():
+        cancelled = asyncio.ensure_future(flight.ado("q", work))
+        others = [asyncio.ensure_future(flight.ado("q", work)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        return await asyncio.gather(*others)
+
+    assert asyncio.run(main()) == ["report"] * 3
+    assert len(calls) == 1
+
+
+def test_threads_and_coroutines_share_a_call():
+    flight = SingleFlight()
+    started = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        time.sleep(0.2)
+        return "shared"
+
+    thread_result = []
+    thread = threading.Thread(target=lambda: thread_result.append(flight.do("k", work)))
+    thread.start()
+    started.wait()
+
+    async def follower():
+        return await flight.ado("k", lambda: asyncio.sleep(0, "own"))
+
+    assert asyncio.run(follower()) == "shared"
+    thread.join()
+    assert thread_result == ["shared"] and len(calls) == 1
+
+
+def test_cache_misses_share_one_fetch():
+    cache = TTLCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"price": 1.0}
+
+    results = _run_concurrently(6, lambda: cache.get_or_fetch("info", "AAPL", fetch=fetch))
+    assert all(r == {"price": 1.0} for r in results)
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 5
+    assert cache.get_or_fetch("info", "AAPL", fetch=fetch) == {"price": 1.0} and len(calls) == 1
+
+
+@pytest.mark.parametrize("query", ["Outlook for AAPL, MSFT and NVDA", "  outlook for aapl,  MSFT\nand nvda? ", "OUTLOOK FOR AAPL, MSFT AND NVDA."])
+def test_normalize_query(query):
+    assert normalize_query(query) == "outlook for aapl, msft and nvda"
+
+
+def test_identical_analyses_share_one_run(playback, response_cache, monkeypatch):
+    from agents.models import set_model_factory
+    from benchmarks.stub_model import stub_model_factory
+    from investment_team import analyze_investment
+    from runtime.coalesce import query_flight
+
+    monkeypatch.setattr(query_flight, "linger", 0.0)
+    before = query_flight.stats()
+    set_model_factory(stub_model_factory(latency_s=0.05))
+    try:
+        queries = ["Analyze AAPL", "  analyze aapl? ", "ANALYZE AAPL."]
+        results = _run_concurrently(3, lambda: analyze_investment(queries.pop(), stream=False, quiet=True))
+    finally:
+        set_model_factory(None)
+
+    after = query_flight.stats()
+    assert len(set(results)) == 1 and isinstance(results[0], str)
+    assert (after["leaders"] - before["leaders"], after["coalesced"] - before["coalesced"]) == (1, 2)
@@ -0,0 +1,85 @@
+"""Tests for the compact tool output encoding and payload accounting."""
+
+import json
+
+import pytest
+
+from tools import encoding
+from tools.encoding import PayloadStats, compact, set_output_mode, tabulate, tool_output
+
+
+@pytest.fixture
+def compact_mode(monkeypatch):
+    monkeypatch.setattr(encoding, "_output_mode", "full")
+    set_output_mode("compact")
+    return encoding
+
+
+def test_compact_drops_missing_values_and_rounds():
+    result = compact({
+        "price": 189.84321, "market_cap": 2.91e12, "beta": 0.0123456, "pe": "N/A",
+        "sector": "", "news": [], "meta": {"note": None}, "ratio": float("nan"), "history": [1.23456, 0.5],
+    })
+    assert result == {"price": 189.84, "market_cap": 2_910_000_000_000, "beta": 0.0123, "history": [1.23, 0.5]}
+    assert type(result["market_cap"]) is int
+
+
+def test_compact_drops_requested_keys_at_every_level():
+    assert compact({"a": 1, "url": "x", "items": [{"url": "y", "b": 2}]}, drop=["url"]) == {"a": 1, "items": [{"b": 2}]}
+
+
+def test_tabulate_writes_field_names_once():
+    table = tabulate({
+        "AAPL": {"price": 1.0, "pe": 30.0},
+        "MSFT": {"price": 2.0, "sector": "Technology"},
+        "BAD": {"error": "No data"},
+    })
+    assert table == {
+        "columns": ["ticker", "price", "pe", "sector"],
+        "rows": [["AAPL", 1.0, 30.0, None], ["MSFT", 2.0, None, "Technology"]],
+        "errors": {"BAD": "No data"},
+    }
+
+
+def test_unknown_output_mode_is_rejected():
+    with pytest.raises(ValueError):
+        set_output_mode("tiny")
+
+
+def test_tool_output_is_unchanged_in_full_mode(monkeypatch):
+    monkeypatch.setattr(encoding, "_output_mode", "full")
+    rows = {"AAPL": {"price": 189.84321, "pe": "N/A"}}
+
+    @tool_output(table="ticker")
+    def tool():
+        """Docstring the agents see."""
+        return rows
+
+    assert tool() is rows
+    assert tool.__doc__ == "Docstring the agents see."
+
+
+def test_tool_output_is_compacted_and_measured(compact_mode, monkeypatch):
+    stats = PayloadStats()
+    monkeypatch.setattr(encoding, "payload_stats", stats)
+
+    @tool_output(table="ticker", drop=("link",))
+    def quotes():
+        return {"AAPL": {"price": 189.84321, "link": "https://example.com", "pe": "N/A"}, "MSFT": {"error": "No data"}}
+
+    result = quotes()
+    assert result == {"columns": ["ticker", "price"], "rows": [["AAPL", 189.84]], "errors": {"MSFT": "No data"}}
+    size = len(json.dumps(result, separators=(",", ":")))
+    assert stats.snapshot()["quotes"] == {"calls": 1, "bytes": size, "est_tokens": -(-size // 4), "max_bytes": size}
+
+
+def test_payload_stats_orders_by_tokens():
+    stats = PayloadStats()
+    stats.record("small", {"a": 1})
+    stats.record("large", {"a": "x" * 400})
+    stats.record("small", {"a": 1})
+    snapshot = stats.snapshot()
+    assert list(snapshot) == ["large", "small"]
+    assert snapshot["small"]["calls"] == 2
+    stats.reset()
+    assert stats.snapshot() == {}
@@ -0,0 +1,122 @@
+"""Tests for fan-out mode: slicing market data and running one Analyst per slice."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from runtime import fanout, pipeline
+from runtime.streaming import AGENT_FINISHED, AGENT_STARTED, ERROR, REPORT
+from runtime.team_pool import TeamPool
+
+TICKERS = ["AAPL", "MSFT", "NVDA", "GOOGL", "JPM", "XOM"]
+
+
+@pytest.fixture
+def slow_models(monkeypatch):
+    """Stub models taking 0.2s per call, on freshly built agent pools."""
+    from agents.models import set_model_factory
+    from benchmarks.stub_model import stub_model_factory
+
+    monkeypatch.setattr(fanout, "_analyst_pool", None)
+    monkeypatch.setattr(pipeline, "_agent_pool", None)
+    set_model_factory(stub_model_factory(latency_s=0.2))
+    yield 0.2
+    set_model_factory(None)
+
+
+def _failing_analyst(labels):
+    def run(prompt, **kwargs):
+        for label in labels:
+            if f"for {label}:" in prompt:
+                raise RuntimeError(f"{label} failed")
+        return SimpleNamespace(content="analysis")
+
+    return lambda: SimpleNamespace(name="Market Analyst", model=None, instructions=None, tools=[], run=run)
+
+
+def test_split_by_ticker(playback):
+    data = pipeline.prefetch_market_data(TICKERS[:3])
+    slices = fanout.split_market_data(data, TICKERS[:3])
+    assert list(slices) == TICKERS[:3]
+    aapl = slices["AAPL"]["stocks"]["AAPL"]
+    assert {"info", "technical_indicators", "comparison"} <= set(aapl)
+    assert slices["AAPL"]["market_indices"] == data["market_indices"]
+
+
+def test_split_by_sector(playback):
+    data = pipeline.prefetch_market_data(TICKERS)
+    slices = fanout.split_market_data(data, TICKERS, group_by="sector")
+    assert sorted(t for part in slices.values() for t in part["stocks"]) == sorted(TICKERS)
+    for label, part in slices.items():
+        assert all(stock["info"]["sector"] == label for stock in part["stocks"].values())
+
+
+def test_split_rejects_unknown_grouping():
+    with pytest.raises(ValueError):
+        fanout.split_market_data({}, ["AAPL"], group_by="industry")
+
+
+def test_analysts_run_concurrently(playback, slow_models):
+    data = pipeline.prefetch_market_data(TICKERS)
+    prompts = fanout.build_fanout_prompts("q", data, fanout.split_market_data(data, TICKERS))
+
+    start = time.perf_counter()
+    results = list(fanout.run_analysts(prompts["analysts"], bypass=True))
+    elapsed = time.perf_counter() - start
+
+    assert sorted(label for label, *_ in results) == sorted(TICKERS)
+    assert all(isinstance(analysis, str) and analysis for _, analysis, _, _ in results)
+    assert elapsed < len(TICKERS) * slow_models
+
+
+def test_failed_group_is_noted(monkeypatch):
+    monkeypatch.setattr(fanout, "_analyst_pool", TeamPool(_failing_analyst(["MSFT"]), max_size=2))
+    prompts = {label: f"data for {label}: ..." for label in ("AAPL", "MSFT")}
+    outcomes = {label: outcome for label, outcome, _, _ in fanout.run_analysts(prompts, bypass=True)}
+
+    analyses = fanout._collect(prompts, outcomes)
+    assert analyses["AAPL"] == "analysis"
+    assert analyses["MSFT"].startswith("(Analysis unavailable: RuntimeError: MSFT failed")
+
+
+def test_all_groups_failed_raises(monkeypatch):
+    monkeypatch.setattr(fanout, "_analyst_pool", TeamPool(_failing_analyst(["AAPL", "MSFT"]), max_size=2))
+    prompts = {label: f"data for {label}: ..." for label in ("AAPL", "MSFT")}
+    outcomes = {label: outcome for label, outcome, _, _ in fanout.run_analysts(prompts, bypass=True)}
+
+    with pytest.raises(RuntimeError):
+        fanout._collect(prompts, outcomes)
+
+
+def test_stream_fanout_events(playback, stub_models, monkeypatch):
+    monkeypatch.setattr(fanout, "_analyst_pool", None)
+    monkeypatch.setattr(pipeline, "_agent_pool", None)
+
+    events = list(fanout.stream_fanout("Analyze AAPL and MSFT", use_cache=False))
+    started = [e.agent for e in events if e.type == AGENT_STARTED]
+    finished = [e.agent for e in events if e.type == AGENT_FINISHED]
+
+    assert {"Market Analyst [AAPL]", "Market Analyst [MSFT]"} <= set(started)
+    assert {"Market Analyst [AAPL]", "Market Analyst [MSFT]"} <= set(finished)
+    assert events[-1].type == REPORT and events[-1].content
+
+
+def test_failed_stream_drops_agents_from_pool(playback, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("model unavailable")
+
+    def agents():
+        return tuple(
+            SimpleNamespace(name=name, model=None, instructions=None, tools=[], run=fail)
+            for name in ("Market Analyst", "Investment Advisor", "Report Writer")
+        )
+
+    pool = TeamPool(agents, max_size=1)
+    monkeypatch.setattr(fanout, "_analyst_pool", TeamPool(_failing_analyst([]), max_size=1))
+    monkeypatch.setattr(fanout, "get_agent_pool", lambda: pool)
+
+    events = list(fanout.stream_fanout("Analyze AAPL", use_cache=False))
+
+    assert events[-1].type == ERROR and "model unavailable" in events[-1].error
+    assert pool.stats()["created"] == 0
@@ -0,0 +1,127 @@
+"""Tests for the intraday rolling windows and the shared aggregators."""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import intraday
+from tools.intraday import IntradayAggregator, IntradayMonitor, RollingWindow, get_aggregator
+
+BARS_PER_YEAR = 252 * 390
+
+
+def _bars(count, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, count)))
+    high = close * (1 + rng.uniform(0, 0.003, count))
+    low = close * (1 - rng.uniform(0, 0.003, count))
+    volume = rng.integers(1_000, 50_000, count).astype(float)
+    index = pd.date_range("2024-01-02 09:30", periods=count, freq="min", tz="America/New_York")
+    return pd.DataFrame({"Open": close, "High": high, "Low": low, "Close": close, "Volume": volume}, index=index)
+
+
+def _reference(frame):
+    """Window statistics computed directly with NumPy."""
+    close = frame["Close"].to_numpy()
+    typical = (frame["High"] + frame["Low"] + frame["Close"]).to_numpy() / 3
+    volume = frame["Volume"].to_numpy()
+    returns = np.diff(np.log(close))
+    return {
+        "bars": len(frame),
+        "high": round(frame["High"].max(), 4),
+        "low": round(frame["Low"].min(), 4),
+        "vwap": round((typical * volume).sum() / volume.sum(), 4),
+        "change": round(close[-1] - frame["Open"].iloc[0], 4),
+        "total_volume": int(volume.sum()),
+        "realized_volatility_annualized": round(math.sqrt(returns.var(ddof=1) * BARS_PER_YEAR) * 100, 4),
+    }
+
+
+def _push_all(window, frame):
+    for time_, row in zip(frame.index, frame.itertuples(index=False)):
+        window.push(time_, row.Open, row.High, row.Low, row.Close, row.Volume)
+
+
+@pytest.fixture
+def aggregators(monkeypatch):
+    monkeypatch.setattr(intraday, "_aggregators", type(intraday._aggregators)())
+    monkeypatch.setattr(intraday, "_pinned", {})
+    monkeypatch.setattr(intraday, "_refreshed", {})
+    return intraday._aggregators
+
+
+@pytest.mark.parametrize("size, count", [(30, 20), (30, 30), (30, 500), (3, 7)])
+def test_rolling_window_matches_numpy(size, count):
+    frame = _bars(count)
+    window = RollingWindow(size)
+    _push_all(window, frame)
+
+    snapshot = window.snapshot(BARS_PER_YEAR)
+    expected = _reference(frame.iloc[-size:])
+    assert {key: snapshot[key] for key in expected} == pytest.approx(expected)
+    assert len(window) == min(size, count)
+
+
+def test_partial_bar_replaces_the_oldest_bar():
+    frame = _bars(80)
+    window = RollingWindow(30)
+    _push_all(window, frame.iloc[:-1])
+    last = frame.iloc[-1]
+    window.partial = (frame.index[-1], last.Open, last.High, last.Low, last.Close, last.Volume)
+
+    snapshot = window.snapshot(BARS_PER_YEAR)
+    expected = _reference(frame.iloc[-30:])
+    assert {key: snapshot[key] for key in expected} == pytest.approx(expected)
+    assert snapshot["partial_bar"]
+
+
+def test_rolling_window_rejects_tiny_windows():
+    with pytest.raises(ValueError):
+        RollingWindow(1)
+
+
+def test_ingest_commits_only_new_bars():
+    frame = _bars(100)
+    aggregator = IntradayAggregator("1m", 20)
+
+    assert aggregator.ingest("aapl", frame.iloc[:60]) == 59
+    assert aggregator.ingest("AAPL", frame.iloc[40:90]) == 30
+    assert aggregator.last_time("AAPL") == frame.index[88]
+    assert aggregator.ingest("AAPL", frame, complete=True) == 11
+
+    expected = _reference(frame.iloc[-20:])
+    snapshot = aggregator.snapshot("AAPL")
+    assert {key: snapshot[key] for key in expected} == pytest.approx(expected)
+    assert not snapshot["partial_bar"]
+
+
+def test_least_recently_used_aggregators_are_evicted(aggregators, monkeypatch):
+    monkeypatch.setattr(intraday, "MAX_AGGREGATORS", 2)
+    first = get_aggregator("1m", 30)
+    get_aggregator("1m", 60)
+    assert get_aggregator("1m", 30) is first
+    get_aggregator("5m", 60)
+
+    assert list(aggregators) == [("1m", 30), ("5m", 60)]
+    assert intraday._seed_period("1m") == "2d"
+
+
+def test_monitored_aggregators_are_not_evicted(aggregators, playback, monkeypatch):
+    monkeypatch.setattr(intraday, "MAX_AGGREGATORS", 1)
+    monitor = IntradayMonitor(["AAPL"], interval="1m", window=30, poll_s=3600)
+    with monitor:
+        get_aggregator("1m", 60)
+        get_aggregator("1m", 90)
+        assert ("1m", 30) in aggregators and len(aggregators) == 2
+        assert get_aggregator("1m", 30) is monitor.aggregator
+    get_aggregator("1m", 120)
+    assert list(aggregators) == [("1m", 120)]
+
+
+def test_get_intraday_stats(aggregators, playback):
+    stats = intraday.get_intraday_stats(["AAPL", "MSFT"], interval="5m", window=20)
+    assert set(stats) == {"AAPL", "MSFT"}
+    assert stats["AAPL"]["bars"] == 20
+    assert stats["AAPL"]["low"] <= stats["AAPL"]["vwap"] <= stats["AAPL"]["high"]
@@ -0,0 +1,98 @@
+"""Tests for the de-duplicated news feed and its seen-article index."""
+
+from tools import news
+
+
+def test_index_is_kept_in_memory_by_default(monkeypatch):
+    monkeypatch.delenv("NEWS_INDEX_PATH", raising=False)
+    assert news._default_index().path is None
+
+
+def _article(n, tickers=(), published=None, **extra):
+    return dict({
+        "uuid": f"story-{n}", "title": f"Story {n}", "publisher": "Reuters",
+        "link": f"https://example.com/story-{n}?utm=feed", "providerPublishTime": published or 1_700_000_000 + n * 60,
+        "type": "STORY", "relatedTickers": list(tickers),
+    }, **extra)
+
+
+def test_normalize_article_layouts():
+    flat = news.normalize_article(_article(1, ["aapl"]))
+    nested = news.normalize_article({
+        "id": "story-1",
+        "content": {
+            "title": "Story 1", "provider": {"displayName": "Reuters"}, "contentType": "STORY",
+            "canonicalUrl": {"url": "https://example.com/story-1"}, "pubDate": "2023-11-14T22:14:20Z",
+        },
+    })
+    assert flat["id"] == nested["id"]
+    assert nested["published"] == 1_700_000_060
+    assert flat["related"] == ["AAPL"]
+    assert news.normalize_article({"content": {}}) is None
+
+
+def test_article_id_ignores_query_strings():
+    a = news.article_id({"link": "https://Example.com/a/?utm=x"})
+    assert a == news.article_id({"link": "https://example.com/a"})
+    assert a != news.article_id({"link": "https://example.com/b"})
+
+
+def test_stories_are_indexed_once_with_every_ticker():
+    index = news.NewsIndex(None)
+    assert index.add_batch({"AAPL": [_article(1), _article(2)], "MSFT": [_article(2, ["NVDA"]), _article(3)]}) == 3
+    assert len(index) == 3 and index.cursor == 3
+
+    shared = [record for record in index.since() if record["title"] == "Story 2"]
+    assert len(shared) == 1 and shared[0]["tickers"] == ["AAPL", "MSFT"]
+    assert [r["title"] for r in index.since(tickers=["msft"])] == ["Story 3", "Story 2"]
+
+
+def test_cursor_returns_only_new_articles():
+    index = news.NewsIndex(None)
+    index.add("AAPL", [_article(1), _article(2)])
+    cursor = index.cursor
+    assert index.add("AAPL", [_article(1), _article(2), _article(3)]) == 1
+    assert [r["title"] for r in index.since(cursor)] == ["Story 3"]
+
+    index.clear()
+    assert index.cursor == 3 and index.since(cursor) == []
+    index.add("AAPL", [_article(4)])
+    assert [r["seq"] for r in index.since(cursor)] == [4]
+
+
+def test_oldest_seen_articles_are_forgotten_first():
+    index = news.NewsIndex(None, max_articles=2)
+    index.add("AAPL", [_article(1), _article(2), _article(3)])
+    assert [r["title"] for r in index.since()] == ["Story 3", "Story 2"]
+
+
+def test_persisted_index_keeps_cursors_valid(tmp_path):
+    path = str(tmp_path / "news" / "index.json")
+    first = news.NewsIndex(path)
+    first.add("AAPL", [_article(1), _article(2)])
+    cursor = first.cursor
+
+    second = news.NewsIndex(path)
+    second.add("AAPL", [_article(2), _article(3)])
+    assert second.cursor == 3
+    assert [r["title"] for r in second.since(cursor)] == ["Story 3"]
+
+
+def test_news_feed_pages_by_cursor(playback, news_index):
+    from tools.cache import market_cache
+
+    first = news.get_news_feed(["AAPL", "MSFT"], max_news=5)
+    assert first["total"] == 16 and len(first["articles"]) == 5
+    assert news.get_news_feed(["AAPL", "MSFT"], since=first["cursor"])["total"] == 0
+
+    original = playback.news
+    playback.news = lambda ticker: original(ticker) + [_article(99, published=2_000_000_000)]
+    market_cache.clear()
+    update = news.get_news_feed(["AAPL", "MSFT"], since=first["cursor"])
+    assert update["total"] == 1 and update["cursor"] == first["cursor"] + 1
+    assert update["articles"][0]["tickers"] == ["AAPL", "MSFT"]
+
+
+def test_news_feed_validates_input(news_index):
+    assert "error" in news.get_news_feed([])
+    assert "error" in news.get_news_feed([f"T{i}" for i in range(news.MAX_TICKERS + 1)])
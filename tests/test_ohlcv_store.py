@@ -0,0 +1,84 @@
+"""Regression tests for re-adjusted prices in the on-disk OHLCV store."""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools import yfinance_tools
+from tools.ohlcv_store import OHLCVStore
+
+
+def _bars(days, scale=1.0):
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=60)[:days]
+    close = np.linspace(100.0, 160.0, 60)[:days] * scale
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1e6}, index=index)
+
+
+class SplittingProvider:
+    """Provider whose whole price history is halved by a 2:1 split after the first request."""
+
+    local = False
+
+    def __init__(self):
+        self.scale = 1.0
+        self.requests = []
+
+    def history(self, ticker, period="1mo", interval="1d", start=None):
+        self.requests.append("tail" if start else "full")
+        frame = _bars(60, self.scale)
+        return frame[frame.index >= pd.Timestamp(start)] if start else frame
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = OHLCVStore(str(tmp_path), refresh_seconds=0)
+    monkeypatch.setattr(yfinance_tools, "_store", lambda: store)
+    return store
+
+
+def test_tail_overlaps_a_completed_bar(store):
+    store.update("AAA", "3mo", "1d", _bars(59), full=True)
+    action, start = store.plan("AAA", "3mo", "1d")
+    assert action == "tail"
+    assert pd.Timestamp(start) == _bars(59).index[-2]
+
+
+def test_unchanged_tail_is_merged(store):
+    store.update("AAA", "3mo", "1d", _bars(59), full=True)
+    _, start = store.plan("AAA", "3mo", "1d")
+    tail = _bars(60)
+    assert store.update("AAA", "3mo", "1d", tail[tail.index >= pd.Timestamp(start)], full=False)
+    assert len(store.read("AAA", "max", "1d")) == 60
+
+
+def test_split_refetches_full_series(store, monkeypatch):
+    provider = SplittingProvider()
+    monkeypatch.setattr(yfinance_tools, "_provider", lambda: provider)
+
+    first = yfinance_tools._load_history("AAA", "3mo", "1d")
+    provider.scale = 0.5
+    time.sleep(0.01)
+    after = yfinance_tools._load_history("AAA", "3mo", "1d")
+
+    assert provider.requests == ["full", "tail", "full"]
+    np.testing.assert_allclose(after["Close"].to_numpy(), first["Close"].to_numpy() * 0.5)
+
+
+def test_full_download_replaces_readjusted_history(store):
+    store.update("AAA", "max", "1d", _bars(60), full=True)
+    store.update("AAA", "1mo", "1d", _bars(60, 0.5).iloc[-20:], full=True)
+    stored = store.read("AAA", "max", "1d")
+    assert len(stored) == 20
+    assert os.path.exists(os.path.join(store.root, "1d", "AAA.npy"))
+
+
+def test_store_is_opt_in(tmp_path, monkeypatch):
+    from tools import ohlcv_store
+
+    monkeypatch.delenv("OHLCV_STORE_DIR", raising=False)
+    assert ohlcv_store._default_store() is None
+    monkeypatch.setenv("OHLCV_STORE_DIR", str(tmp_path))
+    assert ohlcv_store._default_store().root == str(tmp_path)
@@ -0,0 +1,59 @@
+"""Tests for pipeline mode: ticker parsing, prefetch and the staged run."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from runtime import pipeline
+from runtime.pipeline import parse_tickers
+from runtime.streaming import ERROR, REPORT
+from runtime.team_pool import TeamPool
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Analyze AAPL, MSFT and NVDA", ["AAPL", "MSFT", "NVDA"]),
+    ("Compare AAPL to the S&P 500", ["AAPL"]),
+    ("Summarize the latest AAPL SEC filing", ["AAPL"]),
+    ("Is this NYSE listed stock, IBM, a BUY?", ["IBM"]),
+    ("What does the FED decision mean for JPM and the NASDAQ?", ["JPM"]),
+    ("Analyze AT&T and P&G", ["T", "PG"]),
+    ("BRK.B vs BRK-A", ["BRK.B", "BRK-A"]),
+    ("Is $IT a buy? IT spending is up", ["IT"]),
+    ("AAPL then aapl then AAPL again", ["AAPL"]),
+    ("What's the market outlook?", []),
+])
+def test_parse_tickers(query, expected):
+    assert parse_tickers(query) == expected
+
+
+def test_prefetch_market_data_covers_each_ticker(playback):
+    data = pipeline.prefetch_market_data(["AAPL", "MSFT"])
+    assert set(data["stocks"]) == {"AAPL", "MSFT"}
+    assert {"info", "history_3mo", "news"} <= set(data["stocks"]["AAPL"])
+    assert set(data["comparison"]) == {"AAPL", "MSFT"}
+
+
+def test_run_pipeline_produces_report(playback, stub_models):
+    report = pipeline.run_pipeline("Analyze AAPL and MSFT", use_cache=False)
+    assert isinstance(report, str) and report
+
+
+def _failing_agents():
+    def run(*args, **kwargs):
+        raise RuntimeError("model unavailable")
+
+    def agent(name):
+        return SimpleNamespace(name=name, model=None, instructions=None, tools=[], run=run)
+
+    return agent("Market Analyst"), agent("Investment Advisor"), agent("Report Writer")
+
+
+def test_failed_stage_drops_agents_from_pool(playback, monkeypatch):
+    pool = TeamPool(_failing_agents, max_size=1)
+    monkeypatch.setattr(pipeline, "get_agent_pool", lambda: pool)
+
+    events = list(pipeline.stream_pipeline("Analyze AAPL", use_cache=False))
+
+    assert events[-1].type == ERROR and "model unavailable" in events[-1].error
+    assert not any(event.type == REPORT for event in events)
+    assert pool.stats()["created"] == 0
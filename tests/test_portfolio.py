@@ -0,0 +1,129 @@
+"""Tests for the portfolio math and the incrementally tracked covariance."""
+
+import numpy as np
+import pytest
+
+from tools import portfolio
+from tools.portfolio import (
+    CovarianceTracker,
+    covariance_matrix,
+    min_variance_weights,
+    max_sharpe_weights,
+    risk_parity_weights,
+    tracked_covariance,
+    value_at_risk,
+)
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(7)
+    mixing = rng.normal(size=(5, 5))
+    return rng.normal(0.0005, 0.01, size=(300, 5)) @ mixing / 3
+
+
+def test_welford_updates_match_np_cov(returns):
+    tracker = CovarianceTracker(assets=5)
+    tracker.update(returns[:100])
+    for row in returns[100:150]:
+        tracker.update(row)
+    tracker.update(returns[150:])
+
+    assert tracker.count == len(returns)
+    np.testing.assert_allclose(tracker.mean, returns.mean(axis=0))
+    np.testing.assert_allclose(tracker.covariance, np.cov(returns, rowvar=False))
+    np.testing.assert_allclose(tracker.correlation, np.corrcoef(returns, rowvar=False))
+
+
+def test_welford_rolling_window_matches_np_cov(returns):
+    tracker = CovarianceTracker(assets=5)
+    tracker.update(returns[:250])
+    for i in range(250, 300):
+        tracker.remove(returns[i - 250])
+        tracker.update(returns[i])
+
+    np.testing.assert_allclose(tracker.covariance, np.cov(returns[50:], rowvar=False))
+    tracker.remove(returns[:0])
+    assert tracker.count == 250
+
+
+def test_covariance_matrix_from_tracker(returns):
+    tracker = CovarianceTracker(assets=5)
+    tracker.update(returns)
+    for shrink in (True, False):
+        direct, intensity = covariance_matrix(returns, shrink=shrink)
+        tracked, tracked_intensity = covariance_matrix(returns, shrink=shrink, tracker=tracker)
+        np.testing.assert_allclose(tracked, direct)
+        assert tracked_intensity == pytest.approx(intensity)
+
+
+def test_tracked_window_folds_in_only_new_rows(returns, monkeypatch):
+    monkeypatch.setattr(portfolio, "_windows", type(portfolio._windows)())
+    dates = np.arange(len(returns))
+    tracked_covariance(("w", "1y"), dates[:250], returns[:250])
+
+    added = []
+    update = CovarianceTracker.update
+    monkeypatch.setattr(CovarianceTracker, "update", lambda self, r: (added.append(len(np.atleast_2d(r))), update(self, r)))
+
+    # The window rolls forward two bars and the last shared bar is revised
+    revised = returns[2:252].copy()
+    revised[-3] *= 1.5
+    tracker = tracked_covariance(("w", "1y"), dates[2:252], revised)
+
+    assert added == [3]
+    np.testing.assert_allclose(tracker.covariance, np.cov(revised, rowvar=False))
+
+
+def test_tracked_windows_are_bounded(returns, monkeypatch):
+    monkeypatch.setattr(portfolio, "_windows", type(portfolio._windows)())
+    monkeypatch.setattr(portfolio, "MAX_TRACKED_WINDOWS", 2)
+    dates = np.arange(len(returns))
+    for key in ("a", "b", "a", "c"):
+        tracked_covariance((key, "1y"), dates, returns)
+    assert [key for key, _ in portfolio._windows] == ["a", "c"]
+
+
+def test_min_variance_weights_of_uncorrelated_assets():
+    variances = np.array([1.0, 2.0, 4.0])
+    weights = min_variance_weights(np.diag(variances))
+    np.testing.assert_allclose(weights, (1 / variances) / (1 / variances).sum())
+
+
+def test_long_only_weights(returns):
+    cov = np.cov(returns, rowvar=False)
+    for weights in (min_variance_weights(cov), max_sharpe_weights(cov, returns.mean(axis=0))):
+        assert weights.sum() == pytest.approx(1.0)
+        assert (weights >= 0).all()
+
+
+def test_max_sharpe_falls_back_without_positive_returns(returns):
+    cov = np.cov(returns, rowvar=False)
+    np.testing.assert_allclose(max_sharpe_weights(cov, -np.ones(5)), min_variance_weights(cov))
+
+
+def test_risk_parity_equalizes_risk_contributions(returns):
+    cov = np.cov(returns, rowvar=False)
+    weights = risk_parity_weights(cov)
+    contributions = weights * (cov @ weights)
+    np.testing.assert_allclose(contributions, contributions.mean(), rtol=1e-6)
+
+
+def test_value_at_risk():
+    portfolio_returns = np.random.default_rng(1).normal(0.0, 0.01, size=100_000)
+    risk = value_at_risk(portfolio_returns, 0.95)
+    assert risk["var_historical"] == pytest.approx(-np.quantile(portfolio_returns, 0.05))
+    assert risk["var_parametric"] == pytest.approx(0.01645, rel=0.02)
+    assert risk["cvar_parametric"] == pytest.approx(0.02063, rel=0.02)
+    assert risk["cvar_historical"] > risk["var_historical"]
+
+
+def test_analyze_portfolio_repeats_from_tracked_window(playback, monkeypatch):
+    monkeypatch.setattr(portfolio, "_windows", type(portfolio._windows)())
+    first = portfolio.analyze_portfolio(["AAPL", "MSFT", "JNJ"], weights=[0.5, 0.3, 0.2])
+    again = portfolio.analyze_portfolio(["AAPL", "MSFT", "JNJ"], weights=[0.5, 0.3, 0.2])
+
+    assert "error" not in first
+    assert list(portfolio._windows) == [(("AAPL", "MSFT", "JNJ"), "1y")]
+    assert again == first
+    assert sum(first["current_portfolio"]["weights_percent"].values()) == pytest.approx(100)
@@ -0,0 +1,87 @@
+"""Tests for the compact quote, price summary and comparison records."""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.records import MISSING, ComparisonTable, PriceSummary, Quote, output_value
+
+
+def _history(close):
+    close = np.asarray(close, dtype=float)
+    index = pd.bdate_range("2024-01-02", periods=len(close))
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": np.arange(len(close)) * 100.0},
+        index=index,
+    )
+
+
+def test_quote_keeps_only_the_fields_the_tools_read():
+    quote = Quote.from_info({
+        "longName": "Apple Inc.", "currentPrice": 189.84, "marketCap": 2.9e12, "volume": 5.1e7,
+        "sector": "", "trailingPE": "Infinity", "companyOfficers": [{"name": "..."}],
+    })
+    assert quote.to_dict() == {"longName": "Apple Inc.", "currentPrice": 189.84, "marketCap": 2_900_000_000_000, "volume": 51_000_000}
+    assert quote.get("sector", MISSING) == MISSING
+    assert math.isnan(quote.trailingPE)
+    assert not hasattr(quote, "companyOfficers")
+    assert Quote.from_info(quote) is quote
+
+
+def test_quote_price_falls_back_to_regular_market_price():
+    assert Quote(regularMarketPrice=101.5).price == 101.5
+    assert Quote(currentPrice=100.0, regularMarketPrice=101.5).price == 100.0
+
+
+def test_price_summary_matches_pandas():
+    hist = _history([100.0, 102.0, 101.0, 105.0, 104.0])
+    summary = PriceSummary(hist)
+
+    assert summary.bars == 5
+    assert (summary.first_close, summary.previous_close, summary.last_close) == (100.0, 105.0, 104.0)
+    assert (summary.high, summary.low) == (106.0, 99.0)
+    assert summary.avg_volume == hist["Volume"].mean()
+    assert summary.volatility == pytest.approx(hist["Close"].pct_change().std())
+    assert summary.change_percent == pytest.approx(4.0)
+    assert summary.day_change == pytest.approx(-1.0)
+    assert summary.end == hist.index[-1]
+
+
+def test_price_summary_of_one_bar():
+    summary = PriceSummary(_history([100.0]))
+    assert math.isnan(summary.previous_close) and math.isnan(summary.volatility)
+    assert output_value(summary.volatility) == MISSING
+
+
+def test_comparison_keeps_full_precision_prices():
+    table = ComparisonTable(["AAA", "BBB", "CCC"])
+    table.set(0, Quote(longName="A Corp", currentPrice=1234.5678, trailingPE=31.25, marketCap=5e11), PriceSummary(_history([1000.0, 1234.5678])))
+    table.set(1, Quote(regularMarketPrice=98765.4321), PriceSummary(_history([50.0, 60.0])))
+    table.errors[2] = "Failed to fetch data: boom"
+
+    rows = table.to_dict()
+    assert rows["AAA"]["current_price"] == 1234.5678
+    assert rows["AAA"]["3mo_performance"] == 23.4568
+    assert rows["AAA"]["pe_ratio"] == 31.25
+    assert rows["AAA"]["market_cap"] == 500_000_000_000
+    assert rows["BBB"]["current_price"] == 98765.4321
+    assert rows["BBB"]["pe_ratio"] == MISSING and rows["BBB"]["company_name"] == MISSING
+    assert rows["CCC"] == {"error": "Failed to fetch data: boom"}
+    assert all(type(value) in (str, int, float) for row in rows.values() for value in row.values())
+
+
+def test_rows_without_history_are_left_out():
+    table = ComparisonTable(["AAA", "BBB"])
+    table.set(1, Quote(currentPrice=10.0), PriceSummary(_history([9.0, 10.0])))
+    assert list(table.to_dict()) == ["BBB"]
+
+
+def test_compare_stocks_output(playback):
+    from tools.yfinance_tools import compare_stocks
+
+    rows = compare_stocks(["AAPL", "MSFT"])
+    info = playback.info("AAPL")
+    assert rows["AAPL"]["current_price"] == round(info.get("currentPrice", info.get("regularMarketPrice")), 4)
+    assert rows["AAPL"]["sector"] == info["sector"]
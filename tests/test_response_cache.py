@@ -0,0 +1,111 @@
+"""Tests for the response cache: keys, fingerprints and the cached entry points."""
+
+import asyncio
+from types import SimpleNamespace
+
+from runtime.response_cache import ResponseCache, collect_tool_calls, describe, fingerprint
+
+
+def _runner(instructions="Be brief", tools=("get_stock_info",)):
+    return SimpleNamespace(
+        name="Analyst",
+        model=SimpleNamespace(id="gpt-4"),
+        instructions=instructions,
+        tools=[SimpleNamespace(name=t) for t in tools],
+    )
+
+
+def test_key_covers_runner_and_input(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    base = cache.key(_runner(), "Analyze AAPL")
+    assert cache.key(_runner(), "Analyze AAPL") == base
+    assert cache.key(_runner(), "Analyze MSFT") != base
+    assert cache.key(_runner(instructions="Be thorough"), "Analyze AAPL") != base
+    assert cache.key(_runner(tools=("get_stock_news",)), "Analyze AAPL") != base
+
+
+def test_describe_includes_members():
+    team = SimpleNamespace(name="Team", model=None, instructions=None, tools=[], members=[_runner()])
+    assert describe(team)["members"][0]["model"] == "gpt-4"
+
+
+def test_collect_tool_calls_dedupes_replayable_calls():
+    call = SimpleNamespace(tool_name="get_stock_info", tool_args={"ticker": "AAPL"})
+    other = SimpleNamespace(tool_name="not_a_market_tool", tool_args={})
+    member = SimpleNamespace(tools=[call], member_responses=None)
+    response = SimpleNamespace(tools=[call, other], member_responses=[member])
+    assert collect_tool_calls(response) == [{"name": "get_stock_info", "args": {"ticker": "AAPL"}}]
+
+
+def test_fingerprint_tracks_market_data(playback):
+    calls = [{"name": "get_stock_info", "args": {"ticker": "AAPL"}}]
+    assert fingerprint(calls) == fingerprint(calls)
+    assert fingerprint(calls) != fingerprint([{"name": "get_stock_info", "args": {"ticker": "MSFT"}}])
+
+
+def test_entry_is_invalidated_when_data_changes(playback, tmp_path):
+    from tools.cache import market_cache
+
+    cache = ResponseCache(str(tmp_path))
+    calls = [{"name": "get_stock_info", "args": {"ticker": "AAPL"}}]
+    cache.put("k", "report", calls)
+    assert cache.get("k") == "report"
+
+    market_cache.clear()
+    original = playback.info
+    playback.info = lambda ticker: dict(original(ticker), currentPrice=1.0)
+    assert cache.get("k") is None
+
+
+def test_news_feed_fingerprint_has_no_side_effects(playback, news_index):
+    calls = [{"name": "get_news_feed", "args": {"tickers": ["AAPL"]}}]
+    before = fingerprint(calls)
+
+    from tools.news import get_news_feed
+
+    get_news_feed(["MSFT", "NVDA"])
+    cursor = news_index.cursor
+    assert fingerprint(calls) == before
+    assert news_index.cursor == cursor
+
+
+def test_intraday_fingerprint_is_the_last_completed_bar(playback):
+    from tools.intraday import get_aggregator, intraday_fingerprint
+
+    stamp = intraday_fingerprint(["AAPL"], interval="5m", window=20)
+    assert stamp["AAPL"] == str(get_aggregator("5m", 20).last_time("AAPL"))
+    assert intraday_fingerprint(["AAPL"], interval="5m", window=20) == stamp
+
+
+def test_aanalyze_investment_uses_response_cache(playback, stub_models, response_cache, monkeypatch):
+    from investment_team import aanalyze_investment
+    from runtime.coalesce import query_flight
+
+    # Serve the repeat from the response cache, not from the just-finished shared run
+    monkeypatch.setattr(query_flight, "linger", 0.0)
+
+    first = asyncio.run(aanalyze_investment("Analyze AAPL", stream=False))
+    second = asyncio.run(aanalyze_investment("Analyze AAPL", stream=False))
+    assert first == second
+    assert response_cache.stats()["hits"] == 1
+
+    asyncio.run(aanalyze_investment("Analyze AAPL", stream=False, use_cache=False))
+    assert response_cache.stats()["hits"] == 1
+
+
+def test_cache_without_root_stays_in_memory(playback, tmp_path, monkeypatch):
+    from runtime import response_cache as module
+
+    monkeypatch.delenv("RESPONSE_CACHE_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+    cache = module._default_cache()
+    assert cache.root is None
+
+    cache.max_entries = 2
+    calls = [{"name": "get_stock_info", "args": {"ticker": "AAPL"}}]
+    for key in ("a", "b", "c"):
+        cache.put(key, f"report {key}", calls)
+    assert cache.get("a") is None and cache.get("c") == "report c"
+    assert cache.stats()["entries"] == 2
+    assert cache.clear() == 2 and cache.get("c") is None
+    assert list(tmp_path.iterdir()) == []
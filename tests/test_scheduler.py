@@ -0,0 +1,87 @@
+"""Regression tests for the upstream request scheduler and throttled bulk downloads."""
+
+import pandas as pd
+import pytest
+
+import tools.scheduler as scheduler
+from tools.scheduler import CircuitBreaker, CircuitOpenError, RequestRejected, RequestScheduler
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(scheduler, "BACKOFF_BASE_S", 0.0)
+
+
+def test_shed_half_open_probe_does_not_wedge_breaker():
+    sched = RequestScheduler(rate=0, max_queue=0)
+    breaker = sched.breaker("h")
+    breaker.state, breaker.reset_s = "open", 0.0
+
+    # The half-open probe is taken by allow() and then shed by the full queue
+    with pytest.raises(RequestRejected):
+        sched.call("h", lambda: "ok")
+
+    sched.max_queue = 10
+    assert sched.call("h", lambda: "ok") == "ok"
+    assert breaker.state == "closed"
+
+
+def test_cancel_leaves_other_threads_probe():
+    import threading
+
+    breaker = CircuitBreaker(threshold=1, reset_s=0.0)
+    breaker.failure()
+    taken = threading.Thread(target=breaker.allow)
+    taken.start()
+    taken.join()
+
+    breaker.cancel()
+    assert not breaker.allow()
+
+
+def test_open_breaker_still_rejects():
+    sched = RequestScheduler(rate=0)
+    breaker = sched.breaker("h")
+    breaker.state, breaker._opened, breaker.reset_s = "open", float("inf"), 60.0
+    with pytest.raises(CircuitOpenError):
+        sched.call("h", lambda: "ok")
+
+
+def _frame():
+    index = pd.date_range("2024-01-02", periods=3)
+    return pd.DataFrame({"Open": 1.0, "High": 1.0, "Low": 1.0, "Close": 1.0, "Volume": 1}, index=index)
+
+
+def test_throttled_bulk_download_is_retried_and_not_cached(monkeypatch):
+    yf = pytest.importorskip("yfinance")
+    from yfinance.exceptions import YFRateLimitError
+
+    from tools import providers, yfinance_tools
+    from tools.cache import market_cache
+
+    sched = RequestScheduler(rate=0, max_attempts=3)
+    monkeypatch.setattr(scheduler, "request_scheduler", sched)
+    monkeypatch.setattr(yfinance_tools, "_uses_store", lambda interval: False)
+    monkeypatch.setattr(yfinance_tools, "_provider", lambda: providers.YFinanceProvider())
+
+    attempts = {"RLA": 0}
+
+    def history(self, *args, **kwargs):
+        if self.ticker == "RLA":
+            attempts["RLA"] += 1
+            if attempts["RLA"] > 1:
+                return _frame()
+        raise YFRateLimitError()
+
+    monkeypatch.setattr(yf.Ticker, "history", history)
+    market_cache.clear()
+
+    results = yfinance_tools._fetch_history_batch(["RLA", "RLB"], "5d")
+
+    assert len(results["RLA"]) == 3
+    assert isinstance(results["RLB"], Exception)
+    stats = sched.stats()
+    assert stats["throttled"] >= 1 and stats["retries"] >= 1 and stats["succeeded"] == 0
+    assert stats["concurrency_limit"] < 8
+    assert market_cache.get("history", "RLA", "5d", "1d")[0]
+    assert not market_cache.get("history", "RLB", "5d", "1d")[0]
@@ -0,0 +1,54 @@
+"""Regression tests for the team pool's slot accounting."""
+
+import threading
+import time
+
+import pytest
+
+from runtime.team_pool import TeamPool
+
+
+def test_failed_run_wakes_waiter():
+    pool = TeamPool(object, max_size=1)
+    started = threading.Event()
+
+    def fail():
+        with pytest.raises(RuntimeError):
+            with pool.session():
+                started.set()
+                time.sleep(0.1)
+                raise RuntimeError("run failed")
+
+    failing = threading.Thread(target=fail)
+    failing.start()
+    started.wait()
+    got = []
+
+    def wait():
+        with pool.session() as (team, _):
+            got.append(team)
+
+    waiter = threading.Thread(target=wait, daemon=True)
+    waiter.start()
+    waiter.join(2)
+    failing.join()
+
+    assert got, "waiter stayed blocked after the failed run released its slot"
+    assert pool.stats() == {"created": 1, "idle": 1, "max_size": 1, "checkouts": 2}
+
+
+def test_failed_factory_frees_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise ValueError("build failed")
+        return object()
+
+    pool = TeamPool(factory, max_size=1)
+    with pytest.raises(ValueError):
+        with pool.session():
+            pass
+    with pool.session() as (team, _):
+        assert team is not None
@@ -0,0 +1,106 @@
+"""Tests for the vectorized indicators against per-series pandas references."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tools.technical_indicators import TRADING_DAYS, _ffill, _last_cross, _rolling_mean, compute_indicators
+
+
+def _prices(rows=300, assets=3, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, (rows, assets)), axis=0))
+    high = close * (1 + rng.uniform(0, 0.01, (rows, assets)))
+    low = close * (1 - rng.uniform(0, 0.01, (rows, assets)))
+    return close, high, low
+
+
+def _reference(close, high, low):
+    """Latest indicator values of one series, computed with pandas."""
+    close, high, low = pd.Series(close), pd.Series(high), pd.Series(low)
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]
+    macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = macd.ewm(span=9, adjust=False).mean()
+    prev = close.shift()
+    true_range = pd.concat([high - low, (high - prev).abs(), (low - prev).abs()], axis=1).max(axis=1)
+    atr = true_range.ewm(alpha=1 / 14, adjust=False).mean().iloc[-1]
+    window = close.iloc[-20:]
+    drawdown = (close / close.cummax() - 1) * 100
+    return {
+        "rsi_14": 100 - 100 / (1 + gain / loss),
+        "macd": macd.iloc[-1],
+        "macd_signal": signal.iloc[-1],
+        "atr_14": atr,
+        "bollinger_upper": window.mean() + 2 * window.std(ddof=0),
+        "bollinger_lower": window.mean() - 2 * window.std(ddof=0),
+        "support_20d": low.iloc[-20:].min(),
+        "resistance_20d": high.iloc[-20:].max(),
+        "volatility_20d_annualized": np.log(close).diff().iloc[-20:].std() * np.sqrt(TRADING_DAYS) * 100,
+        "current_drawdown_percent": drawdown.iloc[-1],
+        "max_drawdown_percent": drawdown.min(),
+        "sma_50": close.rolling(50).mean().iloc[-1],
+        "sma_200": close.rolling(200).mean().iloc[-1],
+    }
+
+
+def test_indicators_match_pandas():
+    close, high, low = _prices()
+    indicators = compute_indicators(close, high, low)
+    for column in range(close.shape[1]):
+        expected = _reference(close[:, column], high[:, column], low[:, column])
+        actual = {name: indicators[name][column] for name in expected}
+        assert actual == pytest.approx(expected, rel=1e-9)
+
+
+def test_shorter_histories_match_their_own_series():
+    close, high, low = _prices()
+    short = 120
+    for x in (close, high, low):
+        x[:-short, 1] = np.nan
+    indicators = compute_indicators(close, high, low)
+    alone = compute_indicators(close[-short:, 1:2], high[-short:, 1:2], low[-short:, 1:2])
+
+    for name in ("rsi_14", "macd", "macd_signal", "atr_14", "bollinger_upper", "max_drawdown_percent", "sma_50"):
+        assert indicators[name][1] == pytest.approx(alone[name][0], rel=1e-12)
+    assert np.isnan(indicators["sma_200"][1])
+
+
+def test_rsi_without_losses_is_100():
+    close = np.linspace(100, 130, 60)[:, None]
+    assert compute_indicators(close, close + 1, close - 1)["rsi_14"][0] == 100.0
+
+
+def test_ffill_keeps_leading_gaps():
+    x = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, np.nan], [4.0, 5.0]])
+    filled = _ffill(x)
+    np.testing.assert_array_equal(filled[:, 0], [np.nan, 2.0, 2.0, 4.0])
+    np.testing.assert_array_equal(filled[:, 1], [1.0, 1.0, 1.0, 5.0])
+
+
+def test_rolling_mean_needs_a_full_window():
+    x = np.arange(10, dtype=float)[:, None]
+    means = _rolling_mean(x, 4)[:, 0]
+    assert np.isnan(means[:3]).all()
+    np.testing.assert_allclose(means[3:], pd.Series(x[:, 0]).rolling(4).mean().to_numpy()[3:])
+
+
+def test_last_cross():
+    fast = np.array([[1.0, 1.0], [2.0, 1.0], [4.0, 1.0], [2.0, 1.0], [1.0, 1.0]])
+    slow = np.array([[3.0, 2.0], [3.0, 2.0], [3.0, 2.0], [3.0, 2.0], [3.0, 2.0]])
+    rows, direction = _last_cross(fast, slow)
+    assert rows.tolist() == [3, -1]
+    assert direction[0] < 0
+
+
+def test_get_technical_indicators_rows(playback):
+    from tools.technical_indicators import get_technical_indicators
+
+    rows = get_technical_indicators(["MSFT", "AAPL"], period="1y")
+    assert list(rows) == ["MSFT", "AAPL"]
+    row = rows["AAPL"]
+    assert row["ticker"] == "AAPL"
+    assert 0 <= row["rsi_14"] <= 100
+    assert row["bollinger_lower"] <= row["bollinger_middle"] <= row["bollinger_upper"]
+    assert row["ma_trend"] in ("bullish (50 > 200)", "bearish (50 < 200)")
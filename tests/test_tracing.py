@@ -0,0 +1,143 @@
+"""Tests for the span tracer and agent instrumentation."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import runtime.tracing
+from runtime.tracing import Tracer, note_cache, trace_agent
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = Tracer(enabled=True)
+    monkeypatch.setattr(runtime.tracing, "tracer", tracer)
+    return tracer
+
+
+class CompletedEvent:
+    pass
+
+
+class RunCompletedEvent:
+    def __init__(self, input_tokens, output_tokens):
+        self.metrics = SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens)
+
+
+def _output(input_tokens=10, output_tokens=5):
+    return SimpleNamespace(content="ok", metrics=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens))
+
+
+class Runner:
+    """Stand-in for an Agno agent whose run methods return each supported shape."""
+
+    name = "Analyst"
+
+    def run(self, input, stream=False):
+        if input == "fail":
+            raise RuntimeError("model down")
+        if stream:
+            return iter([CompletedEvent(), RunCompletedEvent(7, 3)])
+        return _output()
+
+    def arun(self, input, stream=False):
+        if stream:
+            async def events():
+                yield CompletedEvent()
+                yield RunCompletedEvent(4, 2)
+            return events()
+
+        async def result():
+            return _output(2, 1)
+        return result()
+
+
+def test_spans_nest_and_record_errors(tracer):
+    with tracer.span("team", "Team") as team:
+        with tracer.span("tool", "get_stock_info"):
+            note_cache(True)
+            note_cache(False)
+        with pytest.raises(ValueError):
+            with tracer.span("tool", "compare_stocks"):
+                raise ValueError("bad ticker")
+
+    spans = {span["name"]: span for span in tracer.spans()}
+    assert spans["get_stock_info"]["parent_id"] == team.span_id
+    assert spans["get_stock_info"]["trace_id"] == team.trace_id
+    assert (spans["get_stock_info"]["cache_hits"], spans["get_stock_info"]["cache_hit"]) == (1, False)
+    assert spans["compare_stocks"]["error"] == "ValueError: bad ticker"
+    assert spans["Team"]["parent_id"] is None
+
+
+def test_trace_agent_records_every_run_shape(tracer):
+    runner = trace_agent(Runner())
+
+    assert runner.run("q").content == "ok"
+    assert len(list(runner.run("q", stream=True))) == 2
+    assert asyncio.run(runner.arun("q")).content == "ok"
+
+    async def consume():
+        return [event async for event in runner.arun("q", stream=True)]
+
+    assert len(asyncio.run(consume())) == 2
+    with pytest.raises(RuntimeError):
+        runner.run("fail")
+
+    spans = tracer.spans()
+    assert [span["kind"] for span in spans] == ["agent"] * 5
+    assert [(span["tokens_in"], span["tokens_out"]) for span in spans] == [(10, 5), (7, 3), (2, 1), (4, 2), (0, 0)]
+    assert spans[-1]["error"] == "RuntimeError: model down"
+
+
+def test_team_members_nest_under_the_team(tracer):
+    member = trace_agent(Runner())
+
+    class Team:
+        name = "Investment Team"
+        members = [member]
+
+        def run(self, input):
+            return member.run(input)
+
+        def arun(self, input):
+            raise NotImplementedError
+
+    trace_agent(Team()).run("q")
+    agent, team = tracer.spans()
+    assert (team["kind"], agent["parent_id"]) == ("team", team["span_id"])
+
+
+def test_disabled_tracer_records_nothing(tracer):
+    tracer.disable()
+    runner = trace_agent(Runner())
+    runner.run("q")
+    note_cache(True)
+    assert tracer.spans() == []
+
+
+def test_span_buffer_is_bounded_but_metrics_are_not():
+    tracer = Tracer(enabled=True, max_spans=3)
+    for _ in range(5):
+        with tracer.span("tool", "get_stock_info"):
+            pass
+    assert len(tracer.spans()) == 3
+    assert 'investment_span_duration_seconds_count{kind="tool",name="get_stock_info"} 5' in tracer.prometheus_text()
+
+
+def test_exports(tracer, tmp_path):
+    with tracer.span("agent", 'Quote "Reader"') as span:
+        span.tokens_in, span.tokens_out = 12, 4
+
+    tracer.export_json(str(tmp_path / "trace.json"))
+    assert json.loads((tmp_path / "trace.json").read_text())["spans"][0]["tokens_in"] == 12
+
+    text = tracer.prometheus_text()
+    labels = 'kind="agent",name="Quote \\"Reader\\""'
+    assert f'investment_span_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+    assert f"investment_tokens_in_total{{{labels}}} 12" in text
+    assert f"investment_tokens_out_total{{{labels}}} 4" in text
+
+    tracer.reset()
+    assert tracer.spans() == [] and "investment_tokens_in_total{" not in tracer.prometheus_text()
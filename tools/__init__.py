@@ -1,17 +1,52 @@
 """Custom tools for the AI Investment Agent Team."""
 
-from tools.yfinance_tools import (
-    get_stock_info,
-    get_stock_news,
-    get_historical_data,
-    get_market_indices,
-    compare_stocks,
-)
+import importlib
+from typing import Any
 
-__all__ = [
-    "get_stock_info",
-    "get_stock_news",
-    "get_historical_data",
-    "get_market_indices",
-    "compare_stocks",
-]
+# Exports are resolved on first access so that importing this package doesn't
+# pull in yfinance, pandas or NumPy until a tool is actually used.
+_EXPORTS = {
+    "get_stock_info": "tools.yfinance_tools",
+    "get_stock_news": "tools.yfinance_tools",
+    "get_historical_data": "tools.yfinance_tools",
+    "get_market_indices": "tools.yfinance_tools",
+    "compare_stocks": "tools.yfinance_tools",
+    "get_technical_indicators": "tools.technical_indicators",
+    "screen_universe": "tools.screener",
+    "load_universe": "tools.screener",
+    "available_universes": "tools.screener",
+    "analyze_portfolio": "tools.portfolio",
+    "CovarianceTracker": "tools.portfolio",
+    "get_intraday_stats": "tools.intraday",
+    "IntradayAggregator": "tools.intraday",
+    "IntradayMonitor": "tools.intraday",
+    "get_news_feed": "tools.news",
+    "NewsIndex": "tools.news",
+    "news_index": "tools.news",
+    "market_cache": "tools.cache",
+    "TTLCache": "tools.cache",
+    "set_output_mode": "tools.encoding",
+    "payload_stats": "tools.encoding",
+    "MarketDataProvider": "tools.providers",
+    "YFinanceProvider": "tools.providers",
+    "SnapshotProvider": "tools.providers",
+    "get_provider": "tools.providers",
+    "request_scheduler": "tools.scheduler",
+    "RequestScheduler": "tools.scheduler",
+    "set_provider": "tools.providers",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,68 @@
+"""Async variants of the market data tools for concurrent agent runs."""
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Coroutine
+
+from tools.yfinance_tools import (
+    get_stock_info,
+    get_stock_news,
+    get_historical_data,
+    get_market_indices,
+    compare_stocks,
+)
+from tools.technical_indicators import get_technical_indicators
+from tools.screener import screen_universe
+from tools.portfolio import analyze_portfolio
+from tools.intraday import get_intraday_stats
+from tools.news import get_news_feed
+
+# Worker threads running blocking tools for all coroutines; the upstream
+# request limit itself is the scheduler's (MARKET_DATA_MAX_CONCURRENCY)
+MAX_WORKERS = int(os.getenv("ASYNC_TOOL_WORKERS", "16"))
+
+# Shared worker pool. yfinance keeps a single pooled HTTP session per process,
+# so every worker reuses the same warm connections; the pool size caps how many
+# tools run at once no matter how many coroutines await them.
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="market-data")
+
+
+async def run_in_pool(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking call on the shared market data pool and await its result.
+
+    The call runs in a copy of the caller's context, so context variables such
+    as the active trace span carry over to the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await loop.run_in_executor(_executor, call)
+
+
+def _to_async(func: Callable[..., Any]) -> Callable[..., Coroutine[Any, Any, Any]]:
+    """
+    Wrap a blocking tool as a coroutine function.
+
+    The wrapper keeps the tool's name, signature and docstring so that agents
+    see the same tool schema whether they run sync or async.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await run_in_pool(func, *args, **kwargs)
+
+    return wrapper
+
+
+aget_stock_info = _to_async(get_stock_info)
+aget_stock_news = _to_async(get_stock_news)
+aget_historical_data = _to_async(get_historical_data)
+aget_market_indices = _to_async(get_market_indices)
+acompare_stocks = _to_async(compare_stocks)
+aget_technical_indicators = _to_async(get_technical_indicators)
+ascreen_universe = _to_async(screen_universe)
+aanalyze_portfolio = _to_async(analyze_portfolio)
+aget_intraday_stats = _to_async(get_intraday_stats)
+aget_news_feed = _to_async(get_news_feed)
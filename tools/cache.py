@@ -0,0 +1,225 @@
+"""Process-wide TTL cache for market data fetched by the Yfinance tools."""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from runtime.coalesce import SingleFlight
+from runtime.tracing import note_cache
+
+
+# Default time-to-live (seconds) for each kind of cached market data
+DEFAULT_TTLS = {
+    "info": 60.0,
+    "news": 300.0,
+    "history": 300.0,
+    "intraday": 30.0,
+}
+
+
+def _estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Roughly estimate the memory footprint of a cached value in bytes.
+
+    Args:
+        value: Object to measure (DataFrame, dict, list or scalar)
+
+    Returns:
+        Approximate size in bytes.
+    """
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):
+        try:
+            usage = memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+        except Exception:
+            pass
+
+    size = sys.getsizeof(value)
+    if _depth > 4:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += _estimate_size(k, _depth + 1) + _estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            size += _estimate_size(item, _depth + 1)
+    elif hasattr(type(value), "__slots__"):
+        for name in type(value).__slots__:
+            size += _estimate_size(getattr(value, name, None), _depth + 1)
+    return size
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a per-kind TTL and a memory cap.
+
+    Entries are keyed by ``(kind, ticker, *extra)`` so that each data kind
+    (info, news, history by period/interval) expires on its own schedule and
+    a single ticker can be invalidated across every kind at once. Concurrent
+    misses for the same key share one fetch (see ``get_or_fetch`` and ``flights``).
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_bytes: int = 64 * 1024 * 1024):
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._evictions = 0
+        self.flights = SingleFlight()
+
+    def get(self, kind: str, *key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            kind: Data kind (e.g., 'info', 'news', 'history')
+            *key: Remaining key parts, starting with the ticker symbol
+
+        Returns:
+            Tuple of (found, value). Expired entries are dropped and reported as misses.
+        """
+        full_key = (kind,) + key
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is not None:
+                expires_at, size, value = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(full_key)
+                    self._hits[kind] = self._hits.get(kind, 0) + 1
+                    note_cache(True)
+                    return True, value
+                self._drop(full_key)
+            self._misses[kind] = self._misses.get(kind, 0) + 1
+        note_cache(False)
+        return False, None
+
+    def set(self, kind: str, *key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least recently used entries if over the memory cap.
+
+        Args:
+            kind: Data kind (e.g., 'info', 'news', 'history')
+            *key: Remaining key parts, starting with the ticker symbol
+            value: Value to cache
+            ttl: Optional TTL override in seconds (defaults to the kind's TTL)
+        """
+        full_key = (kind,) + key
+        ttl = self.ttls.get(kind, 60.0) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if full_key in self._entries:
+                self._drop(full_key)
+            self._entries[full_key] = (time.monotonic() + ttl, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._evictions += 1
+
+    def get_or_fetch(self, kind: str, *key: Hashable, fetch: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Return a cached value, calling ``fetch`` and caching its result on a miss.
+
+        Concurrent misses for the same key are coalesced: one caller fetches
+        and the others wait for its result. Exceptions raised by ``fetch``
+        propagate to every waiting caller and nothing is cached.
+        """
+        found, value = self.get(kind, *key)
+        if found:
+            return value
+
+        def fetch_and_store() -> Any:
+            # Another caller may have stored the value between our miss and now
+            found, value = self.peek(kind, *key)
+            if found:
+                return value
+            value = fetch()
+            self.set(kind, *key, value=value, ttl=ttl)
+            return value
+
+        return self.flights.do((kind,) + key, fetch_and_store)
+
+    def peek(self, kind: str, *key: Hashable) -> Tuple[bool, Any]:
+        """Like ``get``, but without counting a hit or miss or refreshing the LRU order."""
+        with self._lock:
+            entry = self._entries.get((kind,) + key)
+            if entry is not None and entry[0] > time.monotonic():
+                return True, entry[2]
+            return False, None
+
+    def invalidate(self, ticker: Optional[str] = None, kind: Optional[str] = None) -> int:
+        """
+        Drop cached entries.
+
+        Args:
+            ticker: Only drop entries for this ticker (default: all tickers)
+            kind: Only drop entries of this data kind (default: all kinds)
+
+        Returns:
+            Number of entries removed.
+        """
+        ticker = ticker.upper() if ticker else None
+        with self._lock:
+            doomed = [
+                k for k in self._entries
+                if (kind is None or k[0] == kind) and (ticker is None or (len(k) > 1 and k[1] == ticker))
+            ]
+            for k in doomed:
+                self._drop(k)
+            return len(doomed)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count, memory usage, evictions, coalesced
+            fetches and per-kind hit/miss counters.
+        """
+        coalesced = self.flights.stats()["coalesced"]
+        with self._lock:
+            kinds = sorted(set(self._hits) | set(self._misses))
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "hits": sum(self._hits.values()),
+                "misses": sum(self._misses.values()),
+                "coalesced": coalesced,
+                "by_kind": {
+                    k: {"hits": self._hits.get(k, 0), "misses": self._misses.get(k, 0)} for k in kinds
+                },
+            }
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters; fetches already in flight are no longer joined."""
+        with self._lock:
+            self.flights = SingleFlight()
+            self._entries.clear()
+            self._bytes = 0
+            self._hits.clear()
+            self._misses.clear()
+            self._evictions = 0
+
+    def _drop(self, full_key: Tuple[Hashable, ...]) -> None:
+        _, size, _ = self._entries.pop(full_key)
+        self._bytes -= size
+
+
+# Shared cache used by every tool in this package
+market_cache = TTLCache(max_bytes=int(float(os.getenv("MARKET_CACHE_MAX_MB", "64")) * 1024 * 1024))
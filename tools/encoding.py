@@ -0,0 +1,189 @@
+"""Token-compact encoding of tool results and per-tool payload accounting."""
+
+import functools
+import json
+import math
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from runtime.tracing import tracer
+
+
+# "full" returns tool results unchanged; "compact" drops missing fields,
+# rounds numbers and encodes multi-ticker results as tables
+_output_mode = os.getenv("TOOL_OUTPUT_MODE", "full").lower()
+
+_MISSING = (None, "N/A", "")
+
+# Rough characters-per-token ratio for English/JSON text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def set_output_mode(mode: str) -> None:
+    """
+    Set how tool results are encoded for the agents.
+
+    Args:
+        mode: 'full' (unchanged results) or 'compact'
+    """
+    global _output_mode
+    if mode not in ("full", "compact"):
+        raise ValueError(f"Unknown output mode: {mode}")
+    _output_mode = mode
+
+
+def get_output_mode() -> str:
+    """Return the current tool output mode ('full' or 'compact')."""
+    return _output_mode
+
+
+def _round(value: float) -> Any:
+    if not math.isfinite(value):
+        return None
+    magnitude = abs(value)
+    if magnitude >= 1e5:
+        return int(round(value))
+    if magnitude >= 1:
+        return round(value, 2)
+    return float(f"{value:.3g}")
+
+
+def compact(value: Any, drop: Iterable[str] = ()) -> Any:
+    """
+    Recursively shrink a tool result.
+
+    Drops missing values ('N/A', None, empty strings) and any keys in ``drop``,
+    and rounds floats: large values (market caps, volumes) to integers, prices
+    and percentages to two decimals, small values to three significant digits.
+    """
+    drop = frozenset(drop)
+    if isinstance(value, dict):
+        out = {}
+        for key, item in value.items():
+            if key in drop:
+                continue
+            item = compact(item, drop)
+            if item not in _MISSING and item != {} and item != []:
+                out[key] = item
+        return out
+    if isinstance(value, (list, tuple)):
+        return [compact(item, drop) for item in value]
+    if isinstance(value, float):
+        return _round(value)
+    return value
+
+
+def tabulate(rows: Dict[str, Dict[str, Any]], key: str = "ticker") -> Dict[str, Any]:
+    """
+    Encode a mapping of row name -> record as a column table.
+
+    Field names are written once instead of once per row; rows that only carry
+    an ``error`` are listed separately.
+
+    Returns:
+        Dictionary with ``columns``, ``rows`` and (if any) ``errors``.
+    """
+    columns = [key]
+    errors = {}
+    for name, record in rows.items():
+        if not isinstance(record, dict) or set(record) == {"error"}:
+            errors[name] = record.get("error") if isinstance(record, dict) else record
+            continue
+        for field in record:
+            if field not in columns and field != key:
+                columns.append(field)
+
+    table: Dict[str, Any] = {
+        "columns": columns,
+        "rows": [
+            [name] + [record.get(field) for field in columns[1:]]
+            for name, record in rows.items() if name not in errors
+        ],
+    }
+    if errors:
+        table["errors"] = errors
+    return table
+
+
+class PayloadStats:
+    """Thread-safe accumulator of serialized tool result sizes, per tool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, tool: str, result: Any) -> int:
+        """
+        Record one tool result.
+
+        Returns:
+            Serialized size of the result in bytes.
+        """
+        size = len(json.dumps(result, default=str, separators=(",", ":")).encode("utf-8"))
+        tokens = math.ceil(size / CHARS_PER_TOKEN)
+        with self._lock:
+            stats = self._stats.setdefault(tool, {"calls": 0, "bytes": 0, "est_tokens": 0, "max_bytes": 0})
+            stats["calls"] += 1
+            stats["bytes"] += size
+            stats["est_tokens"] += tokens
+            stats["max_bytes"] = max(stats["max_bytes"], size)
+        return size
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Return per-tool totals, largest token consumers first."""
+        with self._lock:
+            return dict(sorted(
+                ((tool, dict(stats)) for tool, stats in self._stats.items()),
+                key=lambda item: item[1]["est_tokens"],
+                reverse=True,
+            ))
+
+    def reset(self) -> None:
+        """Clear all recorded totals."""
+        with self._lock:
+            self._stats.clear()
+
+
+# Shared payload accounting for every tool in this package
+payload_stats = PayloadStats()
+
+
+def tool_output(table: Optional[str] = None, drop: Iterable[str] = ()) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Decorate a tool so its result is compacted in compact mode and its size recorded.
+
+    The wrapper keeps the tool's name, signature and docstring, so agents see
+    the same tool schema. When tracing is enabled each call is also recorded as
+    a 'tool' span, with the estimated result tokens as its output tokens.
+
+    Args:
+        table: Encode the result (a mapping of name -> record) as a column table,
+            using this as the name of the first column (e.g., 'ticker')
+        drop: Keys to remove from the result in compact mode
+    """
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        def encode(result: Any) -> Any:
+            if _output_mode == "compact":
+                result = compact(result, drop)
+                if table and isinstance(result, dict):
+                    result = tabulate(result, key=table)
+            return result
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracer.enabled:
+                result = encode(func(*args, **kwargs))
+                payload_stats.record(func.__name__, result)
+                return result
+
+            with tracer.span("tool", func.__name__) as span:
+                result = encode(func(*args, **kwargs))
+                span.tokens_out = math.ceil(payload_stats.record(func.__name__, result) / CHARS_PER_TOKEN)
+                if isinstance(result, dict) and "error" in result:
+                    span.error = str(result["error"])
+                return result
+
+        return wrapper
+
+    return decorator
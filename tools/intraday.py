@@ -0,0 +1,502 @@
+"""Incremental rolling-window statistics for intraday bars, fed by a polling monitor."""
+
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from runtime.coalesce import SingleFlight
+from tools.encoding import tool_output
+
+# Minutes per bar for the supported intraday intervals
+INTERVAL_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+
+# Minimum seconds between upstream refreshes of the same ticker; tool calls in
+# between answer from the aggregator state without touching the network
+REFRESH_S = float(os.getenv("INTRADAY_REFRESH_S", "30"))
+
+# Seconds between refreshes made by IntradayMonitor
+POLL_S = float(os.getenv("INTRADAY_POLL_S", "60"))
+
+# Largest window (in bars) a tool call may request
+MAX_WINDOW = 2000
+
+# Aggregators (one per interval and window size) kept before the least
+# recently used is dropped; those of running monitors are never dropped
+MAX_AGGREGATORS = int(os.getenv("INTRADAY_MAX_AGGREGATORS", "16"))
+
+# Regular-session minutes per trading day, used to annualize realized volatility
+_SESSION_MINUTES = 390
+_TRADING_DAYS = 252
+
+# Yahoo serves at most this many days of bars per interval
+_MAX_DAYS = {"1m": 7, "2m": 60, "5m": 60, "15m": 60, "30m": 60, "60m": 730, "90m": 60, "1h": 730}
+
+
+class RollingWindow:
+    """
+    Rolling statistics over the last ``size`` bars of one ticker.
+
+    Each ``push`` is O(1) amortized: high and low come from monotonic deques,
+    and VWAP, average volume and realized volatility from running sums that
+    are adjusted as bars enter and leave the window. The sums are rebuilt from
+    the buffered bars once per ``size`` evictions so floating-point drift
+    cannot accumulate over a long session.
+
+    The newest bar of a live feed is usually still forming, so it can be held
+    as ``partial``: it is included in ``snapshot`` but only committed once a
+    later bar arrives.
+    """
+
+    __slots__ = (
+        "size", "_bars", "_highs", "_lows", "_seq", "_evictions",
+        "_volume", "_pv", "_ret", "_ret2", "last_time", "partial",
+    )
+
+    def __init__(self, size: int):
+        if size < 2:
+            raise ValueError("Window size must be at least 2 bars")
+        self.size = size
+        # (seq, time, open, high, low, close, volume, log return from the previous bar)
+        self._bars: deque = deque()
+        self._highs: deque = deque()  # (seq, high), highs strictly decreasing
+        self._lows: deque = deque()  # (seq, low), lows strictly increasing
+        self._seq = 0
+        self._evictions = 0
+        self._volume = 0.0
+        self._pv = 0.0
+        self._ret = 0.0
+        self._ret2 = 0.0
+        self.last_time: Any = None
+        self.partial: Optional[Tuple[Any, float, float, float, float, float]] = None
+
+    def __len__(self) -> int:
+        return len(self._bars)
+
+    def _log_return(self, close: float) -> float:
+        if not self._bars:
+            return 0.0
+        previous = self._bars[-1][5]
+        return math.log(close / previous) if previous > 0 and close > 0 else 0.0
+
+    def push(self, time_: Any, open_: float, high: float, low: float, close: float, volume: float) -> None:
+        """Commit a completed bar and evict the oldest one if the window is full."""
+        ret = self._log_return(close)
+        seq = self._seq
+        self._seq += 1
+        self._bars.append((seq, time_, open_, high, low, close, volume, ret))
+        self._volume += volume
+        self._pv += _typical(high, low, close) * volume
+        self._ret += ret
+        self._ret2 += ret * ret
+        while self._highs and self._highs[-1][1] <= high:
+            self._highs.pop()
+        self._highs.append((seq, high))
+        while self._lows and self._lows[-1][1] >= low:
+            self._lows.pop()
+        self._lows.append((seq, low))
+        self.last_time = time_
+
+        if len(self._bars) > self.size:
+            self._evict()
+
+    def _evict(self) -> None:
+        seq, _, _, high, low, close, volume, ret = self._bars.popleft()
+        self._volume -= volume
+        self._pv -= _typical(high, low, close) * volume
+        self._ret -= ret
+        self._ret2 -= ret * ret
+        if self._highs[0][0] == seq:
+            self._highs.popleft()
+        if self._lows[0][0] == seq:
+            self._lows.popleft()
+        self._evictions += 1
+        if self._evictions >= self.size:
+            self._resum()
+
+    def _resum(self) -> None:
+        self._evictions = 0
+        self._volume = math.fsum(bar[6] for bar in self._bars)
+        self._pv = math.fsum(_typical(bar[3], bar[4], bar[5]) * bar[6] for bar in self._bars)
+        self._ret = math.fsum(bar[7] for bar in self._bars)
+        self._ret2 = math.fsum(bar[7] * bar[7] for bar in self._bars)
+
+    def snapshot(self, bars_per_year: float) -> Optional[Dict[str, Any]]:
+        """
+        Return the window's statistics, including the partial bar if one is held.
+
+        Args:
+            bars_per_year: Bars per trading year at this interval, used to
+                annualize realized volatility
+        """
+        if not self._bars and self.partial is None:
+            return None
+
+        count = len(self._bars)
+        volume, pv, ret, ret2 = self._volume, self._pv, self._ret, self._ret2
+        high = self._highs[0][1] if self._highs else -math.inf
+        low = self._lows[0][1] if self._lows else math.inf
+        first = self._bars[0] if self._bars else None
+        if first is not None:
+            # The oldest bar's return reaches back outside the window
+            ret -= first[7]
+            ret2 -= first[7] * first[7]
+        returns = max(count - 1, 0)
+        last_time, last_close = (self._bars[-1][1], self._bars[-1][5]) if self._bars else (None, None)
+
+        if self.partial is not None:
+            p_time, p_open, p_high, p_low, p_close, p_volume = self.partial
+            if count >= self.size and first is not None:
+                # The partial bar takes the place of the oldest committed bar
+                count -= 1
+                volume -= first[6]
+                pv -= _typical(first[3], first[4], first[5]) * first[6]
+                second_ret = self._bars[1][7] if len(self._bars) > 1 else 0.0
+                ret -= second_ret
+                ret2 -= second_ret * second_ret
+                returns -= 1
+                first = self._bars[1] if len(self._bars) > 1 else None
+                if len(self._highs) > 1 and self._highs[0][0] == self._bars[0][0]:
+                    high = self._highs[1][1]
+                if len(self._lows) > 1 and self._lows[0][0] == self._bars[0][0]:
+                    low = self._lows[1][1]
+            if last_close is not None and last_close > 0 and p_close > 0:
+                partial_ret = math.log(p_close / last_close)
+                ret += partial_ret
+                ret2 += partial_ret * partial_ret
+                returns += 1
+            count += 1
+            volume += p_volume
+            pv += _typical(p_high, p_low, p_close) * p_volume
+            high = max(high, p_high)
+            low = min(low, p_low)
+            last_time, last_close = p_time, p_close
+            if first is None:
+                first = (None, p_time, p_open)
+
+        open_ = first[2]
+        volatility = None
+        if returns > 1:
+            variance = max((ret2 - ret * ret / returns) / (returns - 1), 0.0)
+            volatility = math.sqrt(variance * bars_per_year) * 100
+        return {
+            "as_of": str(last_time),
+            "window_start": str(first[1]),
+            "bars": count,
+            "last_price": round(last_close, 4),
+            "high": round(high, 4),
+            "low": round(low, 4),
+            "vwap": round(pv / volume, 4) if volume > 0 else None,
+            "change": round(last_close - open_, 4),
+            "change_percent": round((last_close / open_ - 1) * 100, 4) if open_ else None,
+            "total_volume": int(volume),
+            "avg_volume": int(volume / count),
+            "realized_volatility_annualized": round(volatility, 4) if volatility is not None else None,
+            "partial_bar": self.partial is not None,
+        }
+
+
+def _typical(high: float, low: float, close: float) -> float:
+    return (high + low + close) / 3
+
+
+class IntradayAggregator:
+    """
+    Per-ticker rolling windows for one bar interval and window size.
+
+    ``ingest`` takes whatever frame a poll returned and applies only the bars
+    newer than the last one it committed, so re-polling an overlapping range
+    costs O(new bars) rather than a pass over the whole frame.
+    """
+
+    def __init__(self, interval: str = "1m", window: int = 60):
+        if interval not in INTERVAL_MINUTES:
+            raise ValueError(f"Unsupported intraday interval '{interval}'; use one of: {', '.join(INTERVAL_MINUTES)}")
+        self.interval = interval
+        self.window = window
+        self.bars_per_year = _TRADING_DAYS * _SESSION_MINUTES / INTERVAL_MINUTES[interval]
+        self._windows: Dict[str, RollingWindow] = {}
+        self._lock = threading.Lock()
+
+    def ingest(self, ticker: str, frame: Any, complete: bool = False) -> int:
+        """
+        Apply the new bars of an OHLCV frame to a ticker's window.
+
+        Args:
+            ticker: Stock ticker symbol
+            frame: OHLCV DataFrame indexed by bar time, oldest first
+            complete: Treat the newest bar as final instead of still forming
+
+        Returns:
+            Number of bars committed.
+        """
+        if frame is None or len(frame) == 0:
+            return 0
+        index = frame.index
+        values = frame[["Open", "High", "Low", "Close", "Volume"]].to_numpy(dtype=float).tolist()
+        ticker = ticker.upper()
+        with self._lock:
+            state = self._windows.get(ticker)
+            if state is None:
+                state = self._windows[ticker] = RollingWindow(self.window)
+            start = 0 if state.last_time is None else int(index.searchsorted(state.last_time, side="right"))
+            stop = len(frame) if complete else len(frame) - 1
+            committed = 0
+            for i in range(start, stop):
+                row = values[i]
+                if math.isnan(row[3]):
+                    continue
+                state.push(index[i], row[0], row[1], row[2], row[3], 0.0 if math.isnan(row[4]) else row[4])
+                committed += 1
+            if not complete and len(frame) > start:
+                row = values[-1]
+                state.partial = None if math.isnan(row[3]) else (
+                    index[-1], row[0], row[1], row[2], row[3], 0.0 if math.isnan(row[4]) else row[4],
+                )
+            elif complete:
+                state.partial = None
+            return committed
+
+    def snapshot(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Return the current rolling statistics for a ticker (None if it has no bars)."""
+        with self._lock:
+            state = self._windows.get(ticker.upper())
+            return state.snapshot(self.bars_per_year) if state is not None else None
+
+    def last_time(self, ticker: str) -> Any:
+        """Return the time of a ticker's last committed (completed) bar, or None."""
+        with self._lock:
+            state = self._windows.get(ticker.upper())
+            return state.last_time if state is not None else None
+
+    def tickers(self) -> List[str]:
+        with self._lock:
+            return list(self._windows)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._windows.clear()
+
+
+# Aggregators shared by the tool and the monitor, keyed by (interval, window),
+# least recently used first
+_aggregators: "OrderedDict[Tuple[str, int], IntradayAggregator]" = OrderedDict()
+_aggregators_lock = threading.Lock()
+
+# Running monitors per aggregator key; pinned aggregators are not evicted
+_pinned: Dict[Tuple[str, int], int] = {}
+
+# Last upstream refresh per (ticker, interval), as a time.monotonic() value
+_refreshed: Dict[Tuple[str, str], float] = {}
+
+# Collapses concurrent refreshes of the same tickers into one download
+_refresh_flight = SingleFlight()
+
+
+def get_aggregator(interval: str = "1m", window: int = 60) -> IntradayAggregator:
+    """
+    Return the shared aggregator for an interval and window size, creating it on first use.
+
+    Beyond ``MAX_AGGREGATORS`` the least recently used aggregators that no
+    monitor is running on are dropped; asking for one again starts it afresh.
+    """
+    key = (interval, int(window))
+    with _aggregators_lock:
+        aggregator = _aggregators.get(key)
+        if aggregator is None:
+            aggregator = _aggregators[key] = IntradayAggregator(interval, int(window))
+            evictable = [k for k in _aggregators if k != key and k not in _pinned]
+            for stale in evictable[:max(len(_aggregators) - MAX_AGGREGATORS, 0)]:
+                del _aggregators[stale]
+        else:
+            _aggregators.move_to_end(key)
+        return aggregator
+
+
+def _pin(key: Tuple[str, int], pinned: bool) -> None:
+    """Keep (or stop keeping) an aggregator from eviction while a monitor runs on it."""
+    with _aggregators_lock:
+        count = _pinned.get(key, 0) + (1 if pinned else -1)
+        if count > 0:
+            _pinned[key] = count
+        else:
+            _pinned.pop(key, None)
+
+
+def _seed_period(interval: str) -> str:
+    """Period that covers the largest window of any aggregator at this interval."""
+    with _aggregators_lock:
+        window = max((w for i, w in _aggregators if i == interval), default=1)
+    bars_per_day = max(1, _SESSION_MINUTES // INTERVAL_MINUTES[interval])
+    days = min(_MAX_DAYS[interval], math.ceil(window / bars_per_day) + 1)
+    return f"{days}d"
+
+
+def refresh(tickers: List[str], interval: str = "1m", max_age: float = REFRESH_S) -> Dict[str, str]:
+    """
+    Pull new bars for the tickers not refreshed within ``max_age`` seconds.
+
+    All stale tickers are fetched in one bulk download and the result is fed
+    to every aggregator at this interval. A ticker's first download covers
+    enough sessions to fill the largest window; later ones only the current
+    session, and each aggregator skips the bars it has already seen.
+
+    Returns:
+        Dictionary mapping ticker to an error message for the tickers that
+        could not be refreshed.
+    """
+    from tools.providers import get_provider
+
+    now = time.monotonic()
+    stale = sorted({t.upper() for t in tickers if now - _refreshed.get((t.upper(), interval), -math.inf) >= max_age})
+    if not stale:
+        return {}
+
+    def fetch() -> Dict[str, str]:
+        seeded = all((t, interval) in _refreshed for t in stale)
+        period = "1d" if seeded else _seed_period(interval)
+        try:
+            frames = get_provider().download(stale, period=period, interval=interval)
+        except Exception as e:
+            return {ticker: str(e) for ticker in stale}
+        with _aggregators_lock:
+            aggregators = [a for (i, _), a in _aggregators.items() if i == interval]
+        errors = {}
+        fetched_at = time.monotonic()
+        for ticker in stale:
+            frame = frames.get(ticker)
+            if frame is None or isinstance(frame, Exception) or frame.empty:
+                errors[ticker] = str(frame) if isinstance(frame, Exception) else "No intraday data"
+                continue
+            for aggregator in aggregators:
+                aggregator.ingest(ticker, frame)
+            _refreshed[(ticker, interval)] = fetched_at
+        return errors
+
+    return _refresh_flight.do((interval, tuple(stale)), fetch)
+
+
+class IntradayMonitor:
+    """
+    Background poller that keeps intraday aggregators current.
+
+    Every ``poll_s`` seconds the monitor refreshes its tickers with one bulk
+    download; get_intraday_stats calls in between answer from the aggregated
+    state without a network round trip. Use as a context manager or call
+    ``start``/``stop``.
+    """
+
+    def __init__(self, tickers: List[str], interval: str = "1m", window: int = 60, poll_s: float = POLL_S):
+        self.tickers = [t.upper() for t in tickers]
+        self.interval = interval
+        self.window = int(window)
+        self.poll_s = poll_s
+        self.aggregator = get_aggregator(interval, window)
+        self.errors: Dict[str, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def poll(self) -> Dict[str, str]:
+        """Refresh the monitored tickers once and return any per-ticker errors."""
+        self.errors = refresh(self.tickers, self.interval, max_age=0)
+        return self.errors
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.poll_s)
+
+    def start(self) -> "IntradayMonitor":
+        if self._thread is None or not self._thread.is_alive():
+            # Pin before looking the aggregator up again, in case it was evicted
+            # between construction and start
+            _pin((self.interval, self.window), True)
+            self.aggregator = get_aggregator(self.interval, self.window)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="intraday-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+            _pin((self.interval, self.window), False)
+
+    def snapshot(self) -> Dict[str, Optional[Dict[str, Any]]]:
+        return {ticker: self.aggregator.snapshot(ticker) for ticker in self.tickers}
+
+    def __enter__(self) -> "IntradayMonitor":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def _refresh_window(symbols: List[str], interval: str, window: int) -> Tuple[IntradayAggregator, Dict[str, str]]:
+    """Refresh the tickers into the shared aggregator for ``(interval, window)``; returns it and the refresh errors."""
+    aggregator = get_aggregator(interval, window)
+    # Tickers already tracked at this interval but new to this window size are
+    # seeded from a fresh download
+    for ticker in symbols:
+        if aggregator.snapshot(ticker) is None:
+            _refreshed.pop((ticker, interval), None)
+    return aggregator, refresh(symbols, interval)
+
+
+def intraday_fingerprint(tickers: List[str], interval: str = "1m", window: int = 60) -> Dict[str, Any]:
+    """
+    Stable stand-in for get_intraday_stats when validating cached responses.
+
+    Returns the time of each ticker's last completed bar, which changes once
+    per bar rather than with the forming bar on every refresh.
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+    aggregator, errors = _refresh_window(symbols, interval, int(window))
+    return {ticker: str(aggregator.last_time(ticker) or errors.get(ticker)) for ticker in symbols}
+
+
+@tool_output(table="ticker")
+def get_intraday_stats(tickers: List[str], interval: str = "1m", window: int = 60) -> Dict[str, Any]:
+    """
+    Get rolling intraday statistics for one or more stocks.
+
+    Reports high, low, VWAP, price change, total and average volume and
+    annualized realized volatility over the last ``window`` bars. Statistics
+    are kept incrementally between calls, so repeated calls during the session
+    are cheap; use this instead of get_historical_data for intraday monitoring.
+
+    Args:
+        tickers: List of stock ticker symbols (e.g., ['AAPL', 'MSFT'])
+        interval: Bar interval: '1m' (default), '2m', '5m', '15m', '30m', '60m', '90m' or '1h'
+        window: Number of most recent bars to aggregate (default: 60)
+
+    Returns:
+        Dictionary mapping each ticker to its rolling statistics, or an error.
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+    if not symbols:
+        return {"error": "Provide at least one ticker"}
+    if interval not in INTERVAL_MINUTES:
+        return {"error": f"Unsupported intraday interval '{interval}'; use one of: {', '.join(INTERVAL_MINUTES)}"}
+    window = int(window)
+    if not 2 <= window <= MAX_WINDOW:
+        return {"error": f"Window must be between 2 and {MAX_WINDOW} bars"}
+
+    aggregator, errors = _refresh_window(symbols, interval, window)
+
+    result: Dict[str, Any] = {}
+    for ticker in symbols:
+        stats = aggregator.snapshot(ticker)
+        if stats is not None:
+            result[ticker] = stats
+        else:
+            result[ticker] = {"error": f"Failed to fetch intraday data for {ticker}: {errors.get(ticker, 'No intraday data')}"}
+    return result
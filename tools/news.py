@@ -0,0 +1,315 @@
+"""De-duplicated multi-ticker news feed backed by a persistent seen-article index."""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+
+from tools.encoding import tool_output
+from tools.yfinance_tools import _fetch_concurrently, _fetch_news
+
+# Maximum articles kept in the index; the oldest-seen are forgotten first
+MAX_ARTICLES = int(os.getenv("NEWS_INDEX_MAX_ARTICLES", "5000"))
+
+# Maximum tickers per get_news_feed call
+MAX_TICKERS = 50
+
+
+def _parse_time(value: Any) -> Optional[int]:
+    """Return a publish time as epoch seconds (accepts epoch numbers and ISO-8601 strings)."""
+    if isinstance(value, (int, float)) and value > 0:
+        return int(value)
+    if isinstance(value, str) and value:
+        try:
+            return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+        except ValueError:
+            return None
+    return None
+
+
+def normalize_article(article: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Reduce a raw ``Ticker.news`` item to the fields the feed reports.
+
+    Handles both the flat layout of older yfinance releases and the nested
+    ``content`` layout of newer ones.
+
+    Returns:
+        Dictionary with id, title, publisher, link, published (epoch seconds),
+        type and related tickers, or None if the item has no title or link.
+    """
+    content = article.get("content")
+    if isinstance(content, dict):
+        link = (content.get("canonicalUrl") or {}).get("url") or (content.get("clickThroughUrl") or {}).get("url")
+        item = {
+            "uid": article.get("id") or content.get("id"),
+            "title": content.get("title"),
+            "publisher": (content.get("provider") or {}).get("displayName"),
+            "link": link,
+            "published": _parse_time(content.get("pubDate") or content.get("displayTime")),
+            "type": content.get("contentType"),
+        }
+    else:
+        item = {
+            "uid": article.get("uuid") or article.get("id"),
+            "title": article.get("title"),
+            "publisher": article.get("publisher"),
+            "link": article.get("link"),
+            "published": _parse_time(article.get("providerPublishTime")),
+            "type": article.get("type"),
+        }
+    if not item["title"] and not item["link"]:
+        return None
+    item["related"] = [t.upper() for t in article.get("relatedTickers") or [] if isinstance(t, str)]
+    item["id"] = article_id(item)
+    del item["uid"]
+    return item
+
+
+def article_id(item: Dict[str, Any]) -> str:
+    """
+    Return a stable id for an article.
+
+    Uses the provider's article id when present, otherwise the link without
+    its query string, otherwise the title and publisher; the same story
+    fetched for different tickers therefore maps to the same id.
+    """
+    if item.get("uid"):
+        source = f"uid:{item['uid']}"
+    elif item.get("link"):
+        source = "link:" + item["link"].split("?", 1)[0].rstrip("/").lower()
+    else:
+        source = f"title:{(item.get('title') or '').strip().lower()}|{(item.get('publisher') or '').strip().lower()}"
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+
+class NewsIndex:
+    """
+    Seen-article index shared by all news fetches.
+
+    Each article is stored once under its stable id together with the set of
+    tickers it was seen for, and gets a sequence number when first seen. The
+    highest sequence number is the feed cursor: ``since(cursor)`` returns
+    only articles first seen after it. With a ``path`` the index is persisted
+    as JSON so cursors stay valid across processes.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_articles: int = MAX_ARTICLES):
+        self.path = os.path.expanduser(path) if path else None
+        self.max_articles = max_articles
+        self._articles: Dict[str, Dict[str, Any]] = {}
+        self._seq = 0
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def cursor(self) -> int:
+        """Sequence number of the most recently added article (0 when empty)."""
+        with self._lock:
+            self._load()
+            return self._seq
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._articles)
+
+    def add(self, ticker: str, articles: Iterable[Dict[str, Any]]) -> int:
+        """
+        Record the raw articles fetched for a ticker.
+
+        Returns:
+            Number of articles not seen before.
+        """
+        return self.add_batch({ticker: articles})
+
+    def add_batch(self, fetched: Dict[str, Iterable[Dict[str, Any]]]) -> int:
+        """
+        Record the raw articles fetched for several tickers, saving the index once.
+
+        Args:
+            fetched: Dictionary mapping ticker to its raw ``Ticker.news`` list
+
+        Returns:
+            Number of articles not seen before.
+        """
+        added = 0
+        changed = False
+        with self._lock:
+            self._load()
+            for ticker, articles in fetched.items():
+                ticker = ticker.upper()
+                items = [item for item in map(normalize_article, articles) if item is not None]
+                # Oldest first, so newer stories get higher sequence numbers
+                items.sort(key=lambda item: item["published"] or 0)
+                for item in items:
+                    record = self._articles.get(item["id"])
+                    if record is None:
+                        self._seq += 1
+                        item["seq"] = self._seq
+                        item["tickers"] = list(dict.fromkeys([ticker] + item.pop("related")))
+                        self._articles[item["id"]] = item
+                        added += 1
+                        changed = True
+                    elif ticker not in record["tickers"]:
+                        record["tickers"].append(ticker)
+                        changed = True
+            # Articles are kept in the order they were first seen
+            for key in list(islice(self._articles, max(len(self._articles) - self.max_articles, 0))):
+                del self._articles[key]
+            if changed:
+                self._save()
+        return added
+
+    def since(self, cursor: Optional[int] = None, tickers: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Return the articles first seen after ``cursor``, newest first.
+
+        Args:
+            cursor: Cursor from an earlier call (None or 0 for all known articles)
+            tickers: Only articles covering at least one of these tickers
+        """
+        wanted = {t.upper() for t in tickers} if tickers is not None else None
+        with self._lock:
+            self._load()
+            found = [
+                dict(record, tickers=list(record["tickers"]))
+                for record in self._articles.values()
+                if record["seq"] > (cursor or 0) and (wanted is None or wanted.intersection(record["tickers"]))
+            ]
+        found.sort(key=lambda record: (record["published"] or 0, record["seq"]), reverse=True)
+        return found
+
+    def clear(self) -> None:
+        """Forget every article (the cursor keeps counting up so old cursors stay valid)."""
+        with self._lock:
+            self._load()
+            self._articles.clear()
+            self._save()
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path:
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._seq = int(data.get("seq", 0))
+        self._articles = {record["id"]: record for record in data.get("articles", [])}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump({"seq": self._seq, "articles": list(self._articles.values())}, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def _default_index() -> NewsIndex:
+    return NewsIndex(os.getenv("NEWS_INDEX_PATH") or None)
+
+
+# Shared index used by the news tools (kept in memory unless NEWS_INDEX_PATH is set)
+news_index = _default_index()
+
+
+def fetch_news(tickers: List[str], index: Optional[NewsIndex] = None) -> Dict[str, str]:
+    """
+    Fetch news for several tickers concurrently and record it in the index.
+
+    Each ticker's list goes through the shared market data cache, so tickers
+    fetched within the news TTL cost no upstream request.
+
+    Returns:
+        Dictionary mapping ticker to an error message for the tickers whose
+        news could not be fetched.
+    """
+    index = index or news_index
+    results = _fetch_concurrently(_fetch_news, [t.upper() for t in tickers])
+    index.add_batch({ticker: articles or [] for ticker, articles in results.items() if not isinstance(articles, Exception)})
+    return {ticker: str(error) for ticker, error in results.items() if isinstance(error, Exception)}
+
+
+def news_fingerprint(tickers: List[str], since: Optional[int] = None, max_news: int = 20) -> Dict[str, Any]:
+    """
+    Stable stand-in for get_news_feed when validating cached responses.
+
+    Returns the sorted article ids currently listed for each ticker. Unlike the
+    tool it neither records articles in the index nor depends on the global
+    cursor, so news fetched for other tickers doesn't change it.
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+    results = _fetch_concurrently(_fetch_news, symbols)
+    fingerprint: Dict[str, Any] = {}
+    for ticker, articles in results.items():
+        if isinstance(articles, Exception):
+            fingerprint[ticker] = {"error": str(articles)}
+        else:
+            fingerprint[ticker] = sorted(item["id"] for item in map(normalize_article, articles or []) if item is not None)
+    return fingerprint
+
+
+@tool_output(drop=("id", "link", "type"))
+def get_news_feed(tickers: List[str], since: Optional[int] = None, max_news: int = 20) -> Dict[str, Any]:
+    """
+    Get de-duplicated latest news for several stocks in one call.
+
+    A story covering more than one of the tickers is listed once, with all the
+    tickers it covers. Pass the returned cursor as ``since`` on a later call to
+    get only articles that have appeared since then.
+
+    Args:
+        tickers: List of stock ticker symbols (e.g., ['AAPL', 'MSFT', 'NVDA'])
+        since: Cursor returned by an earlier call; omit for the latest articles
+        max_news: Maximum number of articles to return, newest first (default: 20)
+
+    Returns:
+        Dictionary with the new cursor, the number of matching articles and the
+        articles with title, publisher, link, publish time and tickers.
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+    if not symbols:
+        return {"error": "Provide at least one ticker"}
+    if len(symbols) > MAX_TICKERS:
+        return {"error": f"Request news for at most {MAX_TICKERS} tickers at once"}
+
+    errors = fetch_news(symbols)
+    if len(errors) == len(symbols):
+        return {"error": f"Failed to fetch news for {', '.join(symbols)}: {next(iter(errors.values()))}"}
+
+    # Bound the page by the cursor read first, so articles added by a
+    # concurrent fetch are left for the next call rather than skipped
+    cursor = news_index.cursor
+    found = [record for record in news_index.since(since, symbols) if record["seq"] <= cursor]
+    articles = []
+    for record in found[:max(1, int(max_news))]:
+        articles.append({
+            "id": record["id"],
+            "title": record["title"] or "N/A",
+            "publisher": record["publisher"] or "N/A",
+            "link": record["link"] or "N/A",
+            "publish_time": datetime.fromtimestamp(record["published"]).strftime("%Y-%m-%d %H:%M:%S") if record["published"] else "N/A",
+            "type": record["type"] or "N/A",
+            "tickers": [t for t in record["tickers"] if t in symbols] + [t for t in record["tickers"] if t not in symbols],
+        })
+
+    result: Dict[str, Any] = {"cursor": cursor, "total": len(found), "articles": articles}
+    if errors:
+        result["errors"] = {ticker: f"Failed to fetch news: {message}" for ticker, message in errors.items()}
+    return result
@@ -0,0 +1,283 @@
+"""Incremental on-disk OHLCV store backing the historical data tools."""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# One row per bar; timestamps are exchange wall-clock time in nanoseconds
+BAR_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+])
+
+# Intervals persisted to disk; intraday bars only go through the TTL cache
+STORE_INTERVALS = ("1d", "5d", "1wk", "1mo", "3mo")
+
+_COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+_MAX_COVERAGE = int(np.iinfo(np.int64).min)
+_PERIOD_RE = re.compile(r"^(\d+)(d|mo|y)$")
+
+# Relative difference between a stored close and the re-downloaded close of the
+# same completed bar that means prices were re-adjusted (split or dividend)
+_ADJUSTMENT_RTOL = 1e-6
+
+
+def _period_start(period: str, now: pd.Timestamp) -> Optional[pd.Timestamp]:
+    """
+    Translate a yfinance calendar period into the first timestamp it covers.
+
+    Returns:
+        Start timestamp, or None for 'max'. Day periods ('5d') are counted in
+        bars rather than calendar days and are handled by the caller.
+    """
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=now.year, month=1, day=1)
+    match = _PERIOD_RE.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period}")
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "mo":
+        return (now - pd.DateOffset(months=count)).normalize()
+    if unit == "y":
+        return (now - pd.DateOffset(years=count)).normalize()
+    return (now - pd.Timedelta(days=count)).normalize()
+
+
+def _day_bars(period: str) -> Optional[int]:
+    """Return N for 'Nd' periods, which select the last N bars."""
+    match = _PERIOD_RE.match(period)
+    if match and match.group(2) == "d":
+        return int(match.group(1))
+    return None
+
+
+def frame_to_bars(frame: pd.DataFrame) -> np.ndarray:
+    """
+    Convert a yfinance OHLCV frame into a structured bar array.
+
+    Timezone-aware indexes are reduced to exchange wall-clock time so that bars
+    from ``Ticker.history`` and ``yf.download`` line up.
+    """
+    frame = frame.dropna(subset=["Close"])
+    index = frame.index
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)
+    bars = np.empty(len(frame), dtype=BAR_DTYPE)
+    bars["ts"] = index.values.astype("datetime64[ns]").view("i8")
+    for field, column in _COLUMNS.items():
+        bars[field] = frame[column].to_numpy(dtype=np.float64) if column in frame else np.nan
+    return bars
+
+
+def bars_to_frame(bars: np.ndarray) -> pd.DataFrame:
+    """Convert a structured bar array back into an OHLCV DataFrame."""
+    return pd.DataFrame(
+        {column: np.asarray(bars[field]) for field, column in _COLUMNS.items()},
+        index=pd.DatetimeIndex(np.asarray(bars["ts"]).astype("datetime64[ns]"), name="Date"),
+    )
+
+
+def _readjusted(old: Optional[np.ndarray], new: np.ndarray) -> bool:
+    """
+    Return True if bars in both arrays disagree on a completed bar's close.
+
+    Prices are split- and dividend-adjusted, so after a corporate action every
+    bar before it changes scale. The last stored bar is left out because it
+    may have been stored while still forming.
+    """
+    if old is None or len(old) < 2 or len(new) == 0:
+        return False
+    completed = np.asarray(old[:-1])
+    _, old_rows, new_rows = np.intersect1d(completed["ts"], new["ts"], return_indices=True)
+    if not len(old_rows):
+        return False
+    return not np.allclose(completed["close"][old_rows], new["close"][new_rows], rtol=_ADJUSTMENT_RTOL, atol=0, equal_nan=True)
+
+
+def _merge(old: Optional[np.ndarray], new: np.ndarray) -> np.ndarray:
+    """Union two bar arrays by timestamp; bars in ``new`` replace stored ones."""
+    if old is None or len(old) == 0:
+        combined = new
+    else:
+        combined = np.concatenate([np.asarray(old), new])
+    combined = combined[np.argsort(combined["ts"], kind="stable")]
+    if len(combined) < 2:
+        return combined
+    keep = np.append(combined["ts"][1:] != combined["ts"][:-1], True)
+    return combined[keep]
+
+
+class OHLCVStore:
+    """
+    Columnar price store keyed by (ticker, interval).
+
+    Each series lives in ``<root>/<interval>/<TICKER>.npy`` with a JSON sidecar
+    recording how far back it is complete and when it was last refreshed.
+    Reads are memory-mapped, so serving ``period="max"`` from disk is cheap;
+    callers fetch only the missing tail and merge it in. Tails start at the
+    second-to-last stored bar so each one overlaps a completed bar; if that
+    bar's price changed, the series was re-adjusted and is fetched again in
+    full rather than stitched onto history on the old scale.
+    """
+
+    def __init__(self, root: str, refresh_seconds: float = 300.0):
+        self.root = os.path.expanduser(root)
+        self.refresh_seconds = refresh_seconds
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def plan(self, ticker: str, period: str, interval: str) -> Tuple[str, Optional[str]]:
+        """
+        Decide what has to be fetched to answer a request.
+
+        Returns:
+            ("fresh", None) if the stored series can answer as-is,
+            ("tail", "YYYY-MM-DD") if only bars since that date are needed
+            (pass the result to ``update`` with ``full=False``), or
+            ("full", None) if the whole period must be downloaded.
+        """
+        bars, meta = self._load(ticker, interval)
+        if bars is None or len(bars) == 0:
+            return "full", None
+
+        day_bars = _day_bars(period)
+        if day_bars is not None:
+            covered = len(bars) >= day_bars or meta.get("covered_from") == _MAX_COVERAGE
+        else:
+            start = _period_start(period, pd.Timestamp.now())
+            covered_from = meta.get("covered_from")
+            covered = covered_from is not None and (
+                covered_from == _MAX_COVERAGE or (start is not None and covered_from <= start.value)
+            )
+        if not covered:
+            return "full", None
+
+        if time.time() - meta.get("fetched_at", 0) < self.refresh_seconds:
+            return "fresh", None
+        # Include one completed bar to check the stored prices against
+        overlap = pd.Timestamp(int(bars["ts"][-2 if len(bars) > 1 else -1]))
+        return "tail", overlap.strftime("%Y-%m-%d")
+
+    def update(self, ticker: str, period: str, interval: str, frame: pd.DataFrame, full: bool) -> bool:
+        """
+        Merge freshly downloaded bars into the stored series.
+
+        Args:
+            ticker: Stock ticker symbol
+            period: Period the request was for
+            interval: Bar interval
+            frame: OHLCV frame returned by yfinance
+            full: Whether ``frame`` covers the whole period (vs. only the tail)
+
+        Returns:
+            True, or False if a tail shows the stored prices were re-adjusted
+            since they were stored; the series is then dropped and the caller
+            should fetch the full period.
+        """
+        with self._lock(ticker, interval):
+            return self._update(ticker, period, interval, frame, full)
+
+    def _update(self, ticker: str, period: str, interval: str, frame: pd.DataFrame, full: bool) -> bool:
+        bars, meta = self._load(ticker, interval)
+        new = frame_to_bars(frame) if not frame.empty else np.empty(0, dtype=BAR_DTYPE)
+        if _readjusted(bars, new):
+            if not full:
+                self._delete(ticker, interval)
+                return False
+            # A full download replaces history stored on the old scale
+            bars, meta = None, {}
+        merged = _merge(bars, new)
+
+        if full:
+            if period == "max":
+                covered_from = _MAX_COVERAGE
+            elif _day_bars(period) is not None:
+                covered_from = int(new["ts"][0]) if len(new) else None
+            else:
+                covered_from = _period_start(period, pd.Timestamp.now()).value
+            previous = meta.get("covered_from")
+            if covered_from is None or (previous is not None and previous < covered_from):
+                covered_from = previous
+            meta["covered_from"] = covered_from
+        meta["fetched_at"] = time.time()
+        self._save(ticker, interval, merged, meta)
+        return True
+
+    def read(self, ticker: str, period: str, interval: str) -> pd.DataFrame:
+        """
+        Read the bars for a period from disk.
+
+        Returns:
+            OHLCV DataFrame indexed by bar date (empty if nothing is stored).
+        """
+        bars, _ = self._load(ticker, interval)
+        if bars is None:
+            return bars_to_frame(np.empty(0, dtype=BAR_DTYPE))
+
+        day_bars = _day_bars(period)
+        if day_bars is not None:
+            return bars_to_frame(bars[-day_bars:])
+        start = _period_start(period, pd.Timestamp.now())
+        if start is None:
+            return bars_to_frame(bars)
+        first = int(np.searchsorted(bars["ts"], start.value, side="left"))
+        return bars_to_frame(bars[first:])
+
+    def _lock(self, ticker: str, interval: str) -> threading.Lock:
+        key = (ticker.upper(), interval)
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _paths(self, ticker: str, interval: str) -> Tuple[str, str]:
+        base = os.path.join(self.root, interval, ticker.upper().replace("/", "_"))
+        return base + ".npy", base + ".json"
+
+    def _load(self, ticker: str, interval: str) -> Tuple[Optional[np.ndarray], Dict[str, Any]]:
+        data_path, meta_path = self._paths(ticker, interval)
+        try:
+            bars = np.load(data_path, mmap_mode="r")
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None, {}
+        return bars, meta
+
+    def _delete(self, ticker: str, interval: str) -> None:
+        for path in self._paths(ticker, interval):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _save(self, ticker: str, interval: str, bars: np.ndarray, meta: Dict[str, Any]) -> None:
+        data_path, meta_path = self._paths(ticker, interval)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        tmp_data, tmp_meta = data_path + ".tmp", meta_path + ".tmp"
+        with open(tmp_data, "wb") as f:
+            np.save(f, np.ascontiguousarray(bars))
+        with open(tmp_meta, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_data, data_path)
+        os.replace(tmp_meta, meta_path)
+
+
+def _default_store() -> Optional[OHLCVStore]:
+    root = os.getenv("OHLCV_STORE_DIR")
+    return OHLCVStore(root) if root else None
+
+
+# Shared store used by the Yfinance tools (None unless OHLCV_STORE_DIR is set)
+ohlcv_store = _default_store()
@@ -0,0 +1,447 @@
+"""Vectorized portfolio risk and allocation analytics (covariance, VaR/CVaR, optimized weights)."""
+
+import os
+import threading
+from collections import OrderedDict
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tools.encoding import tool_output
+from tools.technical_indicators import TRADING_DAYS, _ffill, _stack
+from tools.yfinance_tools import _fetch_history_batch
+
+# Minimum overlapping daily returns needed to estimate a covariance matrix
+MIN_OBSERVATIONS = 60
+
+# Above this many assets, correlations are summarized instead of listed in full
+MAX_CORRELATION_MATRIX = 10
+
+# Weights listed per allocation; the remainder is reported as one total
+MAX_LISTED_WEIGHTS = 20
+
+# Return windows (one per set of tickers and period) whose covariance is kept up to date
+MAX_TRACKED_WINDOWS = int(os.getenv("PORTFOLIO_TRACKED_WINDOWS", "32"))
+
+
+def returns_matrix(close: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Daily simple returns over the period every asset has prices for.
+
+    Args:
+        close: Forward-filled closing prices, shape (T, N); leading NaNs mark
+            shorter histories
+
+    Returns:
+        Tuple of (returns of shape (T', N), index of the first row of ``close`` used).
+    """
+    first = int(np.argmax(~np.isnan(close), axis=0).max()) if close.size else 0
+    prices = close[first:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = prices[1:] / prices[:-1] - 1
+    return np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0), first
+
+
+def covariance_matrix(
+    returns: np.ndarray,
+    shrink: bool = True,
+    tracker: Optional["CovarianceTracker"] = None,
+) -> Tuple[np.ndarray, float]:
+    """
+    Estimate the covariance of asset returns.
+
+    With ``shrink`` the sample covariance is shrunk towards a scaled identity
+    with the Ledoit-Wolf intensity, which keeps the matrix well conditioned
+    (and invertible) when there are many assets relative to observations.
+
+    Args:
+        returns: Returns of shape (T, N)
+        shrink: Apply Ledoit-Wolf shrinkage (default: True)
+        tracker: Tracker holding exactly these returns; its running moments
+            replace the O(T N^2) sample covariance product
+
+    Returns:
+        Tuple of (N x N covariance per period, shrinkage intensity in [0, 1]).
+    """
+    observations, assets = returns.shape
+    if tracker is not None and tracker.count == observations:
+        mean = tracker.mean
+        sample = tracker.covariance * ((observations - 1) / observations)
+        centered = returns - mean
+    else:
+        centered = returns - returns.mean(axis=0)
+        sample = centered.T @ centered / observations
+    if not shrink or observations < 2:
+        return sample * observations / max(observations - 1, 1), 0.0
+
+    target = np.trace(sample) / assets
+    distance = np.sum((sample - target * np.eye(assets)) ** 2)
+    if distance == 0:
+        return sample, 0.0
+    squared_norms = np.sum(centered ** 2, axis=1)
+    spread = (np.sum(squared_norms ** 2) / observations - np.sum(sample ** 2)) / observations
+    intensity = float(min(max(spread / distance, 0.0), 1.0))
+    return intensity * target * np.eye(assets) + (1 - intensity) * sample, intensity
+
+
+def correlation_matrix(cov: np.ndarray) -> np.ndarray:
+    """Convert a covariance matrix to a correlation matrix."""
+    std = np.sqrt(np.diag(cov))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(std, std)
+    np.fill_diagonal(corr, 1.0)
+    return np.nan_to_num(corr)
+
+
+def _solve_long_only(cov: np.ndarray, target: np.ndarray, long_only: bool) -> np.ndarray:
+    """
+    Weights proportional to ``cov^-1 @ target``, normalized to sum to one.
+
+    With ``long_only``, assets that come out short are dropped and the system
+    is solved again on the rest until every weight is non-negative.
+    """
+    active = np.ones(cov.shape[0], dtype=bool)
+    weights = np.zeros(cov.shape[0])
+    for _ in range(cov.shape[0]):
+        sub = cov[np.ix_(active, active)]
+        try:
+            raw = np.linalg.solve(sub, target[active])
+        except np.linalg.LinAlgError:
+            raw = np.linalg.lstsq(sub, target[active], rcond=None)[0]
+        weights = np.zeros(cov.shape[0])
+        total = raw.sum()
+        if total <= 0:
+            break
+        weights[active] = raw / total
+        if not long_only or (weights >= 0).all():
+            return weights
+        active &= weights > 0
+        if not active.any():
+            break
+    weights = np.clip(weights, 0, None)
+    if weights.sum() <= 0:
+        return np.full(cov.shape[0], 1.0 / cov.shape[0])
+    return weights / weights.sum()
+
+
+def min_variance_weights(cov: np.ndarray, long_only: bool = True) -> np.ndarray:
+    """Global minimum-variance weights (fully invested, optionally long-only)."""
+    return _solve_long_only(cov, np.ones(cov.shape[0]), long_only)
+
+
+def max_sharpe_weights(cov: np.ndarray, mean: np.ndarray, long_only: bool = True) -> np.ndarray:
+    """
+    Mean-variance (tangency) weights that maximize expected return per unit of risk.
+
+    Falls back to minimum-variance weights when no asset has a positive expected return.
+    """
+    if not (mean > 0).any():
+        return min_variance_weights(cov, long_only)
+    return _solve_long_only(cov, mean, long_only)
+
+
+def risk_parity_weights(cov: np.ndarray, tol: float = 1e-10, max_iter: int = 100) -> np.ndarray:
+    """
+    Equal-risk-contribution weights.
+
+    Solves ``cov @ y = 1 / y`` for positive ``y`` with Newton's method (the
+    optimality condition of ``0.5 y'Σy - sum(log y)``), so every asset
+    contributes the same share of portfolio variance; usually converges in a
+    handful of iterations even for hundreds of assets.
+    """
+    y = 1 / np.sqrt(np.maximum(np.diag(cov), 1e-18))
+    for _ in range(max_iter):
+        gradient = cov @ y - 1 / y
+        if np.max(np.abs(gradient * y)) < tol:
+            break
+        step = np.linalg.solve(cov + np.diag(1 / y ** 2), gradient)
+        scale = 1.0
+        while np.any(y - scale * step <= 0):
+            scale /= 2
+        y = y - scale * step
+    return y / y.sum()
+
+
+def value_at_risk(portfolio_returns: np.ndarray, confidence: float = 0.95) -> Dict[str, float]:
+    """
+    One-period value at risk and conditional value at risk (expected shortfall).
+
+    Args:
+        portfolio_returns: Historical portfolio returns per period
+        confidence: Confidence level (e.g., 0.95 or 0.99)
+
+    Returns:
+        Historical and parametric (normal) VaR and CVaR as positive loss fractions.
+    """
+    cutoff = np.quantile(portfolio_returns, 1 - confidence)
+    tail = portfolio_returns[portfolio_returns <= cutoff]
+    mean, std = float(portfolio_returns.mean()), float(portfolio_returns.std(ddof=1))
+    z = NormalDist().inv_cdf(confidence)
+    return {
+        "var_historical": float(-cutoff),
+        "cvar_historical": float(-tail.mean()) if tail.size else float(-cutoff),
+        "var_parametric": -mean + z * std,
+        "cvar_parametric": -mean + std * NormalDist().pdf(z) / (1 - confidence),
+    }
+
+
+class CovarianceTracker:
+    """
+    Running mean and covariance of asset returns, updated as new bars arrive.
+
+    Batches of returns are merged in O(k N^2) with the parallel form of
+    Welford's algorithm, so the covariance never has to be recomputed from the
+    full history. ``remove`` reverses an update, which turns the tracker into a
+    rolling window (drop the oldest bars as new ones are added).
+
+    Args:
+        assets: Number of assets (columns of every update)
+    """
+
+    def __init__(self, assets: int):
+        self.count = 0
+        self.mean = np.zeros(assets)
+        self._m2 = np.zeros((assets, assets))
+
+    @staticmethod
+    def _batch(returns: Any) -> Tuple[int, np.ndarray, np.ndarray]:
+        x = np.atleast_2d(np.asarray(returns, dtype=np.float64))
+        if x.shape[0] == 0:
+            return 0, np.zeros(x.shape[1]), np.zeros((x.shape[1], x.shape[1]))
+        mean = x.mean(axis=0)
+        centered = x - mean
+        return x.shape[0], mean, centered.T @ centered
+
+    def update(self, returns: Any) -> None:
+        """Add one bar (shape (N,)) or a batch of bars (shape (k, N))."""
+        k, batch_mean, batch_m2 = self._batch(returns)
+        if k == 0:
+            return
+        total = self.count + k
+        delta = batch_mean - self.mean
+        self._m2 += batch_m2 + np.outer(delta, delta) * (self.count * k / total)
+        self.mean += delta * (k / total)
+        self.count = total
+
+    def remove(self, returns: Any) -> None:
+        """Remove bars previously added with ``update`` (e.g., the oldest bars of a rolling window)."""
+        k, batch_mean, batch_m2 = self._batch(returns)
+        if k == 0:
+            return
+        if k >= self.count:
+            self.count, self.mean, self._m2 = 0, np.zeros_like(self.mean), np.zeros_like(self._m2)
+            return
+        remaining = self.count - k
+        rest_mean = (self.count * self.mean - k * batch_mean) / remaining
+        delta = batch_mean - rest_mean
+        self._m2 -= batch_m2 + np.outer(delta, delta) * (remaining * k / self.count)
+        self.mean = rest_mean
+        self.count = remaining
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """Sample covariance of the bars seen so far."""
+        return self._m2 / max(self.count - 1, 1)
+
+    @property
+    def correlation(self) -> np.ndarray:
+        """Correlation of the bars seen so far."""
+        return correlation_matrix(self.covariance)
+
+    def copy(self) -> "CovarianceTracker":
+        """Independent snapshot of the tracker."""
+        snapshot = CovarianceTracker(len(self.mean))
+        snapshot.count, snapshot.mean, snapshot._m2 = self.count, self.mean.copy(), self._m2.copy()
+        return snapshot
+
+
+# Tracked return windows by (tickers, period): row dates, returns and their running moments
+_windows: "OrderedDict[Tuple[Tuple[str, ...], str], Tuple[np.ndarray, np.ndarray, CovarianceTracker]]" = OrderedDict()
+_windows_lock = threading.Lock()
+
+
+def tracked_covariance(key: Tuple[Tuple[str, ...], str], dates: np.ndarray, returns: np.ndarray) -> CovarianceTracker:
+    """
+    Bring the tracker of a return window up to date and return a snapshot of it.
+
+    Compared with the rows tracked for ``key`` last time, only rows that are
+    new, that fell out of the window or whose returns changed (such as the
+    forming bar) are folded in or out. A window sharing less than half its
+    rows with the tracked one is rebuilt from scratch. The least recently used
+    windows beyond ``MAX_TRACKED_WINDOWS`` are dropped.
+
+    Args:
+        key: Window identity, e.g. ``(tuple(tickers), period)``
+        dates: Row timestamps of ``returns``, shape (T,)
+        returns: Returns of shape (T, N)
+    """
+    with _windows_lock:
+        window = _windows.pop(key, None)
+        tracker = None
+        if window is not None and window[1].shape[1] == returns.shape[1]:
+            old_dates, old_returns, tracker = window
+            _, old_rows, new_rows = np.intersect1d(old_dates, dates, assume_unique=True, return_indices=True)
+            same = (old_returns[old_rows] == returns[new_rows]).all(axis=1)
+            if 2 * same.sum() >= len(dates):
+                dropped = np.ones(len(old_dates), dtype=bool)
+                dropped[old_rows[same]] = False
+                added = np.ones(len(dates), dtype=bool)
+                added[new_rows[same]] = False
+                tracker.remove(old_returns[dropped])
+                tracker.update(returns[added])
+            else:
+                tracker = None
+        if tracker is None:
+            tracker = CovarianceTracker(returns.shape[1])
+            tracker.update(returns)
+        _windows[key] = (dates, returns, tracker)
+        while len(_windows) > MAX_TRACKED_WINDOWS:
+            _windows.popitem(last=False)
+        return tracker.copy()
+
+
+def _listed_weights(names: List[str], weights: np.ndarray) -> Dict[str, Any]:
+    order = np.argsort(-weights, kind="stable")
+    listed = {names[i]: float(weights[i] * 100) for i in order[:MAX_LISTED_WEIGHTS] if weights[i] >= 0.0005}
+    rest = float(weights[order[MAX_LISTED_WEIGHTS:]].sum() * 100) if len(names) > MAX_LISTED_WEIGHTS else 0.0
+    if rest > 0:
+        listed[f"{len(names) - MAX_LISTED_WEIGHTS} others"] = rest
+    return listed
+
+
+def _profile(weights: np.ndarray, cov: np.ndarray, mean: np.ndarray, returns: np.ndarray, confidence: float) -> Dict[str, Any]:
+    """Annualized return/volatility, Sharpe ratio, diversification ratio and VaR/CVaR of a weight vector."""
+    variance = float(weights @ cov @ weights)
+    volatility = np.sqrt(max(variance, 0.0))
+    annual_return = float(weights @ mean) * TRADING_DAYS
+    annual_volatility = volatility * np.sqrt(TRADING_DAYS)
+    stand_alone = float(weights @ np.sqrt(np.diag(cov)))
+    risk = value_at_risk(returns @ weights, confidence)
+    return {
+        "expected_annual_return_percent": annual_return * 100,
+        "annual_volatility_percent": annual_volatility * 100,
+        "sharpe_ratio": annual_return / annual_volatility if annual_volatility else "N/A",
+        "diversification_ratio": stand_alone / volatility if volatility else "N/A",
+        **{f"{name}_1d_percent": value * 100 for name, value in risk.items()},
+    }
+
+
+@tool_output()
+def analyze_portfolio(
+    tickers: List[str],
+    weights: Optional[List[float]] = None,
+    period: str = "1y",
+    confidence: float = 0.95,
+) -> Dict[str, Any]:
+    """
+    Analyze portfolio risk and suggest allocations from historical returns.
+
+    Builds the return and covariance matrices for all tickers, then reports
+    the risk of the given (or equal) weights - volatility, Sharpe ratio,
+    1-day VaR/CVaR, each asset's share of portfolio risk - together with
+    long-only minimum-variance, maximum-Sharpe and risk-parity weights and
+    the correlations between the assets. Use it to size positions.
+
+    Args:
+        tickers: Stock ticker symbols in the portfolio (e.g., ['AAPL', 'MSFT', 'JNJ'])
+        weights: Current weights in the same order as tickers (default: equal weights)
+        period: History window to estimate from (default: '1y')
+        confidence: VaR/CVaR confidence level (default: 0.95)
+
+    Returns:
+        Dictionary with the current portfolio's risk profile, per-asset risk
+        contributions, suggested allocations and correlation data.
+    """
+    names = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+    if len(names) < 2:
+        return {"error": "Provide at least two tickers"}
+    if weights is not None and len(weights) != len(tickers):
+        return {"error": f"Got {len(weights)} weights for {len(tickers)} tickers"}
+    if not 0.5 < confidence < 1:
+        return {"error": "confidence must be between 0.5 and 1 (e.g., 0.95)"}
+    given = None
+    if weights is not None:
+        given = {t.strip().upper(): float(w) for t, w in zip(tickers, weights)}
+
+    histories = _fetch_history_batch(names, period=period)
+    frames = {}
+    excluded: Dict[str, str] = {}
+    for ticker in names:
+        hist = histories.get(ticker)
+        if isinstance(hist, Exception):
+            excluded[ticker] = f"Failed to fetch data: {str(hist)}"
+        elif hist is None or len(hist) <= MIN_OBSERVATIONS:
+            excluded[ticker] = f"Fewer than {MIN_OBSERVATIONS} days of history"
+        else:
+            frames[ticker] = hist
+    if len(frames) < 2:
+        return {"error": "Not enough price history for at least two tickers", "excluded": excluded}
+
+    try:
+        aligned = _stack(frames, "Close")
+        close = _ffill(aligned.to_numpy(dtype=np.float64))
+        returns, first = returns_matrix(close)
+        if returns.shape[0] < MIN_OBSERVATIONS:
+            return {"error": f"Only {returns.shape[0]} overlapping days of history; need {MIN_OBSERVATIONS}", "excluded": excluded}
+        names = list(frames)
+        mean = returns.mean(axis=0)
+        tracker = tracked_covariance((tuple(names), period), aligned.index[first + 1:].asi8, returns)
+        cov, shrinkage = covariance_matrix(returns, tracker=tracker)
+        current = np.array([given.get(t, 0.0) for t in names]) if given else np.ones(len(names))
+        if current.sum() <= 0:
+            return {"error": "Weights must sum to a positive number"}
+        current = current / current.sum()
+
+        allocations = {
+            "min_variance": min_variance_weights(cov),
+            "max_sharpe": max_sharpe_weights(cov, mean),
+            "risk_parity": risk_parity_weights(cov),
+        }
+        corr = correlation_matrix(cov)
+    except Exception as e:
+        return {"error": f"Failed to analyze portfolio: {str(e)}"}
+
+    marginal = cov @ current
+    contributions = current * marginal / float(current @ marginal)
+    volatility = np.sqrt(np.diag(cov) * TRADING_DAYS) * 100
+
+    result: Dict[str, Any] = {
+        "tickers": names,
+        "start_date": aligned.index[first].strftime("%Y-%m-%d"),
+        "end_date": aligned.index[-1].strftime("%Y-%m-%d"),
+        "observations": int(returns.shape[0]),
+        "confidence": confidence,
+        "covariance_shrinkage": shrinkage,
+        "current_portfolio": {
+            "weights_percent": _listed_weights(names, current),
+            **_profile(current, cov, mean, returns, confidence),
+        },
+        "assets": {
+            names[i]: {
+                "annual_volatility_percent": float(volatility[i]),
+                "expected_annual_return_percent": float(mean[i] * TRADING_DAYS * 100),
+                "risk_contribution_percent": float(contributions[i] * 100),
+            }
+            for i in np.argsort(-contributions, kind="stable")[:MAX_LISTED_WEIGHTS]
+        },
+        "suggested_allocations": {
+            name: {"weights_percent": _listed_weights(names, w), **_profile(w, cov, mean, returns, confidence)}
+            for name, w in allocations.items()
+        },
+    }
+
+    upper = np.triu_indices(len(names), k=1)
+    pairs = corr[upper]
+    if len(names) <= MAX_CORRELATION_MATRIX:
+        result["correlation"] = {a: {b: float(corr[i, j]) for j, b in enumerate(names) if j != i} for i, a in enumerate(names)}
+    else:
+        order = np.argsort(-pairs, kind="stable")
+        result["correlation"] = {
+            "average": float(pairs.mean()),
+            "most_correlated": [[names[upper[0][k]], names[upper[1][k]], float(pairs[k])] for k in order[:5]],
+            "least_correlated": [[names[upper[0][k]], names[upper[1][k]], float(pairs[k])] for k in order[::-1][:5]],
+        }
+    if excluded:
+        result["excluded"] = excluded
+    return result
@@ -0,0 +1,412 @@
+"""
+Market data providers behind the Yfinance tools.
+
+The tools never talk to a data source directly; they ask the current provider
+(see ``get_provider``/``set_provider``). ``YFinanceProvider`` fetches live data
+and is the default. ``SnapshotProvider`` answers every call from a universe
+loaded once into memory, so a whole batch of analyses can be pinned to the same
+market snapshot (e.g., one end-of-day close) with no I/O per tool call.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _yf():
+    """Import yfinance on first use; it pulls in pandas and NumPy, which dominate startup time."""
+    import yfinance
+
+    return yfinance
+
+
+def _split_download(data, tickers: List[str]) -> Dict[str, Any]:
+    """Split a ``yf.download(group_by='ticker')`` frame into per-ticker frames."""
+    import pandas as pd
+
+    frames = {}
+    for ticker in tickers:
+        if isinstance(data.columns, pd.MultiIndex):
+            hist = data[ticker] if ticker in data.columns.get_level_values(0) else pd.DataFrame()
+        else:
+            hist = data
+        frames[ticker] = hist.dropna(how="all")
+    return frames
+
+
+class _DownloadErrors(logging.Handler):
+    """
+    Collects the per-ticker errors ``yf.download`` logs in the calling thread.
+
+    yf.download catches each ticker's exception (rate limits included), returns
+    an empty frame in its place and only logs the error, as
+    ``"['AAPL', 'MSFT']: YFRateLimitError('Too Many Requests...')"``, from the
+    thread that called it; records from other threads are ignored, so
+    concurrent downloads don't see each other's errors.
+    """
+
+    _LINE = re.compile(r"^\s*\[(.*?)\]: (.*)$", re.DOTALL)
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.thread = threading.get_ident()
+        self.errors: Dict[str, str] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.thread != self.thread:
+            return
+        match = self._LINE.match(record.getMessage())
+        if match:
+            for ticker in re.findall(r"'([^']+)'", match.group(1)):
+                self.errors[ticker.upper()] = match.group(2).strip()
+
+
+def _retryable_download_error(ticker: str, message: str) -> Optional[Exception]:
+    """Return the exception for a throttled or transient per-ticker download error, or None for other errors."""
+    from tools.scheduler import is_throttled
+
+    error = RuntimeError(f"{ticker}: {message}")
+    if is_throttled(error):
+        return error
+    if "Timeout" in message or "ConnectionError" in message:
+        return ConnectionError(f"{ticker}: {message}")
+    return None
+
+
+class MarketDataProvider:
+    """
+    Interface for market data sources used by the tools.
+
+    Providers with ``local = True`` answer from memory without I/O; their
+    results skip the market data cache, the on-disk OHLCV store and the fetch
+    thread pool.
+    """
+
+    name = "base"
+    local = False
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        """Return the ``yf.Ticker.info``-style dict for a ticker."""
+        raise NotImplementedError
+
+    def news(self, ticker: str) -> List[Dict[str, Any]]:
+        """Return the ``yf.Ticker.news``-style article list for a ticker."""
+        raise NotImplementedError
+
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d", start: Optional[str] = None):
+        """
+        Return an OHLCV DataFrame for a ticker.
+
+        Args:
+            ticker: Stock ticker symbol
+            period: Time period (e.g., '5d', '3mo', '1y'); ignored when ``start`` is given
+            interval: Bar interval (e.g., '1d', '1wk', '5m')
+            start: First date to include ('YYYY-MM-DD')
+        """
+        raise NotImplementedError
+
+    def download(self, tickers: List[str], period: str = "1mo", interval: str = "1d", start: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return OHLCV DataFrames for several tickers.
+
+        Providers that support bulk requests override this; the default fetches
+        each ticker in turn. A ticker that could not be fetched (e.g., still
+        rate-limited after retries) maps to the exception instead of a frame.
+        """
+        return {ticker: self.history(ticker, period=period, interval=interval, start=start) for ticker in tickers}
+
+
+def _scheduled(host: str, func: Any, *args: Any, cost: float = 1.0, **kwargs: Any) -> Any:
+    """Run an upstream request through the shared request scheduler."""
+    from tools.scheduler import request_scheduler
+
+    return request_scheduler.call(host, func, *args, cost=cost, **kwargs)
+
+
+class YFinanceProvider(MarketDataProvider):
+    """
+    Live data from Yahoo Finance through yfinance (the default provider).
+
+    Every request goes through ``tools.scheduler.request_scheduler``, which
+    rate-limits, retries and sheds requests per Yahoo host.
+    """
+
+    name = "yfinance"
+
+    # Yahoo hosts serving each kind of request (one circuit breaker per host)
+    QUOTE_HOST = "query2.finance.yahoo.com"
+    NEWS_HOST = "finance.yahoo.com"
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        return _scheduled(self.QUOTE_HOST, lambda: _yf().Ticker(ticker).info)
+
+    def news(self, ticker: str) -> List[Dict[str, Any]]:
+        return _scheduled(self.NEWS_HOST, lambda: _yf().Ticker(ticker).news)
+
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d", start: Optional[str] = None):
+        if start is not None:
+            return _scheduled(self.QUOTE_HOST, lambda: _yf().Ticker(ticker).history(start=start, interval=interval))
+        return _scheduled(self.QUOTE_HOST, lambda: _yf().Ticker(ticker).history(period=period, interval=interval))
+
+    def download(self, tickers: List[str], period: str = "1mo", interval: str = "1d", start: Optional[str] = None) -> Dict[str, Any]:
+        from tools.scheduler import UpstreamUnavailable, is_transient
+
+        tickers = list(dict.fromkeys(tickers))
+        frames: Dict[str, Any] = {}
+        pending = list(tickers)
+
+        def attempt() -> None:
+            # yf.download returns empty frames for tickers that failed; their
+            # logged errors tell throttled and transient failures apart, and
+            # only those tickers are requested again on the next attempt
+            errors = _DownloadErrors()
+            logger = logging.getLogger("yfinance")
+            logger.addHandler(errors)
+            try:
+                data = _yf().download(
+                    pending, period=None if start else period, start=start, interval=interval,
+                    group_by="ticker", auto_adjust=True, threads=True, progress=False,
+                )
+            finally:
+                logger.removeHandler(errors)
+            split = _split_download(data, pending)
+            retry = []
+            for ticker in pending:
+                error = errors.errors.get(ticker.upper())
+                failure = _retryable_download_error(ticker, error) if error else None
+                frames[ticker] = failure if failure is not None else split[ticker]
+                if failure is not None:
+                    retry.append(ticker)
+            pending[:] = retry
+            if retry:
+                raise frames[retry[0]]
+
+        try:
+            # yf.download requests each ticker separately, so it costs one token per ticker
+            _scheduled(self.QUOTE_HOST, attempt, cost=lambda: len(pending))
+        except Exception as e:
+            if not isinstance(e, UpstreamUnavailable) and not is_transient(e):
+                raise
+            # Tickers still failing map to their error, so callers neither cache nor store them
+            for ticker in pending:
+                if not isinstance(frames.get(ticker), Exception):
+                    frames[ticker] = e
+        return {ticker: frames[ticker] for ticker in tickers}
+
+
+# Resampling rules for bar intervals coarser than a day
+_RESAMPLE_RULES = {"5d": "W-FRI", "1wk": "W-FRI", "1mo": "MS", "3mo": "QS"}
+_OHLCV_AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+class SnapshotProvider(MarketDataProvider):
+    """
+    Pre-loaded market snapshot served from memory.
+
+    Holds info, news and daily OHLCV bars for a fixed universe. Periods are
+    measured back from the snapshot's last bar, so every call sees the same
+    close no matter when it is made. Sliced and resampled frames are memoized
+    and shared between callers, so they must not be modified in place.
+
+    Args:
+        info: Ticker -> ``.info``-style dict
+        news: Ticker -> ``.news``-style article list
+        history: Ticker -> daily OHLCV DataFrame
+        as_of: Label for when the snapshot was taken (default: the last bar date)
+    """
+
+    name = "snapshot"
+    local = True
+
+    def __init__(
+        self,
+        info: Optional[Dict[str, Dict[str, Any]]] = None,
+        news: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        history: Optional[Dict[str, Any]] = None,
+        as_of: Optional[str] = None,
+    ):
+        self._info = {t.upper(): v for t, v in (info or {}).items()}
+        self._news = {t.upper(): v for t, v in (news or {}).items()}
+        self._daily = {t.upper(): v for t, v in (history or {}).items()}
+        self._views: Dict[Tuple[str, str, str, Optional[str]], Any] = {}
+        self._lock = threading.Lock()
+        if as_of is None and self._daily:
+            as_of = max(str(frame.index[-1].date()) for frame in self._daily.values() if len(frame))
+        self.as_of = as_of
+
+    @property
+    def tickers(self) -> List[str]:
+        """Tickers with any data in the snapshot."""
+        return sorted(set(self._info) | set(self._news) | set(self._daily))
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        try:
+            return self._info[ticker.upper()]
+        except KeyError:
+            raise ValueError(f"{ticker} is not in the market snapshot") from None
+
+    def news(self, ticker: str) -> List[Dict[str, Any]]:
+        return self._news.get(ticker.upper(), [])
+
+    def history(self, ticker: str, period: str = "1mo", interval: str = "1d", start: Optional[str] = None):
+        key = (ticker.upper(), period, interval, start)
+        frame = self._views.get(key)
+        if frame is None:
+            frame = self._slice(key[0], period, interval, start)
+            with self._lock:
+                self._views[key] = frame
+        return frame
+
+    def _slice(self, ticker: str, period: str, interval: str, start: Optional[str]):
+        import pandas as pd
+        from tools.ohlcv_store import _day_bars, _period_start
+
+        daily = self._daily.get(ticker)
+        if daily is None:
+            raise ValueError(f"{ticker} is not in the market snapshot")
+        if interval != "1d" and interval not in _RESAMPLE_RULES:
+            raise ValueError(f"The market snapshot only has daily bars, not {interval}")
+        if daily.empty:
+            return daily
+
+        if start is not None:
+            frame = daily[daily.index >= pd.Timestamp(start, tz=daily.index.tz)]
+        elif _day_bars(period) is not None:
+            frame = daily.iloc[-_day_bars(period):]
+        else:
+            first = _period_start(period, daily.index[-1])
+            frame = daily if first is None else daily[daily.index >= first]
+        if interval in _RESAMPLE_RULES and not frame.empty:
+            frame = frame.resample(_RESAMPLE_RULES[interval]).agg(_OHLCV_AGG).dropna()
+        return frame
+
+    @classmethod
+    def capture(
+        cls,
+        tickers: List[str],
+        source: Optional[MarketDataProvider] = None,
+        period: str = "2y",
+        max_workers: int = 8,
+    ) -> "SnapshotProvider":
+        """
+        Load a universe from another provider into a snapshot.
+
+        Daily history comes from one bulk request; info and news are fetched
+        per ticker on a bounded thread pool. Tickers whose info can't be
+        fetched are left out of the info table (their tool calls report errors).
+
+        Args:
+            tickers: Ticker symbols to capture
+            source: Provider to load from (default: live yfinance)
+            period: Daily history to keep (default: '2y', enough for SMA200)
+            max_workers: Concurrent info/news requests (default: 8)
+        """
+        from tools.records import INFO_FIELDS
+
+        source = source or YFinanceProvider()
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        history = source.download(tickers, period=period, interval="1d")
+
+        def fetch(ticker: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+            try:
+                # Keep only the fields the tools read; the full payload is mostly unused text
+                info = source.info(ticker)
+                info = {key: info[key] for key in INFO_FIELDS if key in info}
+            except Exception:
+                info = None
+            try:
+                news = source.news(ticker)
+            except Exception:
+                news = []
+            return info, news
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as pool:
+            fetched = dict(zip(tickers, pool.map(fetch, tickers)))
+
+        return cls(
+            info={t: info for t, (info, _) in fetched.items() if info is not None},
+            news={t: news for t, (_, news) in fetched.items()},
+            history={t: frame for t, frame in history.items() if not isinstance(frame, Exception) and not frame.empty},
+        )
+
+    def save(self, path: str) -> None:
+        """
+        Write the snapshot to a JSON file.
+
+        Daily bars are stored as ``{"index": [dates], "columns": [...], "data": [[...]]}`` per ticker.
+        """
+        snapshot = {
+            "as_of": self.as_of,
+            "info": self._info,
+            "news": self._news,
+            "history": {
+                ticker: {
+                    "index": [ts.strftime("%Y-%m-%d") for ts in frame.index],
+                    "columns": list(frame.columns),
+                    "data": frame.to_numpy().tolist(),
+                }
+                for ticker, frame in self._daily.items()
+            },
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(snapshot, f, default=str)
+
+    @classmethod
+    def from_dict(cls, snapshot: Dict[str, Any]) -> "SnapshotProvider":
+        """Build a snapshot from the structure written by ``save``."""
+        import pandas as pd
+
+        history = {
+            ticker: pd.DataFrame(bars["data"], columns=bars["columns"], index=pd.DatetimeIndex(pd.to_datetime(bars["index"]), name="Date"))
+            for ticker, bars in snapshot.get("history", {}).items()
+        }
+        return cls(info=snapshot.get("info"), news=snapshot.get("news"), history=history, as_of=snapshot.get("as_of"))
+
+    @classmethod
+    def from_file(cls, path: str) -> "SnapshotProvider":
+        """Load a snapshot written by ``save``."""
+        with open(os.path.expanduser(path)) as f:
+            return cls.from_dict(json.load(f))
+
+
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> MarketDataProvider:
+    """
+    Get the provider the tools fetch market data from.
+
+    Defaults to live yfinance, or to the snapshot file named by
+    MARKET_DATA_SNAPSHOT when that is set.
+    """
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                path = os.getenv("MARKET_DATA_SNAPSHOT")
+                _provider = SnapshotProvider.from_file(path) if path else YFinanceProvider()
+    return _provider
+
+
+def set_provider(provider: Optional[MarketDataProvider]) -> None:
+    """
+    Switch the provider the tools fetch market data from.
+
+    The shared market data cache is cleared so that no results from the
+    previous provider are served.
+
+    Args:
+        provider: Provider to use, or None to restore the default
+    """
+    global _provider
+    from tools.cache import market_cache
+
+    with _provider_lock:
+        _provider = provider
+    market_cache.clear()
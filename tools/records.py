@@ -0,0 +1,205 @@
+"""Compact typed records for market data the tools keep between fetch and output."""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+# ``.info`` keys read by any tool; everything else in the (often 150+ key)
+# payload is dropped before it is cached
+INFO_FIELDS = (
+    "longName",
+    "currentPrice",
+    "regularMarketPrice",
+    "previousClose",
+    "marketCap",
+    "trailingPE",
+    "forwardPE",
+    "dividendYield",
+    "fiftyTwoWeekHigh",
+    "fiftyTwoWeekLow",
+    "volume",
+    "averageVolume",
+    "sector",
+    "industry",
+)
+
+_TEXT_FIELDS = frozenset({"longName", "sector", "industry"})
+_INTEGER_FIELDS = frozenset({"marketCap", "volume", "averageVolume"})
+
+# Marker for missing values in tool output
+MISSING = "N/A"
+
+# Decimal places of comparison prices, ratios and percentages in tool output
+OUTPUT_DECIMALS = 4
+
+
+def _number(value: Any) -> float:
+    if value is None or isinstance(value, (bool, str)):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def output_value(value: Any, digits: Optional[int] = None) -> Any:
+    """Convert a record value to its tool output form ('N/A' for NaN/None, NumPy floats as rounded Python floats)."""
+    if value is None:
+        return MISSING
+    if isinstance(value, np.floating):
+        value = float(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return MISSING
+        if digits is not None and math.isfinite(value):
+            value = round(value, digits)
+    return value
+
+
+class Quote:
+    """
+    The ``.info`` fields the tools use, without the rest of the payload.
+
+    Numbers are floats with NaN for missing values (market cap and volumes
+    are kept as ints when present); text fields are None when missing.
+    ``get`` mirrors ``dict.get`` so a Quote can stand in for the raw info
+    dict: missing values return the default.
+    """
+
+    __slots__ = INFO_FIELDS
+
+    def __init__(self, **fields: Any):
+        for name in INFO_FIELDS:
+            value = fields.get(name)
+            if name in _TEXT_FIELDS:
+                value = str(value) if value not in (None, "") else None
+            elif name in _INTEGER_FIELDS and isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+                value = int(value)
+            else:
+                value = _number(value)
+            setattr(self, name, value)
+
+    @classmethod
+    def from_info(cls, info: Any) -> "Quote":
+        """Build a Quote from a raw ``.info`` dict (or return it unchanged if it already is one)."""
+        if isinstance(info, Quote):
+            return info
+        return cls(**{name: info.get(name) for name in INFO_FIELDS if name in info})
+
+    def get(self, name: str, default: Any = None) -> Any:
+        value = getattr(self, name, None)
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return default
+        return value
+
+    @property
+    def price(self) -> float:
+        """Current price, falling back to the regular market price."""
+        return self.currentPrice if not math.isnan(self.currentPrice) else self.regularMarketPrice
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the fields that are present, as a plain ``.info``-style dict."""
+        return {name: value for name in INFO_FIELDS if (value := self.get(name)) is not None}
+
+    def __repr__(self) -> str:
+        return f"Quote({self.to_dict()!r})"
+
+
+class PriceSummary:
+    """
+    Scalar reduction of an OHLCV frame.
+
+    Built with one pass over the frame's columns so the frame itself can be
+    released as soon as the summary exists.
+    """
+
+    __slots__ = ("bars", "first_close", "last_close", "previous_close", "high", "low", "avg_volume", "volatility", "start", "end")
+
+    def __init__(self, hist: Any):
+        close = hist["Close"].to_numpy(dtype=np.float64)
+        self.bars = len(close)
+        self.first_close = float(close[0]) if self.bars else math.nan
+        self.last_close = float(close[-1]) if self.bars else math.nan
+        self.previous_close = float(close[-2]) if self.bars > 1 else math.nan
+        self.high = float(np.nanmax(hist["High"].to_numpy(dtype=np.float64))) if self.bars else math.nan
+        self.low = float(np.nanmin(hist["Low"].to_numpy(dtype=np.float64))) if self.bars else math.nan
+        self.avg_volume = float(np.nanmean(hist["Volume"].to_numpy(dtype=np.float64))) if self.bars else math.nan
+        # Sample standard deviation of simple returns, as pandas' pct_change().std()
+        returns = close[1:] / close[:-1] - 1 if self.bars > 1 else np.empty(0)
+        returns = returns[~np.isnan(returns)]
+        self.volatility = float(np.std(returns, ddof=1)) if len(returns) > 1 else math.nan
+        self.start = hist.index[0] if self.bars else None
+        self.end = hist.index[-1] if self.bars else None
+
+    @property
+    def change(self) -> float:
+        return self.last_close - self.first_close
+
+    @property
+    def change_percent(self) -> float:
+        return (self.last_close - self.first_close) / self.first_close * 100
+
+    @property
+    def day_change(self) -> float:
+        return self.last_close - self.previous_close
+
+    @property
+    def day_change_percent(self) -> float:
+        return (self.last_close - self.previous_close) / self.previous_close * 100
+
+
+class ComparisonTable:
+    """
+    Column-oriented rows of compare_stocks.
+
+    Prices, ratios, percentages and market caps are float64 arrays with NaN
+    for missing values; names and sectors are kept once per row. Rows are
+    converted to the tool's dict shape only by ``to_dict``, which rounds the
+    figures to ``OUTPUT_DECIMALS`` places.
+    """
+
+    __slots__ = ("tickers", "company_name", "sector", "current_price", "market_cap", "pe_ratio", "performance", "volatility", "filled", "errors")
+
+    def __init__(self, tickers: Iterable[str]):
+        self.tickers: List[str] = list(tickers)
+        size = len(self.tickers)
+        self.company_name: List[Optional[str]] = [None] * size
+        self.sector: List[Optional[str]] = [None] * size
+        self.current_price = np.full(size, np.nan, dtype=np.float64)
+        self.market_cap = np.full(size, np.nan, dtype=np.float64)
+        self.pe_ratio = np.full(size, np.nan, dtype=np.float64)
+        self.performance = np.full(size, np.nan, dtype=np.float64)
+        self.volatility = np.full(size, np.nan, dtype=np.float64)
+        # Rows without history are neither filled nor errors and are left out
+        self.filled = np.zeros(size, dtype=bool)
+        self.errors: Dict[int, str] = {}
+
+    def set(self, row: int, quote: Quote, summary: PriceSummary) -> None:
+        self.company_name[row] = quote.longName
+        self.sector[row] = quote.sector
+        self.current_price[row] = quote.price
+        self.market_cap[row] = quote.marketCap
+        self.pe_ratio[row] = quote.trailingPE
+        self.performance[row] = summary.change_percent
+        self.volatility[row] = summary.volatility * 100
+        self.filled[row] = True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return ``{ticker: {...}}`` in compare_stocks' output shape."""
+        result: Dict[str, Any] = {}
+        for row, ticker in enumerate(self.tickers):
+            if row in self.errors:
+                result[ticker] = {"error": self.errors[row]}
+            elif self.filled[row]:
+                market_cap = self.market_cap[row]
+                result[ticker] = {
+                    "company_name": output_value(self.company_name[row]),
+                    "current_price": output_value(self.current_price[row], OUTPUT_DECIMALS),
+                    "market_cap": MISSING if np.isnan(market_cap) else int(market_cap),
+                    "pe_ratio": output_value(self.pe_ratio[row], OUTPUT_DECIMALS),
+                    "3mo_performance": output_value(self.performance[row], OUTPUT_DECIMALS),
+                    "volatility": output_value(self.volatility[row], OUTPUT_DECIMALS),
+                    "sector": output_value(self.sector[row]),
+                }
+        return result
@@ -0,0 +1,346 @@
+"""Shared scheduler for upstream market data requests: rate limit, retries, circuit breakers and adaptive concurrency."""
+
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Union
+
+# Sustained upstream requests per second across the process (0 disables the limit)
+RATE = float(os.getenv("MARKET_DATA_RATE", "30"))
+
+# Requests that may be issued back to back before the rate limit applies
+BURST = float(os.getenv("MARKET_DATA_BURST", "100"))
+
+# Attempts per request, including the first one
+MAX_ATTEMPTS = int(os.getenv("MARKET_DATA_MAX_ATTEMPTS", "4"))
+
+# Consecutive failures that open a host's circuit, and seconds before it is probed again
+BREAKER_THRESHOLD = int(os.getenv("MARKET_DATA_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET_S = float(os.getenv("MARKET_DATA_BREAKER_RESET_S", "30"))
+
+# Callers allowed to wait for a slot before new requests are rejected
+MAX_QUEUE = int(os.getenv("MARKET_DATA_MAX_QUEUE", "256"))
+
+# Longest a request may wait for the rate limit or a concurrency slot
+MAX_WAIT_S = float(os.getenv("MARKET_DATA_MAX_WAIT_S", "30"))
+
+# Bounds of the adaptive concurrency limit
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = int(os.getenv("MARKET_DATA_MAX_CONCURRENCY", "16"))
+
+# Backoff before retry n is uniform in [0, min(BACKOFF_CAP_S, BACKOFF_BASE_S * 2**n)]
+BACKOFF_BASE_S = 0.5
+BACKOFF_CAP_S = 8.0
+
+
+class UpstreamUnavailable(RuntimeError):
+    """Raised instead of calling upstream when the scheduler sheds a request."""
+
+
+class CircuitOpenError(UpstreamUnavailable):
+    """The host's circuit breaker is open after repeated failures."""
+
+
+class RequestRejected(UpstreamUnavailable):
+    """The request queue is full or the request would wait longer than allowed."""
+
+
+def is_throttled(error: BaseException) -> bool:
+    """Return True if an exception means upstream is rate-limiting us (HTTP 429)."""
+    if type(error).__name__ == "YFRateLimitError":
+        return True
+    message = str(error).lower()
+    return "429" in message or "too many requests" in message or "rate limit" in message
+
+
+def is_transient(error: BaseException) -> bool:
+    """Return True for network errors and throttling that are worth retrying."""
+    if isinstance(error, UpstreamUnavailable):
+        return False
+    if is_throttled(error) or isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    name = type(error).__name__
+    return "Timeout" in name or "ConnectionError" in name
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter.
+
+    Requests reserve tokens up front, so the bucket may go into debt; a
+    request waits until its share of the debt has been refilled. This keeps
+    requests in arrival order without a queue of waiters.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, cost: float = 1.0, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve ``cost`` tokens.
+
+        Returns:
+            Seconds to wait before issuing the request, or None (and nothing
+            reserved) if that would exceed ``max_wait``.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (cost - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= cost
+            return wait
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+
+    Opens after ``threshold`` consecutive failures and rejects requests for
+    ``reset_s`` seconds; then one probe request is let through (half-open),
+    which closes the circuit on success or reopens it on failure.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset_s: float = BREAKER_RESET_S):
+        self.threshold = threshold
+        self.reset_s = reset_s
+        self.state = "closed"
+        self.failures = 0
+        self._opened = 0.0
+        self._probing = False
+        self._prober: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened >= self.reset_s:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                self._prober = threading.get_ident()
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        with self._lock:
+            return max(0.0, self.reset_s - (time.monotonic() - self._opened)) if self.state == "open" else 0.0
+
+    def cancel(self) -> None:
+        """Give back the half-open probe slot if this thread took it in ``allow`` but never sent the request."""
+        with self._lock:
+            if self._probing and self._prober == threading.get_ident():
+                self._probing = False
+
+    def success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                self.state = "open"
+                self._opened = time.monotonic()
+                self._probing = False
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit.
+
+    Each success raises the limit by 1/limit (about +1 per round of
+    requests); a throttled response halves it, at most once per ``cooldown_s``
+    so a burst of 429s from one round counts as a single signal.
+    """
+
+    def __init__(self, initial: float, minimum: float = MIN_CONCURRENCY, maximum: float = MAX_CONCURRENCY, cooldown_s: float = 1.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = min(max(initial, minimum), maximum)
+        self.cooldown_s = cooldown_s
+        self.in_flight = 0
+        self._decreased = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    def release(self, throttled: bool = False) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                now = time.monotonic()
+                if now - self._decreased >= self.cooldown_s:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._decreased = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+class RequestScheduler:
+    """
+    Gate for every upstream market data request.
+
+    ``call`` runs a request once it fits the shared token bucket and the
+    adaptive concurrency limit, unless the host's circuit is open. Throttled
+    and transient failures are retried with jittered exponential backoff;
+    other errors (e.g., an unknown ticker) are raised at once and don't count
+    against the host.
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE,
+        burst: float = BURST,
+        max_attempts: int = MAX_ATTEMPTS,
+        concurrency: float = 8,
+        max_queue: int = MAX_QUEUE,
+        max_wait_s: float = MAX_WAIT_S,
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.limit = AdaptiveLimit(concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.max_queue = max_queue
+        self.max_wait_s = max_wait_s
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._counts = {
+            "requests": 0, "succeeded": 0, "failed": 0, "retries": 0, "throttled": 0,
+            "rejected_queue_full": 0, "rejected_wait": 0, "rejected_circuit_open": 0, "max_queue_depth": 0,
+        }
+
+    def configure(self, rate: Optional[float] = None, burst: Optional[float] = None, max_attempts: Optional[int] = None) -> None:
+        """Change the rate limit or retry budget (e.g., ``rate=0`` for offline playback)."""
+        if rate is not None or burst is not None:
+            self.bucket = TokenBucket(self.bucket.rate if rate is None else rate, self.bucket.burst if burst is None else burst)
+        if max_attempts is not None:
+            self.max_attempts = max(1, max_attempts)
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker()
+            return breaker
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[key] += amount
+
+    def _admit(self, host: str, cost: float) -> None:
+        """Wait for the rate limit and a concurrency slot, or raise if the request is shed."""
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            self._count("rejected_circuit_open")
+            raise CircuitOpenError(f"Upstream {host} is failing; circuit open for another {breaker.retry_in():.0f}s")
+        try:
+            self._wait(cost)
+        except BaseException:
+            # A shed half-open probe must not keep the breaker waiting for its outcome
+            breaker.cancel()
+            raise
+
+    def _wait(self, cost: float) -> None:
+        """Wait for the rate limit and a concurrency slot, or raise ``RequestRejected``."""
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                self._counts["rejected_queue_full"] += 1
+                raise RequestRejected(f"Too many queued requests for market data ({self._waiting})")
+            self._waiting += 1
+            self._counts["max_queue_depth"] = max(self._counts["max_queue_depth"], self._waiting)
+        try:
+            start = time.monotonic()
+            # A bulk request may also wait out its own share of the rate
+            wait = self.bucket.reserve(cost, self.max_wait_s + (cost / self.bucket.rate if self.bucket.rate > 0 else 0))
+            if wait is None:
+                self._count("rejected_wait")
+                raise RequestRejected(f"Market data rate limit would delay this request more than {self.max_wait_s:.0f}s")
+            if wait > 0:
+                time.sleep(wait)
+            if not self.limit.acquire(max(0.0, self.max_wait_s - (time.monotonic() - start))):
+                self._count("rejected_wait")
+                raise RequestRejected(f"No market data request slot freed up within {self.max_wait_s:.0f}s")
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def call(self, host: str, func: Callable[..., Any], *args: Any, cost: Union[float, Callable[[], float]] = 1.0, **kwargs: Any) -> Any:
+        """
+        Run an upstream request under the scheduler.
+
+        Args:
+            host: Upstream host the request goes to (selects the circuit breaker)
+            func: Function that performs the request
+            cost: Upstream requests ``func`` makes (e.g., one per ticker of a bulk download),
+                or a function returning it, evaluated before each attempt
+
+        Raises:
+            UpstreamUnavailable: The request was shed (circuit open, queue full or too long a wait)
+        """
+        self._count("requests")
+        breaker = self.breaker(host)
+        for attempt in range(self.max_attempts):
+            self._admit(host, cost() if callable(cost) else cost)
+            throttled = False
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                throttled = is_throttled(e)
+                if not is_transient(e):
+                    breaker.success()
+                    self._count("failed")
+                    raise
+                breaker.failure()
+                if throttled:
+                    self._count("throttled")
+                if attempt + 1 >= self.max_attempts or breaker.state == "open":
+                    self._count("failed")
+                    raise
+            else:
+                breaker.success()
+                self._count("succeeded")
+                return result
+            finally:
+                self.limit.release(throttled)
+            self._count("retries")
+            time.sleep(random.uniform(0, min(BACKOFF_CAP_S, BACKOFF_BASE_S * 2 ** attempt)))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, retry and rejection counts, queue depth, concurrency and breaker states."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counts)
+            stats["queue_depth"] = self._waiting
+            breakers = dict(self._breakers)
+        stats["in_flight"] = self.limit.in_flight
+        stats["concurrency_limit"] = round(self.limit.limit, 2)
+        stats["rate"] = self.bucket.rate
+        stats["breakers"] = {host: breaker.state for host, breaker in breakers.items()}
+        return stats
+
+
+# Scheduler shared by every live market data provider call
+request_scheduler = RequestScheduler()
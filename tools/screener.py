@@ -0,0 +1,291 @@
+"""Universe screener: rank hundreds of tickers by performance, risk, valuation and momentum in one call."""
+
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from tools.encoding import tool_output
+from tools.technical_indicators import TRADING_DAYS, _ffill, _stack, _value
+from tools.yfinance_tools import _fetch_concurrently, _fetch_history_batch, _fetch_info
+
+# Named universes: one ticker per line in tools/universes/<name>.txt ('#' starts a comment)
+UNIVERSE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "universes")
+
+# Bars per lookback window
+_WINDOWS = {"1m": 21, "3m": 63, "6m": 126, "12m": 252}
+
+# Ranking criteria: metric name -> True if higher is better
+CRITERIA = {
+    "score": True,
+    "momentum": True,
+    "return_1m": True,
+    "return_3m": True,
+    "return_6m": True,
+    "return_12m": True,
+    "sharpe": True,
+    "volatility": False,
+    "max_drawdown": True,
+    "pct_from_high": True,
+    "pe_ratio": False,
+    "forward_pe": False,
+    "dividend_yield": True,
+    "market_cap": True,
+}
+
+# Criteria that need per-ticker fundamentals (one info request per ticker)
+_FUNDAMENTAL_CRITERIA = {"score", "pe_ratio", "forward_pe", "dividend_yield", "market_cap"}
+
+# Fundamentals reported for the top-ranked tickers: output name -> info key
+_FUNDAMENTALS = {
+    "company_name": "longName",
+    "sector": "sector",
+    "market_cap": "marketCap",
+    "pe_ratio": "trailingPE",
+    "forward_pe": "forwardPE",
+    "dividend_yield": "dividendYield",
+}
+
+# Valid universe names (bundled files only; never a path)
+_UNIVERSE_NAME = re.compile(r"^[a-z0-9_]+$")
+
+# Maximum tickers screened in one call
+MAX_UNIVERSE = 2000
+
+
+def available_universes() -> List[str]:
+    """Return the names of the bundled universe files."""
+    if not os.path.isdir(UNIVERSE_DIR):
+        return []
+    return sorted(name[:-4] for name in os.listdir(UNIVERSE_DIR) if name.endswith(".txt"))
+
+
+def load_universe(name: str) -> List[str]:
+    """
+    Load the tickers of a bundled universe.
+
+    The name comes from the model, so only bundled universe names are
+    accepted; paths are rejected rather than opened.
+
+    Args:
+        name: Bundled universe name (e.g., 'dow30', 'semiconductors')
+
+    Returns:
+        Upper-case ticker symbols in file order, without duplicates.
+    """
+    key = str(name).strip().lower().replace(" ", "_")
+    path = os.path.join(UNIVERSE_DIR, f"{key}.txt")
+    if not _UNIVERSE_NAME.match(key) or os.path.dirname(os.path.realpath(path)) != os.path.realpath(UNIVERSE_DIR) or not os.path.isfile(path):
+        raise ValueError(f"Unknown universe '{name}'; available: {', '.join(available_universes())}")
+
+    tickers = []
+    with open(path) as f:
+        for line in f:
+            symbol = line.split("#", 1)[0].strip().upper()
+            if symbol:
+                tickers.append(symbol)
+    return list(dict.fromkeys(tickers))
+
+
+def _window_return(close: np.ndarray, bars: int) -> np.ndarray:
+    """Return over the last ``bars`` bars, per column (NaN if the history is too short)."""
+    if close.shape[0] <= bars:
+        return np.full(close.shape[1], np.nan)
+    return close[-1] / close[-1 - bars] - 1
+
+
+def compute_screen_metrics(close: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute price-based screening metrics for a stacked close matrix.
+
+    Args:
+        close: Closing prices, shape (T, N), forward-filled; leading NaNs mark
+            tickers with shorter histories
+
+    Returns:
+        Dictionary mapping metric name to an array of N values (percentages
+        for returns, volatility and drawdowns; NaN where not computable).
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns = np.diff(np.log(close), axis=0)
+        valid = ~np.isnan(log_returns)
+        counts = valid.sum(axis=0)
+        mean = np.where(counts > 0, np.nansum(log_returns, axis=0) / np.maximum(counts, 1), np.nan)
+        variance = np.nansum((log_returns - mean) ** 2, axis=0) / np.maximum(counts - 1, 1)
+        volatility = np.where(counts > 20, np.sqrt(variance * TRADING_DAYS), np.nan)
+        sharpe = mean * TRADING_DAYS / volatility
+
+        peak = np.fmax.accumulate(close, axis=0)
+        drawdown = np.nanmin(close / peak - 1, axis=0)
+        pct_from_high = close[-1] / np.nanmax(close, axis=0) - 1
+
+        # 12-month return excluding the latest month (cross-sectional momentum),
+        # measured from the first available bar for shorter histories
+        rows, columns = close.shape
+        end = rows - 1 - _WINDOWS["1m"]
+        first = np.maximum(np.argmax(~np.isnan(close), axis=0), max(rows - 1 - _WINDOWS["12m"], 0))
+        if end > 0:
+            momentum = np.where(first < end, close[end] / close[first, np.arange(columns)] - 1, np.nan)
+        else:
+            momentum = np.full(columns, np.nan)
+
+        return {
+            "return_1m": _window_return(close, _WINDOWS["1m"]) * 100,
+            "return_3m": _window_return(close, _WINDOWS["3m"]) * 100,
+            "return_6m": _window_return(close, _WINDOWS["6m"]) * 100,
+            "return_12m": _window_return(close, min(_WINDOWS["12m"], rows - 1)) * 100,
+            "momentum": momentum * 100,
+            "volatility": volatility * 100,
+            "sharpe": sharpe,
+            "max_drawdown": drawdown * 100,
+            "pct_from_high": pct_from_high * 100,
+        }
+
+
+def _zscore(x: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        std = np.nanstd(x)
+        return (x - np.nanmean(x)) / std if std > 0 else np.zeros_like(x)
+
+
+def composite_score(metrics: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Blend momentum, risk-adjusted return, low volatility and value into one score.
+
+    Each input is standardized across the universe (z-score) and the available
+    ones are averaged, so tickers missing a valuation are still ranked.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pe = metrics.get("pe_ratio", np.full_like(metrics["momentum"], np.nan))
+        earnings_yield = np.where(pe > 0, 1 / pe, np.nan)
+        parts = np.vstack([
+            _zscore(metrics["momentum"]),
+            _zscore(metrics["sharpe"]),
+            -_zscore(metrics["volatility"]),
+            _zscore(earnings_yield),
+        ])
+        return np.nanmean(parts, axis=0)
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+@tool_output()
+def screen_universe(
+    tickers: Optional[List[str]] = None,
+    universe: Optional[str] = None,
+    sort_by: str = "momentum",
+    top_n: int = 10,
+) -> Dict[str, Any]:
+    """
+    Screen a universe of stocks and return only the top-ranked names.
+
+    Computes 1/3/6/12-month returns, 12-1 month momentum, annualized
+    volatility, Sharpe ratio, max drawdown and distance from the 52-week high
+    for every ticker in one vectorized pass over a single bulk price download,
+    then ranks them. Use this instead of compare_stocks for sector or index
+    questions ("top semiconductor picks").
+
+    Args:
+        tickers: Ticker symbols to screen (e.g., ['NVDA', 'AMD', 'INTC'])
+        universe: Named universe to screen instead, e.g. 'dow30', 'semiconductors',
+            'sector_etfs' (ignored when tickers are given)
+        sort_by: Ranking criterion: 'momentum' (default), 'score' (blend of momentum,
+            Sharpe, low volatility and earnings yield), 'return_1m', 'return_3m',
+            'return_6m', 'return_12m', 'sharpe', 'volatility' (lowest first),
+            'max_drawdown' (shallowest first), 'pct_from_high', 'pe_ratio' (lowest
+            positive first), 'forward_pe', 'dividend_yield' or 'market_cap'
+        top_n: Number of top-ranked tickers to return (default: 10)
+
+    Returns:
+        Dictionary with the universe size, the criterion and the top_n tickers
+        with their metrics, company name, sector and valuation.
+    """
+    try:
+        if tickers:
+            symbols = list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+            name = "custom"
+        elif universe:
+            symbols = load_universe(universe)
+            name = universe
+        else:
+            return {"error": f"Provide tickers or a universe ({', '.join(available_universes())})"}
+    except ValueError as e:
+        return {"error": str(e)}
+    if sort_by not in CRITERIA:
+        return {"error": f"Unknown sort_by '{sort_by}'; use one of: {', '.join(CRITERIA)}"}
+    if len(symbols) > MAX_UNIVERSE:
+        return {"error": f"Universe has {len(symbols)} tickers; screen at most {MAX_UNIVERSE} at once"}
+    top_n = max(1, min(int(top_n), len(symbols) or 1))
+
+    histories = _fetch_history_batch(symbols, period="1y")
+    frames = {}
+    failed = []
+    for ticker in symbols:
+        hist = histories.get(ticker)
+        if isinstance(hist, Exception) or hist is None or hist.empty:
+            failed.append(ticker)
+        else:
+            frames[ticker] = hist
+    if not frames:
+        return {"error": f"No price history available for any of the {len(symbols)} tickers"}
+
+    try:
+        aligned = _stack(frames, "Close")
+        close = _ffill(aligned.to_numpy(dtype=np.float64))
+        metrics = compute_screen_metrics(close)
+    except Exception as e:
+        return {"error": f"Failed to compute screening metrics: {str(e)}"}
+    names = list(frames)
+
+    # Fundamentals for the whole universe only when the ranking needs them
+    infos: Dict[str, Any] = {}
+    if sort_by in _FUNDAMENTAL_CRITERIA:
+        infos = _fetch_concurrently(_fetch_info, names)
+        for metric, key in _FUNDAMENTALS.items():
+            if metric not in ("company_name", "sector"):
+                metrics[metric] = np.array([
+                    np.nan if isinstance(infos[t], Exception) else _number(infos[t].get(key)) for t in names
+                ])
+        if sort_by == "score":
+            metrics["score"] = composite_score(metrics)
+
+    values = metrics[sort_by]
+    if sort_by in ("pe_ratio", "forward_pe"):
+        values = np.where(values > 0, values, np.nan)
+    key = -values if CRITERIA[sort_by] else values
+    order = [i for i in np.argsort(np.where(np.isnan(key), np.inf, key), kind="stable") if not np.isnan(values[i])][:top_n]
+
+    top = [names[i] for i in order]
+    missing = [t for t in top if t not in infos]
+    if missing:
+        infos.update(_fetch_concurrently(_fetch_info, missing))
+
+    rows = []
+    for rank, i in enumerate(order, start=1):
+        ticker = names[i]
+        row: Dict[str, Any] = {"rank": rank, "ticker": ticker}
+        info = infos.get(ticker)
+        info = {} if isinstance(info, Exception) or info is None else info
+        for metric, info_key in _FUNDAMENTALS.items():
+            row[metric] = info.get(info_key, "N/A")
+        for metric, column in metrics.items():
+            if metric not in _FUNDAMENTALS:
+                row[metric] = _value(column[i])
+        rows.append(row)
+
+    result: Dict[str, Any] = {
+        "universe": name,
+        "screened": len(names),
+        "sort_by": sort_by,
+        "as_of": aligned.index[-1].strftime("%Y-%m-%d"),
+        "top": rows,
+    }
+    if failed:
+        result["no_data"] = failed[:20] + ([f"... {len(failed) - 20} more"] if len(failed) > 20 else [])
+    return result
@@ -0,0 +1,211 @@
+"""Vectorized technical indicators computed across many tickers at once."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from tools.encoding import tool_output
+from tools.yfinance_tools import _fetch_history_batch
+
+
+TRADING_DAYS = 252
+
+
+def _stack(frames: Dict[str, pd.DataFrame], column: str) -> pd.DataFrame:
+    """Align one OHLCV column of every frame on a shared date index (T x N)."""
+    return pd.concat({ticker: frame[column] for ticker, frame in frames.items()}, axis=1).sort_index()
+
+
+def _ffill(x: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs down each column; leading NaNs stay NaN."""
+    rows = np.where(np.isnan(x), 0, np.arange(x.shape[0])[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return x[rows, np.arange(x.shape[1])]
+
+
+def _ema(x: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Exponential moving average down each column.
+
+    Each column's average is seeded with its first valid value, so series with
+    shorter histories than the rest of the matrix are handled in the same pass.
+    """
+    out = np.empty_like(x)
+    prev = np.full(x.shape[1], np.nan)
+    for t in range(x.shape[0]):
+        row = x[t]
+        prev = np.where(np.isnan(prev), row, np.where(np.isnan(row), prev, alpha * row + (1 - alpha) * prev))
+        out[t] = prev
+    return out
+
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean down each column; NaN until ``window`` valid values are available."""
+    valid = ~np.isnan(x)
+    sums = np.cumsum(np.where(valid, x, 0.0), axis=0)
+    counts = np.cumsum(valid, axis=0)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts[window:] = counts[window:] - counts[:-window]
+    out = sums / np.maximum(counts, 1)
+    out[counts < window] = np.nan
+    return out
+
+
+def _last_cross(fast: np.ndarray, slow: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate the most recent crossover of two moving averages in each column.
+
+    Returns:
+        Tuple of (row index of the last cross or -1, sign of fast - slow at that cross).
+    """
+    sign = np.sign(fast - slow)
+    flips = (sign[1:] * sign[:-1] < 0)
+    rows = np.where(flips, np.arange(1, sign.shape[0])[:, None], -1)
+    last = rows.max(axis=0) if len(rows) else np.full(sign.shape[1], -1)
+    direction = np.where(last >= 0, sign[np.maximum(last, 0), np.arange(sign.shape[1])], 0)
+    return last, direction
+
+
+def _value(x: float) -> Any:
+    return float(x) if np.isfinite(x) else "N/A"
+
+
+def compute_indicators(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute the latest indicator values for a stacked price matrix.
+
+    Args:
+        close: Closing prices, shape (T, N), forward-filled
+        high: High prices, shape (T, N), forward-filled
+        low: Low prices, shape (T, N), forward-filled
+
+    Returns:
+        Dictionary mapping indicator name to an array of N latest values,
+        plus ``cross_row``/``cross_direction`` for moving-average crossovers.
+    """
+    latest = close[-1]
+    prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+
+    # RSI (14, Wilder smoothing)
+    delta = close - prev_close
+    avg_gain = _ema(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), 1 / 14)[-1]
+    avg_loss = _ema(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), 1 / 14)[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+
+    # MACD (12, 26, 9)
+    macd_line = _ema(close, 2 / 13) - _ema(close, 2 / 27)
+    signal = _ema(macd_line, 2 / 10)
+
+    # ATR (14, Wilder smoothing)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    atr = _ema(true_range, 1 / 14)[-1]
+
+    # Bollinger bands (20, 2) and 20-bar support/resistance
+    window = close[-20:]
+    bb_mid = np.nanmean(window, axis=0)
+    bb_std = np.nanstd(window, axis=0, ddof=0)
+    bb_upper, bb_lower = bb_mid + 2 * bb_std, bb_mid - 2 * bb_std
+
+    # Realized volatility (20 bars, annualized) from log returns
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns = np.log(close / prev_close)
+    volatility = np.nanstd(log_returns[-20:], axis=0, ddof=1) * np.sqrt(TRADING_DAYS) * 100
+
+    # Drawdown from the running peak
+    peak = np.fmax.accumulate(close, axis=0)
+    drawdown = (close / peak - 1) * 100
+
+    # Moving-average crossovers
+    sma50, sma200 = _rolling_mean(close, 50), _rolling_mean(close, 200)
+    cross_row, cross_direction = _last_cross(sma50, sma200)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "latest_close": latest,
+            "rsi_14": rsi,
+            "macd": macd_line[-1],
+            "macd_signal": signal[-1],
+            "macd_histogram": macd_line[-1] - signal[-1],
+            "atr_14": atr,
+            "atr_percent": atr / latest * 100,
+            "bollinger_upper": bb_upper,
+            "bollinger_middle": bb_mid,
+            "bollinger_lower": bb_lower,
+            "bollinger_percent_b": (latest - bb_lower) / (bb_upper - bb_lower),
+            "support_20d": np.nanmin(low[-20:], axis=0),
+            "resistance_20d": np.nanmax(high[-20:], axis=0),
+            "volatility_20d_annualized": volatility,
+            "current_drawdown_percent": drawdown[-1],
+            "max_drawdown_percent": np.nanmin(drawdown, axis=0),
+            "sma_50": sma50[-1],
+            "sma_200": sma200[-1],
+            "cross_row": cross_row,
+            "cross_direction": cross_direction,
+        }
+
+
+@tool_output(table="ticker")
+def get_technical_indicators(tickers: List[str], period: str = "1y") -> Dict[str, Any]:
+    """
+    Compute technical indicators for one or more stocks.
+
+    Calculates RSI, MACD, ATR, Bollinger bands, 20-day support/resistance,
+    annualized volatility, drawdown and 50/200-day moving-average crossovers
+    for every ticker in a single vectorized pass.
+
+    Args:
+        tickers: List of stock ticker symbols (e.g., ['AAPL', 'MSFT'])
+        period: History window to compute over (default: '1y'; use '1y' or longer for the 200-day average)
+
+    Returns:
+        Dictionary mapping each ticker to its latest indicator values.
+    """
+    histories = _fetch_history_batch(tickers, period=period)
+
+    results: Dict[str, Any] = {}
+    frames: Dict[str, pd.DataFrame] = {}
+    for ticker in tickers:
+        hist = histories.get(ticker)
+        if isinstance(hist, Exception):
+            results[ticker] = {"error": f"Failed to fetch data: {str(hist)}"}
+        elif hist is None or hist.empty:
+            results[ticker] = {"error": f"No historical data available for {ticker}"}
+        else:
+            frames[ticker] = hist
+
+    if not frames:
+        return results
+
+    try:
+        aligned = _stack(frames, "Close")
+        close = _ffill(aligned.to_numpy(dtype=np.float64))
+        high = _ffill(_stack(frames, "High").to_numpy(dtype=np.float64))
+        low = _ffill(_stack(frames, "Low").to_numpy(dtype=np.float64))
+        indicators = compute_indicators(close, high, low)
+    except Exception as e:
+        for ticker in frames:
+            results[ticker] = {"error": f"Failed to compute indicators: {str(e)}"}
+        return results
+
+    dates = aligned.index
+    for column, ticker in enumerate(frames):
+        row: Dict[str, Any] = {"ticker": ticker, "as_of": dates[-1].strftime("%Y-%m-%d")}
+        for name, values in indicators.items():
+            if name not in ("cross_row", "cross_direction"):
+                row[name] = _value(values[column])
+
+        cross_row: Optional[int] = int(indicators["cross_row"][column])
+        if not np.isnan(indicators["sma_200"][column]):
+            row["ma_trend"] = "bullish (50 > 200)" if indicators["sma_50"][column] > indicators["sma_200"][column] else "bearish (50 < 200)"
+        else:
+            row["ma_trend"] = "N/A"
+        if cross_row >= 0:
+            kind = "golden cross" if indicators["cross_direction"][column] > 0 else "death cross"
+            row["last_ma_cross"] = f"{kind} on {dates[cross_row].strftime('%Y-%m-%d')}"
+        else:
+            row["last_ma_cross"] = "N/A"
+        results[ticker] = row
+
+    return {ticker: results[ticker] for ticker in dict.fromkeys(tickers)}
@@ -1,10 +1,253 @@
 """Custom Yfinance tools for market data and news retrieval."""
 
-import yfinance as yf
-from typing import Optional, Dict, List, Any
+import os
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Any, Callable
 from datetime import datetime, timedelta
+from tools.cache import market_cache
+from tools.encoding import tool_output
 
+# Upper bound on concurrent per-ticker requests made by the batched fetch path
+MAX_FETCH_WORKERS = int(os.getenv("MARKET_DATA_MAX_WORKERS", "8"))
 
+# Major market indices reported by get_market_indices
+MARKET_INDICES = {
+    "^GSPC": "S&P 500",
+    "^DJI": "Dow Jones",
+    "^IXIC": "NASDAQ",
+    "^RUT": "Russell 2000",
+    "^VIX": "VIX (Volatility Index)",
+}
+
+
+def _provider():
+    """Return the current market data provider (live yfinance unless switched)."""
+    from tools.providers import get_provider
+
+    return get_provider()
+
+
+def _store():
+    """Return the shared on-disk OHLCV store (None if disabled), importing it on first use."""
+    from tools.ohlcv_store import ohlcv_store
+
+    return ohlcv_store
+
+
+def _is_intraday(interval: str) -> bool:
+    """Return True for minute/hour bar intervals (e.g., '1m', '15m', '1h')."""
+    return interval.endswith("h") or (interval.endswith("m") and not interval.endswith("mo"))
+
+
+def _fetch_info(ticker: str):
+    """
+    Fetch a ticker's ``.info`` through the shared cache, reduced to a ``Quote``.
+
+    Only the fields the tools read are kept, so the rest of the payload is
+    released as soon as it has been fetched.
+    """
+    from tools.records import Quote
+
+    provider = _provider()
+    if provider.local:
+        return Quote.from_info(provider.info(ticker))
+    return market_cache.get_or_fetch("info", ticker.upper(), fetch=lambda: Quote.from_info(provider.info(ticker)))
+
+
+def _fetch_news(ticker: str) -> List[Dict[str, Any]]:
+    """Fetch the raw ``.news`` list for a ticker through the shared cache."""
+    provider = _provider()
+    if provider.local:
+        return provider.news(ticker)
+    return market_cache.get_or_fetch("news", ticker.upper(), fetch=lambda: provider.news(ticker))
+
+
+def _fetch_history(ticker: str, period: str, interval: str = "1d"):
+    """Fetch an OHLCV frame for a ticker through the shared cache."""
+    provider = _provider()
+    if provider.local:
+        return provider.history(ticker, period=period, interval=interval)
+    kind = "intraday" if _is_intraday(interval) else "history"
+    return market_cache.get_or_fetch(
+        kind, ticker.upper(), period, interval,
+        fetch=lambda: _load_history(ticker, period, interval),
+    )
+
+
+def _uses_store(interval: str) -> bool:
+    """Return True if bars at this interval are persisted in the on-disk store."""
+    from tools.ohlcv_store import STORE_INTERVALS
+
+    return _store() is not None and interval in STORE_INTERVALS
+
+
+def _load_history(ticker: str, period: str, interval: str):
+    """
+    Load an OHLCV frame, fetching only the missing tail when the on-disk store has the series.
+    """
+    provider = _provider()
+    if not _uses_store(interval):
+        return provider.history(ticker, period=period, interval=interval)
+
+    ohlcv_store = _store()
+    action, start = ohlcv_store.plan(ticker, period, interval)
+    if action == "full":
+        hist = provider.history(ticker, period=period, interval=interval)
+        if hist.empty:
+            return hist
+        ohlcv_store.update(ticker, period, interval, hist, full=True)
+    elif action == "tail":
+        hist = provider.history(ticker, start=start, interval=interval)
+        if not ohlcv_store.update(ticker, period, interval, hist, full=False):
+            # Prices were re-adjusted (split or dividend) since they were stored
+            hist = provider.history(ticker, period=period, interval=interval)
+            if hist.empty:
+                return hist
+            ohlcv_store.update(ticker, period, interval, hist, full=True)
+    return ohlcv_store.read(ticker, period, interval)
+
+
+def _fetch_concurrently(fetch: Callable[[str], Any], tickers: List[str]) -> Dict[str, Any]:
+    """
+    Run a per-ticker fetch on a bounded thread pool.
+
+    Returns:
+        Dictionary mapping each ticker to its result, or to the exception it raised.
+    """
+    def run(ticker: str) -> Any:
+        try:
+            return fetch(ticker)
+        except Exception as e:
+            return e
+
+    unique = list(dict.fromkeys(tickers))
+    if len(unique) <= 1 or _provider().local:
+        return {ticker: run(ticker) for ticker in unique}
+    # Each task runs in a copy of the caller's context so that work done on the
+    # pool is attributed to the caller's trace span
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(unique))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, run, ticker) for ticker in unique]
+        return dict(zip(unique, (future.result() for future in futures)))
+
+
+def _fetch_history_batch(tickers: List[str], period: str, interval: str = "1d") -> Dict[str, Any]:
+    """
+    Fetch OHLCV frames for many tickers with a single bulk download.
+
+    Tickers already in the cache are served from it, and tickers another
+    caller is already fetching are awaited rather than fetched again; the rest
+    are downloaded in one bulk provider request (``yf.download`` for yfinance)
+    and cached individually. If the bulk request fails, each ticker falls back
+    to its own request so errors stay per-ticker. Local providers are asked directly.
+
+    Returns:
+        Dictionary mapping each ticker to its DataFrame, or to the exception it raised.
+    """
+    provider = _provider()
+    if provider.local:
+        return _fetch_concurrently(lambda t: provider.history(t, period=period, interval=interval), tickers)
+
+    kind = "intraday" if _is_intraday(interval) else "history"
+    flights = market_cache.flights
+    results: Dict[str, Any] = {}
+    claimed: Dict[str, Any] = {}
+    waiting: Dict[str, Any] = {}
+    for ticker in dict.fromkeys(tickers):
+        found, hist = market_cache.get(kind, ticker.upper(), period, interval)
+        if found:
+            results[ticker] = hist
+            continue
+        future, leader = flights.begin((kind, ticker.upper(), period, interval))
+        if not leader:
+            waiting[ticker] = future
+            continue
+        # Another caller may have stored the frame between our miss and the claim
+        found, hist = market_cache.peek(kind, ticker.upper(), period, interval)
+        if found:
+            results[ticker] = hist
+        claimed[ticker] = future
+
+    try:
+        results.update(_download_histories([t for t in claimed if t not in results], period, interval, kind))
+    finally:
+        for ticker, future in claimed.items():
+            value = results.get(ticker, RuntimeError(f"History download for {ticker} did not complete"))
+            if isinstance(value, BaseException):
+                flights.finish((kind, ticker.upper(), period, interval), future, error=value)
+            else:
+                flights.finish((kind, ticker.upper(), period, interval), future, result=value)
+
+    for ticker, future in waiting.items():
+        try:
+            results[ticker] = future.result()
+        except Exception as e:
+            results[ticker] = e
+    return results
+
+
+def _download_histories(tickers: List[str], period: str, interval: str, kind: str) -> Dict[str, Any]:
+    """Download and cache OHLCV frames for tickers missing from the cache, using the on-disk store where possible."""
+    provider = _provider()
+
+    def load(ticker: str) -> Any:
+        hist = _load_history(ticker, period, interval)
+        market_cache.set(kind, ticker.upper(), period, interval, value=hist)
+        return hist
+
+    if len(tickers) <= 1:
+        return _fetch_concurrently(load, tickers)
+
+    # With the on-disk store, tickers split into ones it already answers, ones
+    # that need a tail since their last stored bar, and ones needing the full period
+    results: Dict[str, Any] = {}
+    ohlcv_store = _store()
+    groups: Dict[Optional[str], List[str]] = {None: tickers}
+    if _uses_store(interval):
+        groups = {None: []}
+        for ticker in tickers:
+            action, start = ohlcv_store.plan(ticker, period, interval)
+            if action == "fresh":
+                hist = ohlcv_store.read(ticker, period, interval)
+                market_cache.set(kind, ticker.upper(), period, interval, value=hist)
+                results[ticker] = hist
+            else:
+                groups.setdefault(start if action == "tail" else None, []).append(ticker)
+        if len(groups) > 2:
+            # Download all tails from the earliest missing bar in one request
+            earliest = min(start for start in groups if start is not None)
+            groups = {None: groups[None], earliest: [t for s, g in groups.items() if s is not None for t in g]}
+
+    for start, group in groups.items():
+        if not group:
+            continue
+        try:
+            frames = provider.download(group, period=period, interval=interval, start=start)
+        except Exception:
+            results.update(_fetch_concurrently(load, group))
+            continue
+
+        readjusted = []
+        for ticker, hist in frames.items():
+            if isinstance(hist, Exception):
+                # Throttled or unreachable: neither cached nor stored, so the next call retries it
+                results[ticker] = hist
+                continue
+            if _uses_store(interval) and (start or not hist.empty):
+                if not ohlcv_store.update(ticker, period, interval, hist, full=start is None):
+                    readjusted.append(ticker)
+                    continue
+                hist = ohlcv_store.read(ticker, period, interval)
+            market_cache.set(kind, ticker.upper(), period, interval, value=hist)
+            results[ticker] = hist
+        if readjusted:
+            # The store dropped these series (split or dividend since they were stored); refetch them in full
+            results.update(_fetch_concurrently(load, readjusted))
+
+    return results
+
+
+@tool_output()
 def get_stock_info(ticker: str) -> Dict[str, Any]:
     """
     Get comprehensive stock information for a given ticker.
@@ -17,8 +260,7 @@ def get_stock_info(ticker: str) -> Dict[str, Any]:
         market cap, PE ratio, 52-week high/low, and more.
     """
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        info = _fetch_info(ticker)
 
         return {
             "ticker": ticker,
@@ -40,6 +282,7 @@ def get_stock_info(ticker: str) -> Dict[str, Any]:
         return {"error": f"Failed to fetch data for {ticker}: {str(e)}"}
 
 
+@tool_output(drop=("link", "type"))
 def get_stock_news(ticker: str, max_news: int = 10) -> List[Dict[str, Any]]:
     """
     Get latest news for a given stock ticker.
@@ -52,8 +295,7 @@ def get_stock_news(ticker: str, max_news: int = 10) -> List[Dict[str, Any]]:
         List of news articles with title, publisher, link, and publish time.
     """
     try:
-        stock = yf.Ticker(ticker)
-        news = stock.news
+        news = _fetch_news(ticker)
 
         articles = []
         for article in news[:max_news]:
@@ -70,6 +312,7 @@ def get_stock_news(ticker: str, max_news: int = 10) -> List[Dict[str, Any]]:
         return [{"error": f"Failed to fetch news for {ticker}: {str(e)}"}]
 
 
+@tool_output()
 def get_historical_data(ticker: str, period: str = "1mo", interval: str = "1d") -> Dict[str, Any]:
     """
     Get historical stock price data.
@@ -82,31 +325,35 @@ def get_historical_data(ticker: str, period: str = "1mo", interval: str = "1d")
     Returns:
         Dictionary containing historical price data and statistics.
     """
+    from tools.records import PriceSummary
+
     try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period, interval=interval)
+        hist = _fetch_history(ticker, period=period, interval=interval)
 
         if hist.empty:
             return {"error": f"No historical data available for {ticker}"}
+        summary = PriceSummary(hist)
+        del hist
 
         return {
             "ticker": ticker,
             "period": period,
             "interval": interval,
-            "data_points": len(hist),
-            "latest_close": float(hist['Close'].iloc[-1]),
-            "period_high": float(hist['High'].max()),
-            "period_low": float(hist['Low'].min()),
-            "period_avg_volume": float(hist['Volume'].mean()),
-            "price_change": float(hist['Close'].iloc[-1] - hist['Close'].iloc[0]),
-            "price_change_percent": float(((hist['Close'].iloc[-1] - hist['Close'].iloc[0]) / hist['Close'].iloc[0]) * 100),
-            "start_date": hist.index[0].strftime("%Y-%m-%d"),
-            "end_date": hist.index[-1].strftime("%Y-%m-%d"),
+            "data_points": summary.bars,
+            "latest_close": summary.last_close,
+            "period_high": summary.high,
+            "period_low": summary.low,
+            "period_avg_volume": summary.avg_volume,
+            "price_change": summary.change,
+            "price_change_percent": summary.change_percent,
+            "start_date": summary.start.strftime("%Y-%m-%d"),
+            "end_date": summary.end.strftime("%Y-%m-%d"),
         }
     except Exception as e:
         return {"error": f"Failed to fetch historical data for {ticker}: {str(e)}"}
 
 
+@tool_output(table="index")
 def get_market_indices() -> Dict[str, Any]:
     """
     Get current information for major market indices.
@@ -114,28 +361,25 @@ def get_market_indices() -> Dict[str, Any]:
     Returns:
         Dictionary containing data for major indices like S&P 500, Dow Jones, NASDAQ, etc.
     """
-    indices = {
-        "^GSPC": "S&P 500",
-        "^DJI": "Dow Jones",
-        "^IXIC": "NASDAQ",
-        "^RUT": "Russell 2000",
-        "^VIX": "VIX (Volatility Index)",
-    }
+    from tools.records import PriceSummary, output_value
+
+    histories = _fetch_history_batch(list(MARKET_INDICES), period="5d")
 
     results = {}
-    for ticker, name in indices.items():
+    for ticker, name in MARKET_INDICES.items():
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            hist = stock.history(period="5d")
+            hist = histories.pop(ticker)
+            if isinstance(hist, Exception):
+                raise hist
 
             if not hist.empty:
+                summary = PriceSummary(hist)
                 results[name] = {
                     "ticker": ticker,
-                    "current_price": float(hist['Close'].iloc[-1]),
-                    "previous_close": float(hist['Close'].iloc[-2]) if len(hist) > 1 else "N/A",
-                    "change": float(hist['Close'].iloc[-1] - hist['Close'].iloc[-2]) if len(hist) > 1 else "N/A",
-                    "change_percent": float(((hist['Close'].iloc[-1] - hist['Close'].iloc[-2]) / hist['Close'].iloc[-2]) * 100) if len(hist) > 1 else "N/A",
+                    "current_price": summary.last_close,
+                    "previous_close": output_value(summary.previous_close),
+                    "change": output_value(summary.day_change),
+                    "change_percent": output_value(summary.day_change_percent),
                 }
         except Exception as e:
             results[name] = {"error": f"Failed to fetch data: {str(e)}"}
@@ -143,6 +387,7 @@ def get_market_indices() -> Dict[str, Any]:
     return results
 
 
+@tool_output(table="ticker")
 def compare_stocks(tickers: List[str]) -> Dict[str, Any]:
     """
     Compare multiple stocks side by side.
@@ -153,25 +398,27 @@ def compare_stocks(tickers: List[str]) -> Dict[str, Any]:
     Returns:
         Dictionary containing comparison data for all tickers.
     """
-    comparison = {}
+    from tools.records import ComparisonTable, PriceSummary
 
-    for ticker in tickers:
+    tickers = list(dict.fromkeys(tickers))
+    histories = _fetch_history_batch(tickers, period="3mo")
+    infos = _fetch_concurrently(_fetch_info, tickers)
+
+    # Each frame is reduced to a few scalars and released right away; rows are
+    # kept as typed columns until they are converted to the output dict
+    table = ComparisonTable(tickers)
+    for row, ticker in enumerate(tickers):
         try:
-            stock = yf.Ticker(ticker)
-            info = stock.info
-            hist = stock.history(period="3mo")
+            info = infos.pop(ticker)
+            if isinstance(info, Exception):
+                raise info
+            hist = histories.pop(ticker)
+            if isinstance(hist, Exception):
+                raise hist
 
             if not hist.empty:
-                comparison[ticker] = {
-                    "company_name": info.get("longName", "N/A"),
-                    "current_price": info.get("currentPrice", info.get("regularMarketPrice", "N/A")),
-                    "market_cap": info.get("marketCap", "N/A"),
-                    "pe_ratio": info.get("trailingPE", "N/A"),
-                    "3mo_performance": float(((hist['Close'].iloc[-1] - hist['Close'].iloc[0]) / hist['Close'].iloc[0]) * 100),
-                    "volatility": float(hist['Close'].pct_change().std() * 100),
-                    "sector": info.get("sector", "N/A"),
-                }
+                table.set(row, info, PriceSummary(hist))
         except Exception as e:
-            comparison[ticker] = {"error": f"Failed to fetch data: {str(e)}"}
+            table.errors[row] = f"Failed to fetch data: {str(e)}"
 
-    return comparison
+    return table.to_dict()